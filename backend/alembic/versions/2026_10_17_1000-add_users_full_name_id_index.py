@@ -0,0 +1,46 @@
+"""Add indexes for keyset pagination of agency members
+
+Revision ID: users_full_name_id_idx
+Revises: increase_dist_precision
+Create Date: 2026-10-17 10:00:00.000000
+
+Agency member listings filter user_agencies by agency and are ordered by
+users (full_name, id) with a keyset cursor. The sort key lives on users, so
+a single (agency_id, full_name, user_id) index is not possible; instead:
+
+- (agency_id, user_id) on user_agencies finds an agency's members (the
+  primary key leads with user_id, so it cannot serve this filter), after
+  which small agencies are sorted in memory
+- (full_name, id) on users lets large agencies be walked in cursor order,
+  probing membership through the user_agencies primary key
+
+Both are built concurrently so member and user writes are not blocked.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'users_full_name_id_idx'
+down_revision: Union[str, None] = 'increase_dist_precision'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_full_name_id "
+            "ON users (full_name, id)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_agencies_agency_id_user_id "
+            "ON user_agencies (agency_id, user_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_user_agencies_agency_id_user_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_full_name_id")
@@ -0,0 +1,37 @@
+"""Add (agency_id, created_at) index on audit_logs
+
+Revision ID: audit_agency_created_idx
+Revises: users_full_name_id_idx
+Create Date: 2026-10-17 11:00:00.000000
+
+Audit log listings filter by agency and page through entries newest first.
+With this index Postgres reads only the requested page in index order
+instead of collecting every matching row and sorting it. Membership lookups
+on user_agencies are already served by its (user_id, agency_id) primary key.
+
+The index is built concurrently: audit_logs is append-heavy and a plain
+build would block audit inserts for its whole duration.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'audit_agency_created_idx'
+down_revision: Union[str, None] = 'users_full_name_id_idx'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_audit_logs_agency_id_created_at "
+            "ON audit_logs (agency_id, created_at)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_audit_logs_agency_id_created_at")
@@ -0,0 +1,46 @@
+"""Make the users.azure_ad_object_id unique index partial
+
+Revision ID: users_oid_partial_idx
+Revises: audit_agency_created_idx
+Create Date: 2026-10-17 12:00:00.000000
+
+Password-only users have no external object ID, so most of the old full
+unique index held NULL entries. The replacement covers only linked users
+and still serves the equality lookups in the SSO callbacks. It is built
+concurrently and swapped in by renaming, so uniqueness is enforced
+throughout.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'users_oid_partial_idx'
+down_revision: Union[str, None] = 'audit_agency_created_idx'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_azure_ad_object_id_partial "
+            "ON users (azure_ad_object_id) WHERE azure_ad_object_id IS NOT NULL"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_azure_ad_object_id")
+        op.execute(
+            "ALTER INDEX ix_users_azure_ad_object_id_partial RENAME TO ix_users_azure_ad_object_id"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_azure_ad_object_id_full "
+            "ON users (azure_ad_object_id)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_azure_ad_object_id")
+        op.execute(
+            "ALTER INDEX ix_users_azure_ad_object_id_full RENAME TO ix_users_azure_ad_object_id"
+        )
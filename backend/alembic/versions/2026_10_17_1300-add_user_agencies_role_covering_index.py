@@ -0,0 +1,33 @@
+"""Add (user_id, agency_id, role) covering index on user_agencies
+
+Revision ID: user_agencies_role_idx
+Revises: users_oid_partial_idx
+Create Date: 2026-10-17 13:00:00.000000
+
+Endpoints that require an agency role check membership and role together.
+The primary key finds the row, but reading role still visits the heap;
+with role in the index the check is answered by an index-only scan.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'user_agencies_role_idx'
+down_revision: Union[str, None] = 'users_oid_partial_idx'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_agencies_user_agency_role "
+            "ON user_agencies (user_id, agency_id, role)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_user_agencies_user_agency_role")
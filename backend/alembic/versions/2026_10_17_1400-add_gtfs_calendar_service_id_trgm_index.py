@@ -0,0 +1,34 @@
+"""Add trigram index on gtfs_calendar.service_id
+
+Revision ID: calendar_service_id_trgm
+Revises: user_agencies_role_idx
+Create Date: 2026-10-17 14:00:00.000000
+
+The calendar list search matches service_id with a leading-wildcard ILIKE,
+which a B-tree cannot serve. A pg_trgm GIN index lets Postgres answer those
+searches from the index on large feeds.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'calendar_service_id_trgm'
+down_revision: Union[str, None] = 'user_agencies_role_idx'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_gtfs_calendar_service_id_trgm "
+            "ON gtfs_calendar USING gin (service_id gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_gtfs_calendar_service_id_trgm")
@@ -0,0 +1,36 @@
+"""Add (feed_id, service_id) index on gtfs_trips
+
+Revision ID: trips_feed_service_idx
+Revises: calendar_service_id_trgm
+Create Date: 2026-10-17 15:00:00.000000
+
+Calendar endpoints count and check trips by (feed_id, service_id), and the
+composite foreign key to gtfs_calendar is checked on the same pair when a
+calendar is deleted or renamed. Trips only had single-column indexes, so
+those lookups combined two index scans or filtered a whole feed. Calendar
+dates need no new index: their (feed_id, service_id, date) primary key
+already serves both the counts and the date-ordered listing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'trips_feed_service_idx'
+down_revision: Union[str, None] = 'calendar_service_id_trgm'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_gtfs_trips_feed_id_service_id "
+            "ON gtfs_trips (feed_id, service_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_gtfs_trips_feed_id_service_id")
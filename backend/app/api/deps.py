@@ -1,23 +1,30 @@
 """API dependencies for authentication and authorization"""
 
 from typing import Optional, AsyncGenerator
-from fastapi import Depends, HTTPException, status
+from urllib.parse import urlsplit
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.core.security import verify_token
+from app.core.config import settings
+from app.core.security import ACCESS_TOKEN_COOKIE, verify_token
 from app.db.session import AsyncSessionLocal
 from app.db.base import User, Agency
-from app.models.user import UserRole
+from app.models.user import UserRole, user_agencies
 from app.schemas.auth import TokenData
+from app.services.agency_role_cache import cache_agency_roles, get_cached_agency_roles
 
-# OAuth2 scheme for token authentication
+# OAuth2 scheme for token authentication. Missing headers are not an error
+# here: get_current_user falls back to the access token cookie.
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="api/v1/auth/login",
-    auto_error=True,
+    auto_error=False,
 )
 
+# Methods a cookie-authenticated request may use without an Origin check
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -33,15 +40,34 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def _is_trusted_origin(request: Request) -> bool:
+    """
+    Check that a cookie-authenticated request was sent by a trusted page
+
+    The access cookie is SameSite=Lax, which still lets sibling subdomains
+    (same site, different origin) send it on state-changing requests. Those
+    are only accepted when the browser-set Origin header is one of
+    CORS_ORIGINS or the API's own host.
+    """
+    origin = request.headers.get("origin")
+    if not origin:
+        return False
+    if origin in settings.CORS_ORIGINS:
+        return True
+    return urlsplit(origin).netloc == request.headers.get("host")
+
+
 async def get_current_user(
-    token: str = Depends(oauth2_scheme),
+    request: Request,
+    token: Optional[str] = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db),
 ) -> User:
     """
     Get current user from JWT token
 
     Args:
-        token: JWT access token
+        request: FastAPI request, read for the access token cookie
+        token: JWT access token from the Authorization header
         db: Database session
 
     Returns:
@@ -56,6 +82,18 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    # Browser logins via redirect carry the token in a cookie instead
+    if token is None:
+        token = request.cookies.get(ACCESS_TOKEN_COOKIE)
+        if token is not None and request.method not in SAFE_METHODS:
+            if not _is_trusted_origin(request):
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Cross-origin request rejected",
+                )
+    if token is None:
+        raise credentials_exception
+
     # Verify token
     payload = verify_token(token)
     if payload is None:
@@ -86,6 +124,28 @@ async def get_current_user(
     return user
 
 
+async def get_current_user_optional(
+    request: Request,
+    token: Optional[str] = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> Optional[User]:
+    """
+    Get current user from JWT token, or None if the request is not authenticated
+
+    Args:
+        request: FastAPI request, read for the access token cookie
+        token: JWT access token from the Authorization header
+        db: Database session
+
+    Returns:
+        Optional[User]: Current authenticated user, if any
+    """
+    try:
+        return await get_current_user(request, token, db)
+    except HTTPException:
+        return None
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -101,6 +161,72 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_current_user_with_roles(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """
+    Get current active user with their agency roles loaded
+
+    The user's direct agency memberships are fetched once per request (from
+    the Redis role cache when possible) and attached as
+    ``current_user._agency_roles`` ({agency_id: role}) so permission checks
+    can be answered without further queries. Only endpoints that check
+    agency membership should depend on this.
+
+    Args:
+        current_user: Current user from token
+        db: Database session
+
+    Returns:
+        User: Active user with ``_agency_roles`` set
+    """
+    if not hasattr(current_user, "_agency_roles"):
+        roles = await get_cached_agency_roles(current_user.id)
+        if roles is None:
+            result = await db.execute(
+                select(user_agencies.c.agency_id, user_agencies.c.role).where(
+                    user_agencies.c.user_id == current_user.id
+                )
+            )
+            roles = dict(result.tuples().all())
+            await cache_agency_roles(current_user.id, roles)
+        current_user._agency_roles = roles
+    return current_user
+
+
+def user_has_agency(user: User, agency_id: int) -> bool:
+    """
+    Check whether a user is a direct member of an agency
+
+    Requires the role map loaded by get_current_user_with_roles.
+
+    Args:
+        user: User returned by get_current_user_with_roles
+        agency_id: Agency ID to check
+
+    Returns:
+        True if the user has any role in the agency
+    """
+    return agency_id in user._agency_roles
+
+
+def user_is_agency_admin(user: User, agency_id: int) -> bool:
+    """
+    Check whether a user is an agency admin of an agency
+
+    Requires the role map loaded by get_current_user_with_roles.
+
+    Args:
+        user: User returned by get_current_user_with_roles
+        agency_id: Agency ID to check
+
+    Returns:
+        True if the user's role in the agency is AGENCY_ADMIN
+    """
+    return user._agency_roles.get(agency_id) == UserRole.AGENCY_ADMIN
+
+
 async def get_current_superuser(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -242,6 +368,84 @@ require_editor = require_role(UserRole.EDITOR)
 require_agency_admin = require_role(UserRole.AGENCY_ADMIN)
 
 
+def require_agency_access(required_role: Optional[UserRole] = None):
+    """
+    Create a dependency that loads an agency and checks direct membership
+
+    Membership is answered from the role map loaded by
+    get_current_user_with_roles, so only the agency itself is fetched. The
+    result is cached on request.state so other dependencies in the same
+    request reuse it.
+
+    Args:
+        required_role: Exact agency role required, or None for any membership
+
+    Returns:
+        Dependency function
+    """
+
+    async def agency_loader(
+        agency_id: int,
+        request: Request,
+        current_user: User = Depends(get_current_user_with_roles),
+        db: AsyncSession = Depends(get_db),
+    ) -> Agency:
+        """
+        Load the agency and verify the user may access it
+
+        Args:
+            agency_id: Agency ID from the path
+            request: Current request (used for per-request caching)
+            current_user: Current authenticated user
+            db: Database session
+
+        Returns:
+            Agency: The requested agency
+
+        Raises:
+            HTTPException: 404 if the agency doesn't exist, 403 if the user
+                is neither a superuser nor a member with the required role
+        """
+        cache = getattr(request.state, "agency_access", None)
+        if cache is None:
+            cache = request.state.agency_access = {}
+        cache_key = (agency_id, required_role)
+        if cache_key in cache:
+            return cache[cache_key]
+
+        agency = await db.get(Agency, agency_id)
+        if agency is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Agency not found",
+            )
+
+        role = current_user._agency_roles.get(agency_id)
+        if required_role is None:
+            has_access = role is not None
+        else:
+            has_access = role == required_role
+        if not current_user.is_superuser and not has_access:
+            if required_role is None:
+                detail = "You don't have access to this agency"
+            else:
+                detail = f"Requires {required_role.value} role for this agency"
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=detail,
+            )
+
+        cache[cache_key] = agency
+        return agency
+
+    return agency_loader
+
+
+# Pre-defined agency dependencies (superusers always pass)
+get_agency_for_member = require_agency_access()
+get_agency_for_admin = require_agency_access(UserRole.AGENCY_ADMIN)
+
+
 async def verify_agency_access(
     agency_id: int,
     db: AsyncSession,
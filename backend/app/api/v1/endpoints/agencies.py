@@ -1,10 +1,29 @@
 """Agency management endpoints"""
 
+import logging
+import operator
 import re
-from datetime import datetime
+import uuid
+from functools import reduce
 from typing import List, Optional
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy import select, func, or_, cast, String, text
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy import (
+    Integer,
+    any_,
+    bindparam,
+    cast,
+    exists,
+    func,
+    lambda_stmt,
+    or_,
+    select,
+    tuple_,
+    union,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -16,6 +35,7 @@ from app.models.gtfs import GTFSFeed
 from app.models.user import user_agencies
 from app.models.team import TeamMember, Workspace, workspace_agencies
 from app.models.audit import AuditAction
+from app.models.task import AsyncTask, TaskStatus, TaskType
 from app.models.validation import AgencyValidationPreferences
 from app.schemas.agency import (
     AgencyCreate,
@@ -26,6 +46,7 @@ from app.schemas.agency import (
     AgencyMemberCreate,
     AgencyMemberUpdate,
     AgencyMemberList,
+    AgencyMemberCursor,
 )
 from app.schemas.validation import (
     AgencyValidationPreferencesCreate,
@@ -42,13 +63,104 @@ from app.schemas.agency_operations import (
     AgencySplitResponse,
 )
 from app.services.agency_merge_service import AgencyMergeService
+from app.services.agency_role_cache import invalidate_agency_roles
 from app.services.agency_split_service import AgencySplitService
-from app.utils.audit import create_audit_log, serialize_model
+from app.services.validation_summary_cache import (
+    cache_enabled_validations,
+    get_cached_enabled_validations,
+    invalidate_enabled_validations,
+)
+from app.tasks import (
+    delete_agency as delete_agency_task,
+    merge_agencies as merge_agencies_task,
+    split_agency as split_agency_task,
+)
+from app.utils.audit import create_audit_log, serialize_model, serialize_model_async
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Runs of characters not allowed in agency slugs
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+# Permission checks are built once at import time with bound parameters so every
+# request reuses the same compiled statement instead of rebuilding the SELECT.
+_IS_AGENCY_MEMBER = select(
+    exists().where(
+        user_agencies.c.user_id == bindparam("uid"),
+        user_agencies.c.agency_id == bindparam("aid"),
+    )
+)
+
+# Feed ids are bound as a single integer[] so the statement text does not
+# change with the number of source feeds
+_IS_ADMIN_OF_ANY_FEED_AGENCY = select(
+    exists().where(
+        user_agencies.c.user_id == bindparam("uid"),
+        user_agencies.c.role == UserRole.AGENCY_ADMIN,
+        user_agencies.c.agency_id == GTFSFeed.agency_id,
+        GTFSFeed.id == any_(bindparam("feed_ids", type_=ARRAY(Integer))),
+    )
+)
 
-@router.get("/", response_model=AgencyList)
+
+# Validation rule flags grouped by entity, as reported by get_enabled_validations
+_VALIDATION_RULE_GROUPS = {
+    "routes": {
+        "agency": AgencyValidationPreferences.validate_route_agency,
+        "duplicates": AgencyValidationPreferences.validate_route_duplicates,
+        "mandatory": AgencyValidationPreferences.validate_route_mandatory,
+    },
+    "shapes": {
+        "dist_traveled": AgencyValidationPreferences.validate_shape_dist_traveled,
+        "dist_accuracy": AgencyValidationPreferences.validate_shape_dist_accuracy,
+        "sequence": AgencyValidationPreferences.validate_shape_sequence,
+        "mandatory": AgencyValidationPreferences.validate_shape_mandatory,
+    },
+    "calendar": {
+        "mandatory": AgencyValidationPreferences.validate_calendar_mandatory,
+    },
+    "calendar_dates": {
+        "mandatory": AgencyValidationPreferences.validate_calendar_date_mandatory,
+    },
+    "fare_attributes": {
+        "mandatory": AgencyValidationPreferences.validate_fare_attribute_mandatory,
+    },
+    "feed_info": {
+        "mandatory": AgencyValidationPreferences.validate_feed_info_mandatory,
+    },
+    "stops": {
+        "duplicates": AgencyValidationPreferences.validate_stop_duplicates,
+        "mandatory": AgencyValidationPreferences.validate_stop_mandatory,
+    },
+    "trips": {
+        "service": AgencyValidationPreferences.validate_trip_service,
+        "duplicates": AgencyValidationPreferences.validate_trip_duplicates,
+        "shape": AgencyValidationPreferences.validate_trip_shape,
+        "mandatory": AgencyValidationPreferences.validate_trip_mandatory,
+    },
+    "stop_times": {
+        "trip": AgencyValidationPreferences.validate_stop_time_trip,
+        "stop": AgencyValidationPreferences.validate_stop_time_stop,
+        "sequence": AgencyValidationPreferences.validate_stop_time_sequence,
+        "mandatory": AgencyValidationPreferences.validate_stop_time_mandatory,
+    },
+}
+_VALIDATION_RULE_COLUMNS = [
+    column for rules in _VALIDATION_RULE_GROUPS.values() for column in rules.values()
+]
+_TOTAL_ENABLED_RULES = reduce(
+    operator.add, (cast(column, Integer) for column in _VALIDATION_RULE_COLUMNS)
+).label("total_enabled")
+
+
+async def _is_agency_member(db: AsyncSession, user_id: int, agency_id: int) -> bool:
+    """Check whether a user is a direct member of an agency."""
+    return bool(await db.scalar(_IS_AGENCY_MEMBER, {"uid": user_id, "aid": agency_id}))
+
+
+@router.get("/", response_model=None, responses={200: {"model": AgencyList}})
 async def list_agencies(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(deps.get_current_active_user),
@@ -56,37 +168,32 @@ async def list_agencies(
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = None,
     is_active: Optional[bool] = None,
-) -> AgencyList:
+) -> ORJSONResponse:
     """
     List all agencies with pagination and filtering.
 
     Users only see agencies they belong to (directly or through teams).
     """
-    # Build base query
-    query = select(Agency)
-
     # Get agencies where user is a direct member
-    direct_agency_ids = select(user_agencies.c.agency_id).where(
+    direct_agency_ids = select(user_agencies.c.agency_id.label("agency_id")).where(
         user_agencies.c.user_id == current_user.id
     )
 
     # Get agencies where user has access through team membership
     # User -> TeamMember -> Team -> Workspace -> workspace_agencies -> Agency
     team_agency_ids = (
-        select(workspace_agencies.c.agency_id)
+        select(workspace_agencies.c.agency_id.label("agency_id"))
         .select_from(TeamMember)
         .join(Workspace, TeamMember.team_id == Workspace.team_id)
         .join(workspace_agencies, Workspace.id == workspace_agencies.c.workspace_id)
         .where(TeamMember.user_id == current_user.id)
     )
 
-    # Combine both: agencies where user is direct member OR has team access
-    query = query.where(
-        or_(
-            Agency.id.in_(direct_agency_ids),
-            Agency.id.in_(team_agency_ids)
-        )
-    )
+    # Combine both (UNION de-duplicates) and join agencies against the result,
+    # so Postgres can drive an indexed nested loop from the user's small set of
+    # agency ids instead of hashing two IN-subqueries behind an OR.
+    accessible = union(direct_agency_ids, team_agency_ids).subquery()
+    query = select(Agency).join(accessible, accessible.c.agency_id == Agency.id)
 
     # Apply filters
     if search:
@@ -109,13 +216,15 @@ async def list_agencies(
     result = await db.execute(query)
     agencies = result.scalars().all()
 
-    return AgencyList(
+    agency_list = AgencyList(
         items=[AgencyResponse.model_validate(agency) for agency in agencies],
         total=total or 0,
         page=skip // limit + 1 if limit > 0 else 1,
         page_size=limit,
         pages=(total + limit - 1) // limit if total and limit > 0 else 0,
     )
+    # Already validated above; serialize directly instead of re-validating via response_model
+    return ORJSONResponse(content=agency_list.model_dump(mode="json"))
 
 
 @router.post("/", response_model=AgencyResponse, status_code=status.HTTP_201_CREATED)
@@ -132,8 +241,7 @@ async def create_agency(
     The creating user automatically becomes the agency admin.
     """
     # Check if slug already exists
-    result = await db.execute(select(Agency).where(Agency.slug == agency_in.slug))
-    if result.scalar_one_or_none():
+    if await db.scalar(select(exists().where(Agency.slug == agency_in.slug))):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Agency with slug '{agency_in.slug}' already exists",
@@ -153,6 +261,7 @@ async def create_agency(
     await db.execute(stmt)
 
     await db.commit()
+    await invalidate_agency_roles(current_user.id)
     await db.refresh(agency)
 
     # Create audit log
@@ -175,7 +284,7 @@ async def create_agency(
 async def get_agency(
     agency_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: User = Depends(deps.get_current_user_with_roles),
 ) -> Agency:
     """
     Get agency details by ID.
@@ -184,8 +293,7 @@ async def get_agency(
     - Other users can only view agencies they belong to (directly or through teams)
     """
     # First get the agency
-    result = await db.execute(select(Agency).where(Agency.id == agency_id))
-    agency = result.scalar_one_or_none()
+    agency = await db.get(Agency, agency_id)
 
     if not agency:
         raise HTTPException(
@@ -193,31 +301,23 @@ async def get_agency(
             detail="Agency not found",
         )
 
-    # Check access for non-superusers
-    if not current_user.is_superuser:
-        # Check direct membership
-        direct_access = await db.execute(
-            select(user_agencies.c.agency_id).where(
-                user_agencies.c.user_id == current_user.id,
-                user_agencies.c.agency_id == agency_id,
-            )
-        )
-        has_direct_access = direct_access.scalar_one_or_none() is not None
-
-        # Check team-based access
-        team_access = await db.execute(
-            select(workspace_agencies.c.agency_id)
-            .select_from(TeamMember)
-            .join(Workspace, TeamMember.team_id == Workspace.team_id)
-            .join(workspace_agencies, Workspace.id == workspace_agencies.c.workspace_id)
-            .where(
-                TeamMember.user_id == current_user.id,
-                workspace_agencies.c.agency_id == agency_id
+    # Check access for non-superusers (direct membership first, then teams)
+    if not current_user.is_superuser and not deps.user_has_agency(current_user, agency_id):
+        has_team_access = await db.scalar(
+            select(
+                select(workspace_agencies.c.agency_id)
+                .select_from(TeamMember)
+                .join(Workspace, TeamMember.team_id == Workspace.team_id)
+                .join(workspace_agencies, Workspace.id == workspace_agencies.c.workspace_id)
+                .where(
+                    TeamMember.user_id == current_user.id,
+                    workspace_agencies.c.agency_id == agency_id
+                )
+                .exists()
             )
         )
-        has_team_access = team_access.scalar_one_or_none() is not None
 
-        if not has_direct_access and not has_team_access:
+        if not has_team_access:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have access to this agency",
@@ -233,6 +333,7 @@ async def update_agency(
     request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(deps.get_current_active_user),
+    agency: Agency = Depends(deps.get_agency_for_admin),
 ) -> Agency:
     """
     Update agency details.
@@ -240,49 +341,25 @@ async def update_agency(
     - Super admins can update any agency
     - Agency admins can update only their agencies
     """
-    # Get agency
-    query = select(Agency).where(Agency.id == agency_id)
-    result = await db.execute(query)
-    agency = result.scalar_one_or_none()
-
-    if not agency:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Agency not found",
-        )
-
-    # Check permissions
-    if not current_user.is_superuser:
-        # Check if user is agency admin
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == agency_id,
-            cast(user_agencies.c.role, String) == UserRole.AGENCY_ADMIN.value,
-        )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only super admins or agency admins can update agencies",
-            )
-
     # Check slug uniqueness if updating slug
     update_data = agency_in.model_dump(exclude_unset=True)
     if "slug" in update_data and update_data["slug"] != agency.slug:
-        result = await db.execute(
-            select(Agency).where(
-                Agency.slug == update_data["slug"],
-                Agency.id != agency_id
+        slug_taken = await db.scalar(
+            select(
+                exists().where(
+                    Agency.slug == update_data["slug"],
+                    Agency.id != agency_id,
+                )
             )
         )
-        if result.scalar_one_or_none():
+        if slug_taken:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Agency with slug '{update_data['slug']}' already exists",
             )
 
     # Capture old values for audit log
-    old_values = serialize_model(agency)
+    old_values = await serialize_model_async(agency)
 
     # Update agency
     for field, value in update_data.items():
@@ -300,7 +377,7 @@ async def update_agency(
         entity_id=str(agency.id),
         description=f"Updated agency '{agency.name}' ({agency.slug})",
         old_values=old_values,
-        new_values=serialize_model(agency),
+        new_values=await serialize_model_async(agency),
         agency_id=agency.id,
         request=request,
     )
@@ -314,6 +391,7 @@ async def delete_agency(
     request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(deps.get_current_active_user),
+    agency: Agency = Depends(deps.get_agency_for_admin),
 ) -> dict:
     """
     Delete an agency permanently (asynchronous).
@@ -329,77 +407,46 @@ async def delete_agency(
     Returns a task ID for tracking progress in the Task Manager.
     A global audit log (without agency_id) is created to preserve deletion history.
     """
-    result = await db.execute(select(Agency).where(Agency.id == agency_id))
-    agency = result.scalar_one_or_none()
-
-    if not agency:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Agency not found",
-        )
-
-    # Check if user has permission to delete this agency
-    if not current_user.is_superuser:
-        # Check if user is agency_admin for this agency
-        membership_result = await db.execute(
-            select(user_agencies.c.role).where(
-                user_agencies.c.user_id == current_user.id,
-                user_agencies.c.agency_id == agency_id,
-            )
-        )
-        membership = membership_result.scalar_one_or_none()
-
-        if not membership or membership != UserRole.AGENCY_ADMIN.value:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only agency admins can delete agencies",
-            )
-
     # Capture agency info before deletion
     agency_name = agency.name
 
-    # Import task models and Celery task
-    from app.db.base import AsyncTask
-    from app.models.task import TaskStatus, TaskType
-    from app.tasks import delete_agency as delete_agency_task
-    import uuid
-
     # Create AsyncTask record (without agency_id so it survives the deletion)
-    task_record = AsyncTask(
-        celery_task_id=str(uuid.uuid4()),  # Temporary UUID to avoid unique constraint violation
-        task_name=f"Delete agency: {agency_name}",
-        description=f"Permanently deleting agency '{agency_name}' (ID: {agency_id}) and all associated data",
-        task_type=TaskType.DELETE_AGENCY.value,
-        user_id=current_user.id,
-        agency_id=None,  # Don't link to agency - it will be deleted
-        status=TaskStatus.PENDING.value,
-        progress=0.0,
-        input_data={
-            "agency_id": agency_id,
-            "agency_name": agency_name,
-        },
+    # under a pre-assigned Celery task ID
+    celery_task_id = str(uuid.uuid4())
+    task_id = await db.scalar(
+        pg_insert(AsyncTask).values(
+            celery_task_id=celery_task_id,
+            task_name=f"Delete agency: {agency_name}",
+            description=(
+                f"Permanently deleting agency '{agency_name}' (ID: {agency_id}) "
+                "and all associated data"
+            ),
+            task_type=TaskType.DELETE_AGENCY.value,
+            user_id=current_user.id,
+            agency_id=None,  # Don't link to agency - it will be deleted
+            status=TaskStatus.PENDING.value,
+            progress=0.0,
+            input_data={
+                "agency_id": agency_id,
+                "agency_name": agency_name,
+            },
+        ).returning(AsyncTask.id)
     )
-
-    db.add(task_record)
     await db.commit()
-    await db.refresh(task_record)
 
-    # Queue the Celery task
-    celery_result = delete_agency_task.apply_async(
+    # Queue the Celery task under the pre-assigned ID
+    delete_agency_task.apply_async(
+        task_id=celery_task_id,
         kwargs={
-            "task_db_id": task_record.id,
+            "task_db_id": task_id,
             "agency_id": agency_id,
             "agency_name": agency_name,
             "user_id": current_user.id,
-        }
+        },
     )
 
-    # Update task record with Celery task ID
-    task_record.celery_task_id = celery_result.id
-    await db.commit()
-
     return {
-        "task_id": task_record.id,
+        "task_id": task_id,
         "status": "queued",
         "message": f"Agency deletion task queued. Track progress in Task Manager.",
         "agency_id": agency_id,
@@ -407,47 +454,64 @@ async def delete_agency(
     }
 
 
-@router.get("/{agency_id}/members", response_model=AgencyMemberList)
+@router.get(
+    "/{agency_id}/members",
+    response_model=None,
+    responses={200: {"model": AgencyMemberList}},
+    dependencies=[Depends(deps.get_agency_for_member)],
+)
 async def list_agency_members(
     agency_id: int,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(deps.get_current_active_user),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-) -> AgencyMemberList:
+    after_name: Optional[str] = Query(
+        None, description="Keyset cursor: full_name of the last member of the previous page"
+    ),
+    after_user_id: Optional[int] = Query(
+        None, description="Keyset cursor: user_id of the last member of the previous page"
+    ),
+) -> ORJSONResponse:
     """
     List all members of an agency.
 
     - Super admins can view members of any agency
     - Other users can only view members of agencies they belong to
+
+    Members are ordered by (full_name, user_id). Pass the `next_cursor` of a
+    page as `after_name`/`after_user_id` to fetch the following page without
+    an OFFSET scan; `skip` is ignored when a cursor is given. Cursor pages
+    skip the membership count, so their `total`, `page` and `pages` are null.
     """
-    # Check if user has access to this agency
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == agency_id,
+    if (after_name is None) != (after_user_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="after_name and after_user_id must be provided together",
         )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have access to this agency",
-            )
+    use_cursor = after_name is not None
 
     # Get all members
     query = (
         select(User, user_agencies.c.role)
         .join(user_agencies)
         .where(user_agencies.c.agency_id == agency_id)
-        .order_by(User.full_name)
+        .order_by(User.full_name, User.id)
     )
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
+    # Get total count (offset pages only; counting would make every cursor
+    # page scan the whole membership again)
+    total = None
+    if not use_cursor:
+        count_query = select(func.count()).select_from(query.subquery())
+        total = await db.scalar(count_query) or 0
 
-    # Get paginated results
-    query = query.offset(skip).limit(limit)
+    # Get paginated results (keyset when a cursor is provided)
+    if use_cursor:
+        query = query.where(tuple_(User.full_name, User.id) > tuple_(after_name, after_user_id))
+    else:
+        query = query.offset(skip)
+    query = query.limit(limit)
     result = await db.execute(query)
     rows = result.all()
 
@@ -462,16 +526,28 @@ async def list_agency_members(
         for user, role in rows
     ]
 
-    return AgencyMemberList(
+    next_cursor = None
+    if len(rows) == limit:
+        last_user = rows[-1][0]
+        next_cursor = AgencyMemberCursor(after_name=last_user.full_name, after_user_id=last_user.id)
+
+    member_list = AgencyMemberList(
         items=members,
-        total=total or 0,
-        page=skip // limit + 1 if limit > 0 else 1,
+        total=total,
+        page=None if use_cursor else skip // limit + 1,
         page_size=limit,
-        pages=(total + limit - 1) // limit if total and limit > 0 else 0,
+        pages=None if use_cursor else (total + limit - 1) // limit,
+        next_cursor=next_cursor,
     )
+    return ORJSONResponse(content=member_list.model_dump(mode="json"))
 
 
-@router.post("/{agency_id}/members", response_model=AgencyMember, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{agency_id}/members",
+    response_model=AgencyMember,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(deps.get_agency_for_admin)],
+)
 async def add_agency_member(
     agency_id: int,
     member_in: AgencyMemberCreate,
@@ -485,31 +561,8 @@ async def add_agency_member(
     - Super admins can add members to any agency
     - Agency admins can add members to their agencies
     """
-    # Check if user has permission
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == agency_id,
-            cast(user_agencies.c.role, String) == UserRole.AGENCY_ADMIN.value,
-        )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only super admins or agency admins can add members",
-            )
-
-    # Check if agency exists
-    agency_result = await db.execute(select(Agency).where(Agency.id == agency_id))
-    if not agency_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Agency not found",
-        )
-
     # Check if user exists
-    user_result = await db.execute(select(User).where(User.id == member_in.user_id))
-    user = user_result.scalar_one_or_none()
+    user = await db.get(User, member_in.user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -517,12 +570,7 @@ async def add_agency_member(
         )
 
     # Check if user is already a member
-    existing_query = select(user_agencies).where(
-        user_agencies.c.user_id == member_in.user_id,
-        user_agencies.c.agency_id == agency_id,
-    )
-    result = await db.execute(existing_query)
-    if result.first():
+    if await _is_agency_member(db, member_in.user_id, agency_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User is already a member of this agency",
@@ -537,6 +585,7 @@ async def add_agency_member(
     )
     await db.execute(stmt)
     await db.commit()
+    await invalidate_agency_roles(member_in.user_id)
 
     # Create audit log
     await create_audit_log(
@@ -560,7 +609,11 @@ async def add_agency_member(
     )
 
 
-@router.patch("/{agency_id}/members/{user_id}", response_model=AgencyMember)
+@router.patch(
+    "/{agency_id}/members/{user_id}",
+    response_model=AgencyMember,
+    dependencies=[Depends(deps.get_agency_for_admin)],
+)
 async def update_agency_member(
     agency_id: int,
     user_id: int,
@@ -575,24 +628,14 @@ async def update_agency_member(
     - Super admins can update any member
     - Agency admins can update members in their agencies
     """
-    # Check if user has permission
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
+    # Check if membership exists and get old values
+    membership_query = (
+        select(user_agencies.c.role, User)
+        .join(User, User.id == user_agencies.c.user_id)
+        .where(
+            user_agencies.c.user_id == user_id,
             user_agencies.c.agency_id == agency_id,
-            cast(user_agencies.c.role, String) == UserRole.AGENCY_ADMIN.value,
         )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only super admins or agency admins can update members",
-            )
-
-    # Check if membership exists and get old values
-    membership_query = select(user_agencies, User).join(User).where(
-        user_agencies.c.user_id == user_id,
-        user_agencies.c.agency_id == agency_id,
     )
     result = await db.execute(membership_query)
     row = result.first()
@@ -603,10 +646,8 @@ async def update_agency_member(
         )
 
     # Capture old values for audit log
-    old_role = row[0]  # role from user_agencies
-    old_is_active = row[1]  # is_active from user_agencies
-    member_user = row[2]  # User object
-    old_values = {"role": old_role, "is_active": old_is_active}
+    old_role, member_user = row
+    old_values = {"role": old_role, "is_active": True}
 
     # Update membership
     update_data = member_in.model_dump(exclude_unset=True)
@@ -621,26 +662,11 @@ async def update_agency_member(
         )
         await db.execute(stmt)
         await db.commit()
+        await invalidate_agency_roles(user_id)
 
-    # Get updated membership
-    query = (
-        select(User, user_agencies.c.role)
-        .join(user_agencies)
-        .where(
-            user_agencies.c.user_id == user_id,
-            user_agencies.c.agency_id == agency_id,
-        )
-    )
-    result = await db.execute(query)
-    row = result.first()
-
-    if not row:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Member not found",
-        )
-
-    user, role = row
+    # The row was loaded above and the update is known, so build the
+    # response from memory rather than re-reading the membership.
+    role = update_data.get("role", old_role)
 
     # Create audit log
     new_values = {"role": role, "is_active": True}
@@ -650,7 +676,7 @@ async def update_agency_member(
         action=AuditAction.UPDATE,
         entity_type="agency_member",
         entity_id=f"{agency_id}:{user_id}",
-        description=f"Updated user {user.email} in agency",
+        description=f"Updated user {member_user.email} in agency",
         old_values=old_values,
         new_values=new_values,
         agency_id=agency_id,
@@ -658,15 +684,19 @@ async def update_agency_member(
     )
 
     return AgencyMember(
-        user_id=user.id,
-        email=user.email,
-        full_name=user.full_name,
+        user_id=member_user.id,
+        email=member_user.email,
+        full_name=member_user.full_name,
         role=role,
         is_active=True,  # Default to True - column may not exist yet
     )
 
 
-@router.delete("/{agency_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{agency_id}/members/{user_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(deps.get_agency_for_admin)],
+)
 async def remove_agency_member(
     agency_id: int,
     user_id: int,
@@ -681,20 +711,6 @@ async def remove_agency_member(
     - Agency admins can remove members from their agencies
     - Users cannot remove themselves
     """
-    # Check if user has permission
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == agency_id,
-            cast(user_agencies.c.role, String) == UserRole.AGENCY_ADMIN.value,
-        )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only super admins or agency admins can remove members",
-            )
-
     # Prevent self-removal
     if user_id == current_user.id:
         raise HTTPException(
@@ -728,6 +744,7 @@ async def remove_agency_member(
     )
     await db.execute(stmt)
     await db.commit()
+    await invalidate_agency_roles(user_id)
 
     # Create audit log
     await create_audit_log(
@@ -747,7 +764,11 @@ async def remove_agency_member(
 
 # Validation Preferences Endpoints
 
-@router.get("/{agency_id}/validation-preferences", response_model=AgencyValidationPreferencesResponse)
+@router.get(
+    "/{agency_id}/validation-preferences",
+    response_model=AgencyValidationPreferencesResponse,
+    dependencies=[Depends(deps.get_agency_for_member)],
+)
 async def get_validation_preferences(
     agency_id: int,
     db: AsyncSession = Depends(get_db),
@@ -761,32 +782,11 @@ async def get_validation_preferences(
 
     Returns default preferences (all enabled) if none exist yet.
     """
-    # Check agency exists
-    agency_query = select(Agency).where(Agency.id == agency_id)
-    result = await db.execute(agency_query)
-    agency = result.scalar_one_or_none()
-    if not agency:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Agency with id {agency_id} not found"
-        )
-
-    # Check user has access to this agency
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == agency_id,
-        )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have access to this agency"
-            )
-
     # Get preferences or return defaults
-    prefs_query = select(AgencyValidationPreferences).where(
-        AgencyValidationPreferences.agency_id == agency_id
+    prefs_query = lambda_stmt(
+        lambda: select(AgencyValidationPreferences).where(
+            AgencyValidationPreferences.agency_id == agency_id
+        )
     )
     result = await db.execute(prefs_query)
     preferences = result.scalar_one_or_none()
@@ -803,7 +803,11 @@ async def get_validation_preferences(
     return preferences
 
 
-@router.put("/{agency_id}/validation-preferences", response_model=AgencyValidationPreferencesResponse)
+@router.put(
+    "/{agency_id}/validation-preferences",
+    response_model=AgencyValidationPreferencesResponse,
+    dependencies=[Depends(deps.get_agency_for_admin)],
+)
 async def update_validation_preferences(
     agency_id: int,
     preferences_update: AgencyValidationPreferencesUpdate,
@@ -821,53 +825,35 @@ async def update_validation_preferences(
     - Agency admins can update their agency's preferences
     - Editors and viewers cannot update preferences
     """
-    # Check agency exists
-    agency_query = select(Agency).where(Agency.id == agency_id)
-    result = await db.execute(agency_query)
-    agency = result.scalar_one_or_none()
-    if not agency:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Agency with id {agency_id} not found"
-        )
+    # Only provided fields are written (partial updates supported)
+    update_data = preferences_update.model_dump(exclude_unset=True)
 
-    # Check user has permission (super admin or agency admin)
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == agency_id,
-            cast(user_agencies.c.role, String) == UserRole.AGENCY_ADMIN.value,
+    # Capture the current row (if any) for the audit log inside the same
+    # statement: every part of a data-modifying WITH query sees the snapshot
+    # taken before the upsert.
+    old_prefs = (
+        select(AgencyValidationPreferences)
+        .where(AgencyValidationPreferences.agency_id == agency_id)
+        .cte("old_prefs")
+    )
+    old_prefs_json = select(func.to_jsonb(old_prefs.table_valued())).scalar_subquery()
+
+    # Get-or-create and update in a single round-trip
+    upsert_stmt = (
+        pg_insert(AgencyValidationPreferences)
+        .values(agency_id=agency_id, **update_data)
+        .on_conflict_do_update(
+            index_elements=[AgencyValidationPreferences.agency_id],
+            set_={**update_data, "updated_at": func.now()},
         )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only super admins or agency admins can update validation preferences"
-            )
-
-    # Get or create preferences
-    prefs_query = select(AgencyValidationPreferences).where(
-        AgencyValidationPreferences.agency_id == agency_id
+        .returning(AgencyValidationPreferences, old_prefs_json.label("old_values"))
+        .add_cte(old_prefs)
     )
-    result = await db.execute(prefs_query)
-    preferences = result.scalar_one_or_none()
-
-    if not preferences:
-        # Create new preferences with defaults, then update
-        preferences = AgencyValidationPreferences(agency_id=agency_id)
-        db.add(preferences)
-        await db.flush()  # Get the ID
-
-    # Capture old values for audit
-    old_values = serialize_model(preferences)
-
-    # Update only provided fields
-    update_data = preferences_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(preferences, field, value)
+    result = await db.execute(upsert_stmt, execution_options={"populate_existing": True})
+    preferences, old_values = result.one()
 
     await db.commit()
-    await db.refresh(preferences)
+    await invalidate_enabled_validations(agency_id)
 
     # Create audit log
     await create_audit_log(
@@ -886,118 +872,67 @@ async def update_validation_preferences(
     return preferences
 
 
-@router.get("/{agency_id}/validation-preferences/enabled", response_model=EnabledValidationsResponse)
+@router.get(
+    "/{agency_id}/validation-preferences/enabled",
+    response_model=None,
+    responses={200: {"model": EnabledValidationsResponse}},
+    dependencies=[Depends(deps.get_agency_for_member)],
+)
 async def get_enabled_validations(
     agency_id: int,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(deps.get_current_active_user),
-):
+) -> Response:
     """
     Get a summary of which validation rules are enabled for an agency.
 
     Returns rules grouped by entity type with counts.
     Useful for displaying validation status in UI.
+
+    The serialized summary is cached in Redis per agency and invalidated
+    when the agency's preferences are updated.
     """
-    # Check agency exists
-    agency_query = select(Agency).where(Agency.id == agency_id)
-    result = await db.execute(agency_query)
-    agency = result.scalar_one_or_none()
-    if not agency:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Agency with id {agency_id} not found"
-        )
+    cached = await get_cached_enabled_validations(agency_id)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
 
-    # Check user has access to this agency
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == agency_id,
-        )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have access to this agency"
+    # Fetch only the rule flags, with the enabled count computed in SQL
+    result = await db.execute(
+        lambda_stmt(
+            lambda: select(*_VALIDATION_RULE_COLUMNS, _TOTAL_ENABLED_RULES).where(
+                AgencyValidationPreferences.agency_id == agency_id
             )
-
-    # Get preferences or use defaults
-    prefs_query = select(AgencyValidationPreferences).where(
-        AgencyValidationPreferences.agency_id == agency_id
+        )
     )
-    result = await db.execute(prefs_query)
-    preferences = result.scalar_one_or_none()
+    row = result.first()
 
-    # Build default preferences if none exist
-    if not preferences:
-        preferences = AgencyValidationPreferences(agency_id=agency_id)
+    if row is None:
+        # Defaults: every rule enabled
+        flags = iter([True] * len(_VALIDATION_RULE_COLUMNS))
+        total_enabled = len(_VALIDATION_RULE_COLUMNS)
+    else:
+        flags = iter(tuple(row)[:-1])
+        total_enabled = row.total_enabled
 
     # Group validations by entity
     enabled_rules = ValidationRuleSummary(
-        routes={
-            "agency": preferences.validate_route_agency,
-            "duplicates": preferences.validate_route_duplicates,
-            "mandatory": preferences.validate_route_mandatory,
-        },
-        shapes={
-            "dist_traveled": preferences.validate_shape_dist_traveled,
-            "dist_accuracy": preferences.validate_shape_dist_accuracy,
-            "sequence": preferences.validate_shape_sequence,
-            "mandatory": preferences.validate_shape_mandatory,
-        },
-        calendar={
-            "mandatory": preferences.validate_calendar_mandatory,
-        },
-        calendar_dates={
-            "mandatory": preferences.validate_calendar_date_mandatory,
-        },
-        fare_attributes={
-            "mandatory": preferences.validate_fare_attribute_mandatory,
-        },
-        feed_info={
-            "mandatory": preferences.validate_feed_info_mandatory,
-        },
-        stops={
-            "duplicates": preferences.validate_stop_duplicates,
-            "mandatory": preferences.validate_stop_mandatory,
-        },
-        trips={
-            "service": preferences.validate_trip_service,
-            "duplicates": preferences.validate_trip_duplicates,
-            "shape": preferences.validate_trip_shape,
-            "mandatory": preferences.validate_trip_mandatory,
-        },
-        stop_times={
-            "trip": preferences.validate_stop_time_trip,
-            "stop": preferences.validate_stop_time_stop,
-            "sequence": preferences.validate_stop_time_sequence,
-            "mandatory": preferences.validate_stop_time_mandatory,
-        },
+        **{
+            entity: {rule: next(flags) for rule in rules}
+            for entity, rules in _VALIDATION_RULE_GROUPS.items()
+        }
     )
+    total_rules = len(_VALIDATION_RULE_COLUMNS)
 
-    # Count enabled rules
-    total_rules = 21
-    total_enabled = sum([
-        sum(1 for v in entity_rules.values() if v)
-        for entity_rules in [
-            enabled_rules.routes,
-            enabled_rules.shapes,
-            enabled_rules.calendar,
-            enabled_rules.calendar_dates,
-            enabled_rules.fare_attributes,
-            enabled_rules.feed_info,
-            enabled_rules.stops,
-            enabled_rules.trips,
-            enabled_rules.stop_times,
-        ]
-    ])
-
-    return EnabledValidationsResponse(
+    summary = EnabledValidationsResponse(
         agency_id=agency_id,
         enabled_rules=enabled_rules,
         total_enabled=total_enabled,
         total_rules=total_rules,
     )
+    payload = orjson.dumps(summary.model_dump())
+    await cache_enabled_validations(agency_id, payload)
+
+    return Response(content=payload, media_type="application/json")
 
 
 # ============================================================================
@@ -1008,7 +943,7 @@ async def get_enabled_validations(
 async def merge_agencies(
     request: AgencyMergeRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: User = Depends(deps.get_current_user_with_roles),
 ) -> AgencyMergeResponse:
     """
     Merge multiple source agencies into a target agency.
@@ -1029,24 +964,12 @@ async def merge_agencies(
         # Superusers can always create new agencies
         # Agency admins must be admin of at least one source feed's agency
         if not current_user.is_superuser:
-            # Get agency IDs from source feeds
-            feed_agencies_result = await db.execute(
-                select(GTFSFeed.agency_id).where(GTFSFeed.id.in_(request.source_feed_ids))
-            )
-            source_agency_ids = [row[0] for row in feed_agencies_result.all()]
-
-            # Check if user is admin of at least one source agency
-            admin_check = await db.execute(
-                text("""
-                    SELECT COUNT(*) FROM user_agencies
-                    WHERE user_id = :user_id
-                    AND agency_id = ANY(:agency_ids)
-                    AND role = 'agency_admin'
-                """),
-                {"user_id": current_user.id, "agency_ids": source_agency_ids}
+            # Check if user is admin of at least one source feed's agency
+            is_source_admin = await db.scalar(
+                _IS_ADMIN_OF_ANY_FEED_AGENCY,
+                {"uid": current_user.id, "feed_ids": list(request.source_feed_ids)},
             )
-            admin_count = admin_check.scalar()
-            if admin_count == 0:
+            if not is_source_admin:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="You must be an agency admin of at least one source feed's agency to create a new merged agency"
@@ -1062,29 +985,44 @@ async def merge_agencies(
         # Note: Agency names don't need to be unique, only slugs do
 
         # Create the new agency
-        slug = re.sub(r'[^a-z0-9]+', '-', request.new_agency_name.lower()).strip('-')
+        slug = _SLUG_RE.sub('-', request.new_agency_name.lower()).strip('-')
+        if not slug:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="New agency name must contain at least one letter or digit"
+            )
 
-        # Make sure slug is unique
-        slug_result = await db.execute(
-            select(Agency).where(Agency.slug == slug)
-        )
-        if slug_result.scalar_one_or_none():
-            slug = f"{slug}-{int(datetime.now().timestamp())}"
+        # Insert the agency, letting the unique slug constraint detect
+        # collisions; on conflict retry once with a random suffix
+        target_agency = None
+        for candidate_slug in (slug, f"{slug}-{uuid.uuid4().hex[:8]}"):
+            target_agency = await db.scalar(
+                pg_insert(Agency)
+                .values(name=request.new_agency_name.strip(), slug=candidate_slug)
+                .on_conflict_do_nothing(index_elements=[Agency.slug])
+                .returning(Agency)
+            )
+            if target_agency is not None:
+                break
 
-        target_agency = Agency(
-            name=request.new_agency_name.strip(),
-            slug=slug,
-        )
-        db.add(target_agency)
-        await db.flush()
+        if target_agency is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=(
+                    "Could not allocate a unique slug for agency "
+                    f"'{request.new_agency_name.strip()}'"
+                ),
+            )
         new_agency_id = target_agency.id
 
-        # Add current user as agency admin
+        # Add current user as agency admin (written with the final commit)
         await db.execute(
-            text("INSERT INTO user_agencies (user_id, agency_id, role) VALUES (:user_id, :agency_id, :role)"),
-            {"user_id": current_user.id, "agency_id": target_agency.id, "role": "agency_admin"}
+            user_agencies.insert().values(
+                user_id=current_user.id,
+                agency_id=target_agency.id,
+                role=UserRole.AGENCY_ADMIN.value,
+            )
         )
-        await db.flush()
     else:
         # Using existing agency
         if not request.target_agency_id:
@@ -1102,14 +1040,7 @@ async def merge_agencies(
 
         # Check if user is super admin or agency admin of target
         is_super_admin = current_user.is_superuser
-        result = await db.execute(
-            select(user_agencies).where(
-                user_agencies.c.user_id == current_user.id,
-                user_agencies.c.agency_id == target_agency.id,
-                cast(user_agencies.c.role, String) == UserRole.AGENCY_ADMIN.value
-            )
-        )
-        is_agency_admin = result.first() is not None
+        is_agency_admin = deps.user_is_agency_admin(current_user, target_agency.id)
 
         if not (is_super_admin or is_agency_admin):
             raise HTTPException(
@@ -1132,11 +1063,6 @@ async def merge_agencies(
             validation_result=validation_result,
         )
 
-    # Import task models and Celery task
-    from app.db.base import AsyncTask
-    from app.models.task import TaskStatus, TaskType
-    from app.tasks import merge_agencies as merge_agencies_task
-
     # Determine task description
     if request.create_new_agency:
         task_name = f"Merge feeds into new agency '{request.new_agency_name}'"
@@ -1145,54 +1071,34 @@ async def merge_agencies(
         task_name = f"Merge feeds into {target_agency.name}"
         task_description = f"Merging {len(request.source_feed_ids)} feeds into '{target_agency.name}' as feed '{request.feed_name}'"
 
-    # Create AsyncTask record with temporary UUID for celery_task_id
-    import uuid
-    temp_celery_id = f"temp-{uuid.uuid4()}"
-
-    task_record = AsyncTask(
-        celery_task_id=temp_celery_id,  # Temporary ID, will be updated after queuing
-        task_name=task_name,
-        description=task_description,
-        task_type=TaskType.MERGE_AGENCIES.value,
-        user_id=current_user.id,
-        agency_id=target_agency.id,
-        status=TaskStatus.PENDING.value,
-        progress=0.0,
-        input_data={
-            "source_feed_ids": request.source_feed_ids,
-            "target_agency_id": target_agency.id,
-            "create_new_agency": request.create_new_agency,
-            "new_agency_name": request.new_agency_name,
-            "merge_strategy": request.merge_strategy,
-            "feed_name": request.feed_name,
-            "feed_description": request.feed_description,
-            "activate_on_success": request.activate_on_success,
-        },
-    )
-
-    db.add(task_record)
-    await db.commit()
-    await db.refresh(task_record)
-
-    # Queue the Celery task
-    celery_result = merge_agencies_task.apply_async(
-        kwargs={
-            "task_db_id": task_record.id,
-            "source_feed_ids": request.source_feed_ids,
-            "target_agency_id": target_agency.id,
-            "merge_strategy": request.merge_strategy,
-            "feed_name": request.feed_name,
-            "feed_description": request.feed_description,
-            "activate_on_success": request.activate_on_success,
-        }
+    # Pre-assign the Celery task ID so the task record, the audit entry and a
+    # newly created agency are committed together before the task is queued
+    celery_task_id = str(uuid.uuid4())
+
+    task_id = await db.scalar(
+        pg_insert(AsyncTask).values(
+            celery_task_id=celery_task_id,
+            task_name=task_name,
+            description=task_description,
+            task_type=TaskType.MERGE_AGENCIES.value,
+            user_id=current_user.id,
+            agency_id=target_agency.id,
+            status=TaskStatus.PENDING.value,
+            progress=0.0,
+            input_data={
+                "source_feed_ids": request.source_feed_ids,
+                "target_agency_id": target_agency.id,
+                "create_new_agency": request.create_new_agency,
+                "new_agency_name": request.new_agency_name,
+                "merge_strategy": request.merge_strategy,
+                "feed_name": request.feed_name,
+                "feed_description": request.feed_description,
+                "activate_on_success": request.activate_on_success,
+            },
+        ).returning(AsyncTask.id)
     )
 
-    # Update task record with Celery task ID
-    task_record.celery_task_id = celery_result.id
-    await db.commit()
-    await db.refresh(task_record)
-
-    # Create audit log
+    # Create audit log (written with the task record)
     await create_audit_log(
         db=db,
         user=current_user,
@@ -1207,12 +1113,46 @@ async def merge_agencies(
             "new_agency_name": request.new_agency_name if request.create_new_agency else None,
             "feed_name": request.feed_name,
             "merge_strategy": request.merge_strategy,
-            "task_id": task_record.id,
-        }
+            "task_id": task_id,
+        },
+        commit=False,
     )
 
+    await db.commit()
+    if request.create_new_agency:
+        await invalidate_agency_roles(current_user.id)
+
+    # Queue the Celery task under the pre-assigned ID
+    try:
+        merge_agencies_task.apply_async(
+            task_id=celery_task_id,
+            kwargs={
+                "task_db_id": task_id,
+                "source_feed_ids": request.source_feed_ids,
+                "target_agency_id": target_agency.id,
+                "merge_strategy": request.merge_strategy,
+                "feed_name": request.feed_name,
+                "feed_description": request.feed_description,
+                "activate_on_success": request.activate_on_success,
+            },
+        )
+    except Exception as e:
+        await db.execute(
+            update(AsyncTask)
+            .where(AsyncTask.id == task_id)
+            .values(
+                status=TaskStatus.FAILED.value,
+                error_message=f"Failed to queue merge task: {e}",
+            )
+        )
+        await db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not queue merge task"
+        )
+
     return AgencyMergeResponse(
-        task_id=str(task_record.id),
+        task_id=str(task_id),
         new_agency_id=new_agency_id,
         status="queued",
         message="Merge task queued. Track progress in Task Manager.",
@@ -1235,8 +1175,6 @@ async def validate_merge(
     - Totals of entities to be merged
     - Warnings and errors
     """
-    import logging
-    logger = logging.getLogger(__name__)
     logger.info(f"=== MERGE VALIDATION REQUEST ===")
     logger.info(f"source_feed_ids: {request.source_feed_ids}")
     logger.info(f"create_new_agency: {request.create_new_agency}")
@@ -1285,6 +1223,7 @@ async def split_agency(
     request: AgencySplitRequest,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(deps.get_current_active_user),
+    source_agency: Agency = Depends(deps.get_agency_for_admin),
 ) -> AgencySplitResponse:
     """
     Split selected routes from an agency into a new agency.
@@ -1297,32 +1236,6 @@ async def split_agency(
 
     Returns task_id for tracking async split progress.
     """
-
-    # Check source agency exists
-    source_agency = await db.get(Agency, agency_id)
-    if not source_agency:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Source agency {agency_id} not found"
-        )
-
-    # Check user permissions
-    is_super_admin = current_user.is_superuser
-    result = await db.execute(
-        select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == source_agency.id,
-            cast(user_agencies.c.role, String) == UserRole.AGENCY_ADMIN.value
-        )
-    )
-    is_agency_admin = result.first() is not None
-
-    if not (is_super_admin or is_agency_admin):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only super admins or agency admins of source agency can split agencies"
-        )
-
     # Validate split request
     split_service = AgencySplitService(db)
     valid, errors = await split_service.validate_split(request, current_user.id)
@@ -1336,41 +1249,58 @@ async def split_agency(
     # Analyze dependencies for response
     dependencies = await split_service.analyze_dependencies(request)
 
-    # Import task models and Celery task
-    from app.db.base import AsyncTask
-    from app.models.task import TaskStatus, TaskType
-    from app.tasks import split_agency as split_agency_task
-
-    # Create AsyncTask record
-    task_record = AsyncTask(
-        celery_task_id="",  # Will be updated after queuing
-        task_name=f"Split agency: {request.new_agency_name}",
-        description=f"Splitting {len(request.route_ids)} routes from '{source_agency.name}' into new agency '{request.new_agency_name}'",
-        task_type=TaskType.SPLIT_AGENCY.value,
-        user_id=current_user.id,
+    # Create AsyncTask record under a pre-assigned Celery task ID
+    celery_task_id = str(uuid.uuid4())
+    task_id = await db.scalar(
+        pg_insert(AsyncTask).values(
+            celery_task_id=celery_task_id,
+            task_name=f"Split agency: {request.new_agency_name}",
+            description=(
+                f"Splitting {len(request.route_ids)} routes from '{source_agency.name}' "
+                f"into new agency '{request.new_agency_name}'"
+            ),
+            task_type=TaskType.SPLIT_AGENCY.value,
+            user_id=current_user.id,
+            agency_id=source_agency.id,
+            status=TaskStatus.PENDING.value,
+            progress=0.0,
+            input_data={
+                "source_agency_id": agency_id,
+                "feed_id": request.feed_id,
+                "route_ids": request.route_ids,
+                "new_agency_name": request.new_agency_name,
+                "new_agency_description": request.new_agency_description,
+                "new_feed_name": request.new_feed_name,
+                "copy_users": request.copy_users,
+                "remove_from_source": request.remove_from_source,
+            },
+        ).returning(AsyncTask.id)
+    )
+
+    # Create audit log (written with the task record)
+    await create_audit_log(
+        db=db,
+        user=current_user,
+        action=AuditAction.AGENCY_SPLIT,
+        entity_type="agency",
+        entity_id=str(source_agency.id),
         agency_id=source_agency.id,
-        status=TaskStatus.PENDING.value,
-        progress=0.0,
-        input_data={
-            "source_agency_id": agency_id,
+        new_values={
+            "new_agency_name": request.new_agency_name,
             "feed_id": request.feed_id,
             "route_ids": request.route_ids,
-            "new_agency_name": request.new_agency_name,
-            "new_agency_description": request.new_agency_description,
-            "new_feed_name": request.new_feed_name,
-            "copy_users": request.copy_users,
-            "remove_from_source": request.remove_from_source,
+            "task_id": task_id,
         },
+        commit=False,
     )
 
-    db.add(task_record)
     await db.commit()
-    await db.refresh(task_record)
 
-    # Queue the Celery task
-    celery_result = split_agency_task.apply_async(
+    # Queue the Celery task under the pre-assigned ID
+    split_agency_task.apply_async(
+        task_id=celery_task_id,
         kwargs={
-            "task_db_id": task_record.id,
+            "task_db_id": task_id,
             "source_agency_id": agency_id,
             "feed_id": request.feed_id,
             "route_ids": request.route_ids,
@@ -1380,31 +1310,11 @@ async def split_agency(
             "copy_users": request.copy_users,
             "remove_from_source": request.remove_from_source,
             "user_id": current_user.id,
-        }
-    )
-
-    # Update task record with Celery task ID
-    task_record.celery_task_id = celery_result.id
-    await db.commit()
-
-    # Create audit log
-    await create_audit_log(
-        db=db,
-        user=current_user,
-        action=AuditAction.AGENCY_SPLIT,
-        entity_type="agency",
-        entity_id=str(source_agency.id),
-        agency_id=source_agency.id,
-        new_values={
-            "new_agency_name": request.new_agency_name,
-            "feed_id": request.feed_id,
-            "route_ids": request.route_ids,
-            "task_id": task_record.id,
-        }
+        },
     )
 
     return AgencySplitResponse(
-        task_id=str(task_record.id),
+        task_id=str(task_id),
         new_agency_id=0,  # Will be created by the task
         new_feed_id=0,  # Will be created by the task
         status="queued",
@@ -1,20 +1,39 @@
 """Audit log endpoints"""
 
 from typing import Optional
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc, cast, String
+from sqlalchemy import select, func, desc, cast, and_, lambda_stmt, String
 
 from app.api import deps
 from app.api.deps import get_db
-from app.models.user import User, UserRole
+from app.models.user import User, UserRole, user_agencies
 from app.models.audit import AuditLog, AuditAction
 from app.schemas.audit import AuditLogResponse, AuditLogList, AuditLogStats
 
 router = APIRouter()
 
-
-@router.get("/", response_model=AuditLogList)
+# Columns exposed by AuditLogResponse; list queries select these instead of
+# hydrating full ORM instances
+_AUDIT_LOG_COLUMNS = (
+    AuditLog.id,
+    AuditLog.user_id,
+    AuditLog.agency_id,
+    AuditLog.action,
+    AuditLog.entity_type,
+    AuditLog.entity_id,
+    AuditLog.description,
+    AuditLog.old_values,
+    AuditLog.new_values,
+    AuditLog.ip_address,
+    AuditLog.user_agent,
+    AuditLog.created_at,
+    AuditLog.updated_at,
+)
+
+
+@router.get("/", response_model=None, responses={200: {"model": AuditLogList}})
 async def list_audit_logs(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -23,63 +42,78 @@ async def list_audit_logs(
     action: Optional[AuditAction] = Query(None, description="Filter by action type"),
     entity_type: Optional[str] = Query(None, description="Filter by entity type"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(deps.get_current_active_user),
-) -> AuditLogList:
+    current_user: User = Depends(deps.get_current_user_with_roles),
+) -> ORJSONResponse:
     """
     List audit logs with filtering and pagination.
 
     Agency admins can see logs for their agencies.
     Super admins can see all logs.
+
+    Rows are serialized straight from the selected columns with orjson,
+    skipping per-row Pydantic validation on this read-only path.
     """
-    # Build query
-    query = select(AuditLog).order_by(desc(AuditLog.created_at))
+    # Build query; lambda statements cache SQL compilation per filter combination
+    query = lambda_stmt(
+        lambda: select(*_AUDIT_LOG_COLUMNS).order_by(desc(AuditLog.created_at))
+    )
 
     # Filter by agency if specified
     if agency_id is not None:
         # Check user has access to this agency
-        if not current_user.is_superuser:
-            from app.models.agency import user_agencies
-            membership_query = select(user_agencies).where(
-                user_agencies.c.user_id == current_user.id,
-                user_agencies.c.agency_id == agency_id,
-            )
-            membership_result = await db.execute(membership_query)
-            if not membership_result.first():
-                # User doesn't have access - return empty list
-                return AuditLogList(items=[], total=0, skip=skip, limit=limit)
+        if not current_user.is_superuser and not deps.user_has_agency(current_user, agency_id):
+            # User doesn't have access - return empty list
+            return ORJSONResponse(content={"items": [], "total": 0, "skip": skip, "limit": limit})
 
-        query = query.where(AuditLog.agency_id == agency_id)
+        query += lambda s: s.where(AuditLog.agency_id == agency_id)
     elif not current_user.is_superuser:
         # Non-super admins can only see logs for their agencies
-        from app.models.agency import user_agencies
-        subquery = select(user_agencies.c.agency_id).where(
-            user_agencies.c.user_id == current_user.id
+        member_id = current_user.id
+        query += lambda s: s.join(
+            user_agencies,
+            and_(
+                user_agencies.c.agency_id == AuditLog.agency_id,
+                user_agencies.c.user_id == member_id,
+            ),
         )
-        query = query.where(AuditLog.agency_id.in_(subquery))
 
     # Apply other filters
     if user_id is not None:
-        query = query.where(AuditLog.user_id == user_id)
+        query += lambda s: s.where(AuditLog.user_id == user_id)
     if action is not None:
-        query = query.where(cast(AuditLog.action, String) == action.value)
+        action_value = action.value
+        query += lambda s: s.where(cast(AuditLog.action, String) == action_value)
     if entity_type is not None:
-        query = query.where(AuditLog.entity_type == entity_type)
-
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+        query += lambda s: s.where(AuditLog.entity_type == entity_type)
 
-    # Get paginated results
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    logs = result.scalars().all()
-
-    return AuditLogList(
-        items=[AuditLogResponse.model_validate(log) for log in logs],
-        total=total,
-        skip=skip,
-        limit=limit,
+    # Get paginated results with the total count computed in the same scan
+    paged_query = query + (
+        lambda s: s.add_columns(func.count().over().label("total_count"))
+        .offset(skip)
+        .limit(limit)
+    )
+    result = await db.execute(paged_query)
+    rows = result.mappings().all()
+
+    if rows:
+        total = rows[0]["total_count"]
+    elif skip:
+        # Page is past the end; the window count is unavailable without rows
+        count_query = query + (
+            lambda s: s.with_only_columns(func.count(AuditLog.id)).order_by(None)
+        )
+        total = (await db.execute(count_query)).scalar() or 0
+    else:
+        total = 0
+
+    items = []
+    for row in rows:
+        item = dict(row)
+        del item["total_count"]
+        items.append(item)
+
+    return ORJSONResponse(
+        content={"items": items, "total": total, "skip": skip, "limit": limit}
     )
 
 
@@ -87,67 +121,53 @@ async def list_audit_logs(
 async def get_audit_stats(
     agency_id: Optional[int] = Query(None, description="Filter by agency ID"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: User = Depends(deps.get_current_user_with_roles),
 ) -> AuditLogStats:
     """
     Get audit log statistics (action counts).
     """
-    # Build base query
-    query = select(
-        cast(AuditLog.action, String).label("action"),
-        func.count(AuditLog.id).label("count")
+    # Build base query: action and entity type distributions in one scan
+    query = lambda_stmt(
+        lambda: select(
+            cast(AuditLog.action, String).label("action"),
+            AuditLog.entity_type,
+            func.grouping(cast(AuditLog.action, String)).label("by_entity_type"),
+            func.count(AuditLog.id).label("count"),
+        ).group_by(func.grouping_sets(cast(AuditLog.action, String), AuditLog.entity_type))
     )
 
     # Filter by agency if specified
     if agency_id is not None:
         # Check user has access to this agency
-        if not current_user.is_superuser:
-            from app.models.agency import user_agencies
-            membership_query = select(user_agencies).where(
-                user_agencies.c.user_id == current_user.id,
-                user_agencies.c.agency_id == agency_id,
+        if not current_user.is_superuser and not deps.user_has_agency(current_user, agency_id):
+            # User doesn't have access - return empty stats
+            return AuditLogStats(
+                total_logs=0,
+                action_counts={},
+                entity_type_counts={},
             )
-            membership_result = await db.execute(membership_query)
-            if not membership_result.first():
-                # User doesn't have access - return empty stats
-                return AuditLogStats(
-                    total_logs=0,
-                    action_counts={},
-                    entity_type_counts={},
-                )
-
-        query = query.where(AuditLog.agency_id == agency_id)
-    elif not current_user.is_superuser:
-        # Non-super admins can only see logs for their agencies
-        from app.models.agency import user_agencies
-        subquery = select(user_agencies.c.agency_id).where(
-            user_agencies.c.user_id == current_user.id
-        )
-        query = query.where(AuditLog.agency_id.in_(subquery))
-
-    # Get action counts
-    action_query = query.group_by(cast(AuditLog.action, String))
-    action_result = await db.execute(action_query)
-    action_counts = {row.action: row.count for row in action_result}
-
-    # Get entity type counts
-    entity_query = select(
-        AuditLog.entity_type,
-        func.count(AuditLog.id).label("count")
-    )
 
-    if agency_id is not None:
-        entity_query = entity_query.where(AuditLog.agency_id == agency_id)
+        query += lambda s: s.where(AuditLog.agency_id == agency_id)
     elif not current_user.is_superuser:
-        from app.models.agency import user_agencies
-        subquery = select(user_agencies.c.agency_id).where(
-            user_agencies.c.user_id == current_user.id
+        # Non-super admins can only see logs for their agencies
+        member_id = current_user.id
+        query += lambda s: s.join(
+            user_agencies,
+            and_(
+                user_agencies.c.agency_id == AuditLog.agency_id,
+                user_agencies.c.user_id == member_id,
+            ),
         )
-        entity_query = entity_query.where(AuditLog.agency_id.in_(subquery))
 
-    entity_query = entity_query.group_by(AuditLog.entity_type)
-    entity_result = await db.execute(entity_query)
-    entity_type_counts = {row.entity_type: row.count for row in entity_result}
+    # Get action and entity type counts
+    result = await db.execute(query)
+    action_counts = {}
+    entity_type_counts = {}
+    for row in result:
+        if row.by_entity_type:
+            entity_type_counts[row.entity_type] = row.count
+        else:
+            action_counts[row.action] = row.count
 
     # Get total count
     total_logs = sum(action_counts.values())
@@ -163,7 +183,7 @@ async def get_audit_stats(
 async def get_audit_log(
     log_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: User = Depends(deps.get_current_user_with_roles),
 ) -> AuditLogResponse:
     """
     Get a specific audit log by ID.
@@ -172,25 +192,20 @@ async def get_audit_log(
     log = result.scalar_one_or_none()
 
     if not log:
-        from fastapi import HTTPException
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Audit log not found",
         )
 
     # Check user has access to this log's agency
-    if not current_user.is_superuser and log.agency_id:
-        from app.models.agency import user_agencies
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == log.agency_id,
+    if (
+        not current_user.is_superuser
+        and log.agency_id
+        and not deps.user_has_agency(current_user, log.agency_id)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have access to this audit log",
         )
-        membership_result = await db.execute(membership_query)
-        if not membership_result.first():
-            from fastapi import HTTPException
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have access to this audit log",
-            )
 
     return AuditLogResponse.model_validate(log)
@@ -1,17 +1,40 @@
 """Authentication endpoints"""
 
+import asyncio
+import functools
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+import orjson
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Cookie,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy.orm import load_only
+from sqlalchemy import select, exists, lambda_stmt, literal_column, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, get_current_user_optional
 from app.core.security import (
-    create_access_token,
-    create_refresh_token,
+    REFRESH_TOKEN_COOKIE,
+    clear_auth_cookies,
+    create_token_pair,
+    decode_token_cached,
     verify_token,
-    verify_password,
+    verify_password_async,
     get_password_hash,
+    set_auth_cookies,
 )
 from app.db.base import User
 from app.models.audit import AuditAction
@@ -27,17 +50,124 @@ from app.schemas.auth import (
 from app.services.azure_ad import azure_ad_service
 from app.services.microsoft_graph import microsoft_graph_service
 from app.services.azure_ad_b2c import azure_b2c_service
-from app.services.demo_agency_service import create_demo_agency_for_user
-from app.utils.audit import create_audit_log
+from app.services.demo_agency_service import create_demo_agency_in_background
+from app.utils.audit_batcher import audit_batcher
 from app.core.config import settings
-from jose import jwt, JWTError
+from app.core.http_client import portal_client
+from jose import JWTError
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# /sso responses by blake2b(cross-domain token) -> (cache expiry, Token), so a
+# token presented again (e.g. a burst during SPA page load) is answered without
+# touching the database or the portal
+_SSO_TOKEN_CACHE_MAXSIZE = 10_000
+_sso_token_cache: "OrderedDict[bytes, tuple[float, Token]]" = OrderedDict()
+
+
+async def _find_external_user(
+    db: AsyncSession, object_id: Optional[str], email: Optional[str]
+) -> tuple[Optional[User], bool]:
+    """
+    Look up a user by external object ID or email in a single query
+
+    Returns the matching user (preferring the object ID match) and whether
+    it was matched by object ID.
+    """
+    if object_id is None and email is None:
+        return None, False
+
+    if email is None:
+        stmt = lambda_stmt(
+            lambda: select(User).where(User.azure_ad_object_id == object_id)
+        )
+    elif object_id is None:
+        stmt = lambda_stmt(lambda: select(User).where(User.email == email))
+    else:
+        stmt = lambda_stmt(
+            lambda: select(User)
+            .where(or_(User.azure_ad_object_id == object_id, User.email == email))
+            .limit(2)
+        )
+
+    result = await db.execute(stmt)
+    users = result.scalars().all()
+
+    for candidate in users:
+        if object_id is not None and candidate.azure_ad_object_id == object_id:
+            return candidate, True
+    return (users[0] if users else None), False
+
+
+async def _upsert_external_user(
+    db: AsyncSession,
+    email: str,
+    full_name: str,
+    object_id: str,
+    tenant_id: Optional[str] = None,
+) -> tuple[User, bool]:
+    """
+    Create an externally authenticated user, or link the existing user with
+    the same email, in a single INSERT ... ON CONFLICT statement
+
+    Returns the user and whether a new row was inserted.
+    """
+    linked_values = {"azure_ad_object_id": object_id}
+    if tenant_id is not None:
+        linked_values["azure_ad_tenant_id"] = tenant_id
+
+    stmt = (
+        pg_insert(User)
+        .values(
+            email=email,
+            full_name=full_name,
+            is_active=True,
+            is_superuser=False,
+            hashed_password=None,
+            **linked_values,
+        )
+        .on_conflict_do_update(index_elements=[User.email], set_=linked_values)
+        # xmax is 0 only for rows created by this statement
+        .returning(User, literal_column("xmax = 0").label("is_new"))
+        .execution_options(populate_existing=True)
+    )
+    user, is_new = (await db.execute(stmt)).one()
+    await db.commit()
+    return user, is_new
+
+
+async def _fetch_portal_profile(token: str) -> tuple[Optional[str], Optional[str]]:
+    """
+    Fetch the email and display name for a cross-domain token from the portal
+
+    Returns (None, None) if the portal is not configured or the request fails.
+    """
+    if not getattr(settings, 'PORTAL_API_URL', None):
+        return None, None
+
+    try:
+        # Use the cross-domain token to get user info from portal
+        response = await portal_client.post(
+            "/auth/exchange",
+            params={"token": token}
+        )
+        if response.status_code != 200:
+            return None, None
+        user_info = response.json().get("user", {})
+    except Exception as e:
+        logger.warning("Failed to fetch user info from portal: %s", e)
+        return None, None
+
+    email = user_info.get("email")
+    return email, user_info.get("display_name", email)
+
 
 @router.post("/register", response_model=dict, status_code=status.HTTP_200_OK, deprecated=True)
 async def register(
     register_data: RegisterRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """
@@ -71,10 +201,11 @@ async def register(
         )
 
     # Check if user already exists in local database
-    result = await db.execute(select(User).where(User.email == register_data.email))
-    existing_user = result.scalar_one_or_none()
+    email_taken = await db.scalar(
+        select(exists().where(User.email == register_data.email))
+    )
 
-    if existing_user:
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
@@ -106,11 +237,7 @@ async def register(
         await db.refresh(new_user)
 
         # Create demo agency with sample GTFS data for new user
-        try:
-            await create_demo_agency_for_user(db, new_user)
-        except Exception as e:
-            # Log but don't fail registration if demo creation fails
-            print(f"Warning: Failed to create demo agency for user {new_user.email}: {e}")
+        background_tasks.add_task(create_demo_agency_in_background, new_user.id)
 
         return EntraIDUserResponse(
             id=new_user.id,
@@ -161,7 +288,8 @@ async def login(
     This endpoint only works for users created before Entra ID migration.
     """
     # Find user by email
-    result = await db.execute(select(User).where(User.email == login_data.email))
+    email = login_data.email
+    result = await db.execute(lambda_stmt(lambda: select(User).where(User.email == email)))
     user = result.scalar_one_or_none()
 
     if not user:
@@ -171,7 +299,7 @@ async def login(
         )
 
     # Verify password
-    if not user.hashed_password or not verify_password(
+    if not user.hashed_password or not await verify_password_async(
         login_data.password, user.hashed_password
     ):
         raise HTTPException(
@@ -187,12 +315,10 @@ async def login(
         )
 
     # Create JWT tokens
-    access_token = create_access_token(subject=user.id)
-    refresh_token_str = create_refresh_token(subject=user.id)
+    access_token, refresh_token_str = create_token_pair(user.id)
 
     # Create audit log for login
-    await create_audit_log(
-        db=db,
+    audit_batcher.enqueue(
         user=user,
         action=AuditAction.LOGIN,
         entity_type="auth",
@@ -212,6 +338,7 @@ async def login(
 async def azure_ad_callback(
     auth_request: AzureADAuthRequest,
     request: Request,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ) -> Token:
     """
@@ -239,52 +366,28 @@ async def azure_ad_callback(
             detail="Could not retrieve email from Azure AD",
         )
 
-    # Check if user exists
-    result = await db.execute(
-        select(User).where(User.azure_ad_object_id == azure_object_id)
-    )
-    user = result.scalar_one_or_none()
+    # Check if user exists by Azure AD object ID or email
+    user, matched_by_object_id = await _find_external_user(db, azure_object_id, email)
 
-    if user is None:
-        # Check if user exists with this email
-        result = await db.execute(select(User).where(User.email == email))
-        user = result.scalar_one_or_none()
-
-        is_new_user = False
-        if user:
-            # Update existing user with Azure AD info
-            user.azure_ad_object_id = azure_object_id
-            user.azure_ad_tenant_id = azure_ad_service.tenant_id
-        else:
-            # Create new user
-            is_new_user = True
-            user = User(
-                email=email,
-                full_name=display_name,
-                azure_ad_object_id=azure_object_id,
-                azure_ad_tenant_id=azure_ad_service.tenant_id,
-                is_active=True,
-                is_superuser=False,
-            )
-            db.add(user)
-
-        await db.commit()
-        await db.refresh(user)
+    if not matched_by_object_id:
+        # Link the existing user with this email to Azure AD, or create one
+        user, is_new_user = await _upsert_external_user(
+            db,
+            email=email,
+            full_name=display_name,
+            object_id=azure_object_id,
+            tenant_id=azure_ad_service.tenant_id,
+        )
 
         # Create demo agency with sample GTFS data for new users
         if is_new_user:
-            try:
-                await create_demo_agency_for_user(db, user)
-            except Exception as e:
-                print(f"Warning: Failed to create demo agency for user {user.email}: {e}")
+            background_tasks.add_task(create_demo_agency_in_background, user.id)
 
     # Create JWT tokens
-    access_token = create_access_token(subject=user.id)
-    refresh_token_str = create_refresh_token(subject=user.id)
+    access_token, refresh_token_str = create_token_pair(user.id)
 
     # Create audit log for Azure AD login
-    await create_audit_log(
-        db=db,
+    audit_batcher.enqueue(
         user=user,
         action=AuditAction.LOGIN,
         entity_type="auth",
@@ -302,14 +405,29 @@ async def azure_ad_callback(
 
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
-    refresh_request: RefreshTokenRequest,
+    response: Response,
+    refresh_request: Optional[RefreshTokenRequest] = None,
+    refresh_cookie: Optional[str] = Cookie(None, alias=REFRESH_TOKEN_COOKIE),
     db: AsyncSession = Depends(get_db),
 ) -> Token:
     """
     Refresh access token using refresh token
+
+    The token is read from the request body, or from the refresh token cookie
+    for browser sessions started by a redirect login; those get new cookies.
     """
+    if refresh_request is not None:
+        token = refresh_request.refresh_token
+    elif refresh_cookie is not None:
+        token = refresh_cookie
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+
     # Verify refresh token
-    payload = verify_token(refresh_request.refresh_token)
+    payload = verify_token(token)
 
     if payload is None or payload.get("type") != "refresh":
         raise HTTPException(
@@ -325,9 +443,8 @@ async def refresh_token(
             detail="Invalid refresh token",
         )
 
-    # Verify user exists
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
+    # Verify user exists (only id and is_active are needed here)
+    user = await db.get(User, int(user_id), options=[load_only(User.is_active)])
 
     if user is None or not user.is_active:
         raise HTTPException(
@@ -336,8 +453,10 @@ async def refresh_token(
         )
 
     # Create new tokens
-    access_token = create_access_token(subject=user.id)
-    new_refresh_token = create_refresh_token(subject=user.id)
+    access_token, new_refresh_token = create_token_pair(user.id)
+
+    if refresh_request is None:
+        set_auth_cookies(response, access_token, new_refresh_token)
 
     return Token(
         access_token=access_token,
@@ -366,37 +485,37 @@ async def get_current_user_info(
 @router.post("/logout")
 async def logout(
     request: Request,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    current_user: Optional[User] = Depends(get_current_user_optional),
 ) -> dict:
     """
     Logout endpoint (for client-side token deletion)
 
     Note: JWT tokens are stateless, so logout is handled client-side
     by deleting the token. In a production environment, you might want
-    to implement token blacklisting using Redis.
+    to implement token blacklisting using Redis. Token cookies from
+    redirect logins are cleared even when the access token has already
+    expired, so the session can always be ended.
     """
     # Create audit log for logout
-    await create_audit_log(
-        db=db,
-        user=current_user,
-        action=AuditAction.LOGOUT,
-        entity_type="auth",
-        entity_id=str(current_user.id),
-        description=f"User {current_user.email} logged out",
-        request=request,
-    )
+    if current_user is not None:
+        audit_batcher.enqueue(
+            user=current_user,
+            action=AuditAction.LOGOUT,
+            entity_type="auth",
+            entity_id=str(current_user.id),
+            description=f"User {current_user.email} logged out",
+            request=request,
+        )
 
-    return {"message": "Successfully logged out"}
+    clear_auth_cookies(response)
 
+    return {"message": "Successfully logged out"}
 
-@router.get("/config")
-async def get_auth_config() -> dict:
-    """
-    Get authentication configuration for frontend
 
-    Returns Azure AD and/or B2C configuration if available
-    """
+@functools.cache
+def _auth_config_body() -> bytes:
+    """Serialized /config payload; provider configuration only changes on restart"""
     config = {}
 
     # Azure AD (for admin users)
@@ -419,11 +538,25 @@ async def get_auth_config() -> dict:
         }
 
     if not config:
-        return {
+        config = {
             "message": "No authentication providers configured",
         }
 
-    return config
+    return orjson.dumps(config)
+
+
+@router.get("/config", response_model=None, responses={200: {"model": dict}})
+async def get_auth_config() -> Response:
+    """
+    Get authentication configuration for frontend
+
+    Returns Azure AD and/or B2C configuration if available
+    """
+    return Response(
+        content=_auth_config_body(),
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=300"},
+    )
 
 
 # ============================================================================
@@ -482,6 +615,7 @@ async def b2c_get_authorization_url(
 async def b2c_callback(
     auth_request: AzureADAuthRequest,
     request: Request,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ) -> Token:
     """
@@ -518,78 +652,68 @@ async def b2c_callback(
         email = user_info["email"]
         display_name = user_info["name"]
 
-        # If email is not in ID token, try UserInfo endpoint
+        # If email is not in ID token, try UserInfo endpoint while the
+        # object ID lookup runs
+        object_id_lookup = None
         if not email:
-            print("DEBUG: Email not in ID token, trying UserInfo endpoint...")
+            object_id_lookup = asyncio.create_task(
+                _find_external_user(db, azure_object_id, None)
+            )
+            logger.debug("Email not in ID token, trying UserInfo endpoint")
             try:
                 userinfo_data = await azure_b2c_service.get_user_info_from_userinfo_endpoint(
                     token_response["access_token"]
                 )
-                print(f"DEBUG: UserInfo endpoint response: {userinfo_data}")
+                logger.debug("UserInfo endpoint response: %s", userinfo_data)
                 email = (
                     userinfo_data.get("email")
                     or userinfo_data.get("emails", [None])[0]
                     or userinfo_data.get("preferred_username")
                 )
             except Exception as e:
-                print(f"DEBUG: Failed to get UserInfo: {e}")
+                logger.debug("Failed to get UserInfo: %s", e)
 
         if not email:
             # Fallback: create synthetic email from username or object ID
             # This allows login even if email wasn't collected during External ID registration
-            print(f"DEBUG: No email found, creating synthetic email from name or OID")
+            logger.debug("No email found, creating synthetic email from name or OID")
             username = display_name or azure_object_id
             email = f"{username}@external-id-user.local"
-            print(f"DEBUG: Using synthetic email: {email}")
-            print(f"WARN: External ID user flow should be configured to collect 'Email Address' in User attributes")
-
-        # Check if user exists by B2C object ID
-        result = await db.execute(
-            select(User).where(User.azure_ad_object_id == azure_object_id)
-        )
-        user = result.scalar_one_or_none()
-
-        is_new_user = False
-        if user is None:
-            # Check if user exists by email
-            result = await db.execute(select(User).where(User.email == email))
-            user = result.scalar_one_or_none()
-
-            if user:
-                # Link existing user to B2C account
-                user.azure_ad_object_id = azure_object_id
-                user.azure_ad_tenant_id = azure_b2c_service.tenant_id
-            else:
-                # Create new user
-                is_new_user = True
-                user = User(
-                    email=email,
-                    full_name=display_name,
-                    azure_ad_object_id=azure_object_id,
-                    azure_ad_tenant_id=azure_b2c_service.tenant_id,
-                    is_active=True,
-                    is_superuser=False,
-                    hashed_password=None,  # No local password - B2C handles auth
-                )
-                db.add(user)
+            logger.debug("Using synthetic email: %s", email)
+            logger.warning(
+                "External ID user flow should be configured to collect 'Email Address' "
+                "in User attributes"
+            )
 
-            await db.commit()
-            await db.refresh(user)
+        # Check if user exists by B2C object ID or email
+        user, matched_by_object_id = None, False
+        if object_id_lookup is not None:
+            user, matched_by_object_id = await object_id_lookup
+        if not matched_by_object_id:
+            user, matched_by_object_id = await _find_external_user(
+                db, azure_object_id, email
+            )
+
+        if not matched_by_object_id:
+            # Link the existing user with this email to B2C, or create one
+            # (no local password - B2C handles auth)
+            user, is_new_user = await _upsert_external_user(
+                db,
+                email=email,
+                full_name=display_name,
+                object_id=azure_object_id,
+                tenant_id=azure_b2c_service.tenant_id,
+            )
 
             # Create demo agency with sample GTFS data for new users
             if is_new_user:
-                try:
-                    await create_demo_agency_for_user(db, user)
-                except Exception as e:
-                    print(f"Warning: Failed to create demo agency for user {user.email}: {e}")
+                background_tasks.add_task(create_demo_agency_in_background, user.id)
 
         # Create JWT tokens for your application
-        access_token = create_access_token(subject=user.id)
-        refresh_token_str = create_refresh_token(subject=user.id)
+        access_token, refresh_token_str = create_token_pair(user.id)
 
         # Create audit log for B2C login
-        await create_audit_log(
-            db=db,
+        audit_batcher.enqueue(
             user=user,
             action=AuditAction.LOGIN,
             entity_type="auth",
@@ -632,6 +756,7 @@ async def b2c_callback(
 async def get_test_token(
     email: str,
     request: Request,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ) -> Token:
     """
@@ -656,7 +781,7 @@ async def get_test_token(
         )
 
     # Check if user exists
-    result = await db.execute(select(User).where(User.email == email))
+    result = await db.execute(lambda_stmt(lambda: select(User).where(User.email == email)))
     user = result.scalar_one_or_none()
 
     is_new_user = False
@@ -672,13 +797,9 @@ async def get_test_token(
         )
         db.add(user)
         await db.commit()
-        await db.refresh(user)
 
         # Create demo agency for new test user
-        try:
-            await create_demo_agency_for_user(db, user)
-        except Exception as e:
-            print(f"Warning: Failed to create demo agency for test user {email}: {e}")
+        background_tasks.add_task(create_demo_agency_in_background, user.id)
 
     # Check if user is active
     if not user.is_active:
@@ -688,12 +809,10 @@ async def get_test_token(
         )
 
     # Create JWT tokens
-    access_token = create_access_token(subject=user.id)
-    refresh_token_str = create_refresh_token(subject=user.id)
+    access_token, refresh_token_str = create_token_pair(user.id)
 
     # Create audit log for test login
-    await create_audit_log(
-        db=db,
+    audit_batcher.enqueue(
         user=user,
         action=AuditAction.LOGIN,
         entity_type="auth",
@@ -718,6 +837,7 @@ async def get_test_token(
 async def sso_login(
     token: str,
     request: Request,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ) -> Token:
     """
@@ -740,12 +860,22 @@ async def sso_login(
             detail="SSO not configured for this team",
         )
 
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = _sso_token_cache.get(cache_key)
+    if cached is not None:
+        expires_at, cached_tokens = cached
+        if time.time() < expires_at:
+            _sso_token_cache.move_to_end(cache_key)
+            return cached_tokens
+        _sso_token_cache.pop(cache_key, None)
+
     try:
         # Verify the cross-domain token
-        payload = jwt.decode(
+        payload = decode_token_cached(
             token,
             cross_domain_secret,
-            algorithms=["HS256"]
+            algorithms=["HS256"],
+            namespace="cross_domain",
         )
 
         # Validate token type
@@ -768,82 +898,37 @@ async def sso_login(
             detail=f"Invalid or expired SSO token: {str(e)}",
         )
 
-    # Fetch user info from portal
-    portal_api_url = getattr(settings, 'PORTAL_API_URL', None)
-    if portal_api_url:
-        try:
-            async with httpx.AsyncClient() as client:
-                # Use the cross-domain token to get user info from portal
-                response = await client.post(
-                    f"{portal_api_url.rstrip('/')}/auth/exchange",
-                    params={"token": token}
-                )
-                if response.status_code == 200:
-                    portal_data = response.json()
-                    user_info = portal_data.get("user", {})
-                    email = user_info.get("email")
-                    display_name = user_info.get("display_name", email)
-                else:
-                    email = None
-                    display_name = None
-        except Exception as e:
-            print(f"Warning: Failed to fetch user info from portal: {e}")
-            email = None
-            display_name = None
-    else:
-        email = None
-        display_name = None
-
-    if not email:
-        # Fallback: use user_id as identifier
-        email = f"sso-user-{user_id}@portal.local"
-        display_name = f"SSO User ({user_id[:8]})"
-
-    # Check if user exists by portal user ID (stored in azure_ad_object_id field)
-    result = await db.execute(
-        select(User).where(User.azure_ad_object_id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    # Known users are already synced locally, so the portal is only asked for
+    # the profile when this portal user ID (stored in azure_ad_object_id) is
+    # not linked yet
+    user, matched_by_object_id = await _find_external_user(db, user_id, None)
 
-    is_new_user = False
-    if user is None:
-        # Check if user exists by email
-        result = await db.execute(select(User).where(User.email == email))
-        user = result.scalar_one_or_none()
-
-        if user:
-            # Link existing user to portal account
-            user.azure_ad_object_id = user_id
-        else:
-            # Create new user
-            is_new_user = True
-            user = User(
-                email=email,
-                full_name=display_name,
-                azure_ad_object_id=user_id,  # Store portal user ID
-                is_active=True,
-                is_superuser=False,
-                hashed_password=None,
-            )
-            db.add(user)
+    if not matched_by_object_id:
+        email, display_name = await _fetch_portal_profile(token)
 
-        await db.commit()
-        await db.refresh(user)
+        if not email:
+            # Fallback: use user_id as identifier
+            email = f"sso-user-{user_id}@portal.local"
+            display_name = f"SSO User ({user_id[:8]})"
+
+        # Link the existing user with this email to the portal account, or
+        # create one
+        user, is_new_user = await _upsert_external_user(
+            db,
+            email=email,
+            full_name=display_name,
+            object_id=user_id,
+        )
 
         # Create demo agency for new users
         if is_new_user:
-            try:
-                await create_demo_agency_for_user(db, user)
-            except Exception as e:
-                print(f"Warning: Failed to create demo agency for SSO user {email}: {e}")
+            background_tasks.add_task(create_demo_agency_in_background, user.id)
 
     # Create JWT tokens for the team
-    access_token = create_access_token(subject=user.id)
-    refresh_token_str = create_refresh_token(subject=user.id)
+    access_token, refresh_token_str = create_token_pair(user.id)
 
     # Create audit log for SSO login
-    await create_audit_log(
-        db=db,
+    audit_batcher.enqueue(
         user=user,
         action=AuditAction.LOGIN,
         entity_type="auth",
@@ -852,8 +937,20 @@ async def sso_login(
         request=request,
     )
 
-    return Token(
+    tokens = Token(
         access_token=access_token,
         refresh_token=refresh_token_str,
         token_type="bearer",
     )
+
+    # Reuse the tokens for this SSO token until shortly before the access
+    # token expires, and never past the SSO token's own exp
+    expires_at = time.time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60 - 30
+    sso_exp = payload.get("exp")
+    if isinstance(sso_exp, (int, float)):
+        expires_at = min(expires_at, sso_exp)
+    _sso_token_cache[cache_key] = (expires_at, tokens)
+    if len(_sso_token_cache) > _SSO_TOKEN_CACHE_MAXSIZE:
+        _sso_token_cache.popitem(last=False)
+
+    return tokens
@@ -4,31 +4,28 @@ Microsoft Entra ID Authentication API Endpoints
 Handles OAuth 2.0 authentication flow with Microsoft Entra ID,
 using GET-based redirects (matching PortfolioInvestments pattern).
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
-from fastapi.responses import RedirectResponse, JSONResponse
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
-from datetime import timedelta
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Query, Request, Response
+from fastapi.responses import ORJSONResponse, RedirectResponse
+from typing import Literal, Optional
+import functools
 import secrets
 import logging
+import orjson
 
 from app.core.config import settings
-from app.core.security import create_access_token, create_refresh_token
-from app.api.deps import get_db
+from app.core.security import create_token_pair, set_auth_cookies
+from app.api.deps import AsyncSessionLocal
 from app.services.entra_auth import entra_auth_service
-from app.services.demo_agency_service import create_demo_agency_for_user
+from app.services.entra_state_store import pop_auth_state, save_auth_state
+from app.services.demo_agency_service import create_demo_agency_in_background
 from app.models.audit import AuditAction
-from app.utils.audit import create_audit_log
+from app.utils.audit_batcher import audit_batcher
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth/entra", tags=["entra-authentication"])
 
 
-# In-memory state storage (use Redis in production for multi-instance deployments)
-_auth_states = {}
-
-
 def _build_redirect_uri(request: Request) -> str:
     """
     Build the OAuth redirect URI based on the incoming request.
@@ -46,18 +43,24 @@ def _build_redirect_uri(request: Request) -> str:
     # Validate against allowed redirect URIs
     allowed_uris = settings.entra_allowed_redirect_uris
     if redirect_uri not in allowed_uris:
-        logger.warning(f"Redirect URI {redirect_uri} not in allowed list: {allowed_uris}")
+        logger.warning("Redirect URI %s not in allowed list: %s", redirect_uri, allowed_uris)
         # Fall back to default
         redirect_uri = settings.ENTRA_REDIRECT_URI
 
     return redirect_uri
 
 
-@router.get("/login")
 async def entra_login(
     request: Request,
-    prompt: Optional[str] = Query("select_account", description="Prompt type: select_account, login, consent, or none"),
+    prompt: Literal["select_account", "login", "consent", "none"] = Query(
+        "select_account", description="Prompt type: select_account, login, consent, or none"
+    ),
     redirect_to: Optional[str] = Query(None, description="Frontend URL to redirect after login"),
+    response_format: Optional[Literal["json"]] = Query(
+        None,
+        alias="format",
+        description="Set to json to receive the tokens as JSON from the callback",
+    ),
 ):
     """
     Initiate Microsoft Entra ID OAuth login flow.
@@ -72,55 +75,54 @@ async def entra_login(
                 - consent: Force user to grant consent again
                 - none: SSO if possible (no prompts)
         redirect_to: Optional frontend URL to redirect after successful login
+        response_format: "json" makes the callback answer with JSON instead of a redirect
 
     Returns:
         Redirect to Microsoft login page
     """
-    if not settings.is_entra_configured:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Microsoft Entra ID is not properly configured. Please set ENTRA_CLIENT_ID, ENTRA_CLIENT_SECRET, and ENTRA_TENANT_ID."
-        )
-
     # Build dynamic redirect URI based on request origin
     redirect_uri = _build_redirect_uri(request)
-    logger.info(f"Using redirect URI: {redirect_uri}")
+    logger.info("Using redirect URI: %s", redirect_uri)
 
-    # Generate state for CSRF protection
-    state = secrets.token_urlsafe(32)
-    _auth_states[state] = {
+    # Generate state for CSRF protection: 24 random bytes (192 bits) give a
+    # 32-character URL-safe value, plenty for a 10-minute nonce
+    state = secrets.token_urlsafe(24)
+    # Stored in Redis so any instance can complete the login; expires in 10 minutes
+    await save_auth_state(state, {
         "redirect_uri": redirect_uri,
         "redirect_to": redirect_to or "/auth/callback",  # Default to /auth/callback for frontend
-        "created_at": timedelta(minutes=10)  # State expires in 10 minutes
-    }
+        "format": response_format,
+    })
 
     try:
         # Get authorization URL with prompt parameter and dynamic redirect URI
-        auth_url, _ = entra_auth_service.get_authorization_url(
+        auth_url, _ = await entra_auth_service.get_authorization_url(
             state=state,
             prompt=prompt,
             redirect_uri=redirect_uri
         )
 
-        logger.info(f"Redirecting to Entra ID login (prompt={prompt})")
+        logger.info("Redirecting to Entra ID login (prompt=%s)", prompt)
         return RedirectResponse(url=auth_url)
 
     except ValueError as e:
-        logger.error(f"Error generating auth URL: {e}")
+        logger.error("Error generating auth URL: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
 
-@router.get("/callback")
 async def entra_callback(
     request: Request,
+    background_tasks: BackgroundTasks,
     code: str = Query(..., description="Authorization code"),
     state: str = Query(..., description="State parameter for CSRF protection"),
     error: Optional[str] = Query(None, description="Error from OAuth provider"),
     error_description: Optional[str] = Query(None, description="Error description"),
-    db: AsyncSession = Depends(get_db),
+    response_format: Optional[Literal["json"]] = Query(
+        None, alias="format", description="Set to json to receive the tokens as JSON"
+    ),
 ):
     """
     Handle OAuth callback from Microsoft Entra ID.
@@ -134,29 +136,34 @@ async def entra_callback(
         state: State parameter for CSRF validation
         error: Error code if authentication failed
         error_description: Human-readable error description
-        db: Database session
+        response_format: "json" to return JSON; also taken from the login request
 
     Returns:
-        Redirect to frontend with JWT token, or JSON with token
+        Redirect to frontend with JWT tokens in HttpOnly cookies, or JSON with token
     """
     # Check for OAuth errors
     if error:
-        logger.error(f"Entra ID OAuth error: {error} - {error_description}")
+        logger.error("Entra ID OAuth error: %s - %s", error, error_description)
         # Redirect to frontend with error
         return RedirectResponse(url=f"/login?error={error_description or error}")
 
     # Validate state (CSRF protection)
-    state_data = _auth_states.pop(state, None)
+    state_data = await pop_auth_state(state)
     if state_data is None:
-        logger.error(f"Invalid or expired state parameter: {state}")
+        logger.error("Invalid or expired state parameter: %s", state)
         return RedirectResponse(url="/login?error=Invalid+or+expired+session")
 
     redirect_uri = state_data.get("redirect_uri", settings.ENTRA_REDIRECT_URI)
     redirect_to = state_data.get("redirect_to", "/auth/callback")
+    response_format = response_format or state_data.get("format")
 
     # Exchange code for token using the same redirect_uri
-    logger.info(f"Attempting to exchange authorization code for token with redirect_uri: {redirect_uri}")
-    token_response = entra_auth_service.exchange_code_for_token(code, redirect_uri=redirect_uri)
+    logger.info(
+        "Attempting to exchange authorization code for token with redirect_uri: %s", redirect_uri
+    )
+    token_response = await entra_auth_service.exchange_code_for_token(
+        code, redirect_uri=redirect_uri
+    )
 
     if not token_response:
         logger.error("Failed to exchange authorization code for token")
@@ -165,90 +172,104 @@ async def entra_callback(
     logger.info("Successfully exchanged code for token, parsing ID token claims")
 
     # Parse ID token claims
-    entra_claims = entra_auth_service.parse_id_token(token_response)
+    entra_claims = await entra_auth_service.parse_id_token(token_response)
 
-    logger.info(f"Checking required claims - entra_id: {entra_claims.get('entra_id')}, email: {entra_claims.get('email')}")
+    logger.info(
+        "Checking required claims - entra_id: %s, email: %s",
+        entra_claims.get("entra_id"), entra_claims.get("email"),
+    )
     if not entra_claims.get("entra_id") or not entra_claims.get("email"):
-        logger.error(f"Missing required claims. Available claims: {entra_claims}")
+        logger.error("Missing required claims from Entra ID")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Available claims: %s", entra_claims)
         return RedirectResponse(url="/login?error=Missing+required+claims+from+Entra+ID")
 
-    # Check if user already exists with this Entra ID
-    existing_user = await entra_auth_service.find_user_by_entra_id(db, entra_claims["entra_id"])
+    # Short transactional block: open the session here rather than holding
+    # one from a dependency for the whole request
+    async with AsyncSessionLocal() as db:
+        # Look up the user by Entra ID, falling back to email, in one query
+        user = await entra_auth_service.find_user_by_entra_id_or_email(
+            db, entra_claims["entra_id"], entra_claims["email"]
+        )
 
-    if existing_user:
-        # User already linked - just log them in
-        user = existing_user
-        logger.info(f"Existing Entra user logged in: {user.email}")
-    else:
-        # Check if email already exists (legacy local auth user)
-        email_user = await entra_auth_service.find_user_by_email(db, entra_claims["email"])
-
-        if email_user:
-            # Link Entra ID to existing user
-            if not email_user.azure_ad_object_id:
-                logger.info(f"Found existing user with email {email_user.email}, linking Entra ID")
-                user = await entra_auth_service.link_entra_to_existing_user(db, email_user, entra_claims)
-            else:
-                user = email_user
+        if user is not None and user.azure_ad_object_id == entra_claims["entra_id"]:
+            # User already linked - just log them in
+            logger.info("Existing Entra user logged in: %s", user.email)
+        elif user is not None:
+            # Email already exists (legacy local auth user)
+            if not user.azure_ad_object_id:
+                # Link Entra ID to existing user
+                logger.info("Found existing user with email %s, linking Entra ID", user.email)
+                user = await entra_auth_service.link_entra_to_existing_user(db, user, entra_claims)
         else:
             # Create new user with Entra ID
             user = await entra_auth_service.create_entra_user(db, entra_claims)
-            logger.info(f"New Entra user created: {user.email}")
+            logger.info("New Entra user created: %s", user.email)
 
-            # Create demo agency with sample GTFS data for new users
-            try:
-                await create_demo_agency_for_user(db, user)
-            except Exception as e:
-                logger.warning(f"Failed to create demo agency for user {user.email}: {e}")
+            # Create demo agency with sample GTFS data once the response is sent
+            background_tasks.add_task(create_demo_agency_in_background, user.id)
 
-    # Create JWT tokens for our application
-    access_token = create_access_token(subject=user.id)
-    refresh_token = create_refresh_token(subject=user.id)
+        await db.commit()
 
-    # Create audit log for login
-    try:
-        await create_audit_log(
-            db=db,
-            user=user,
-            action=AuditAction.LOGIN,
-            entity_type="auth",
-            entity_id=str(user.id),
-            description=f"User {user.email} logged in (Entra ID)",
-            request=request,
-        )
-    except Exception as e:
-        logger.warning(f"Failed to create audit log: {e}")
+    # Create JWT tokens for our application
+    access_token, refresh_token = create_token_pair(user.id)
 
-    logger.info(f"User {user.email} authenticated successfully")
+    # Create audit log for login (written by the batcher after the response)
+    audit_batcher.enqueue(
+        user=user,
+        action=AuditAction.LOGIN,
+        entity_type="auth",
+        entity_id=str(user.id),
+        description=f"User {user.email} logged in (Entra ID)",
+        request=request,
+    )
 
-    # Check Accept header to determine response type
-    accept_header = request.headers.get("accept", "")
+    logger.info("User %s authenticated successfully", user.email)
 
-    if "application/json" in accept_header:
+    if response_format == "json":
         # Return JSON response for API clients
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "access_token": access_token,
             "refresh_token": refresh_token,
             "token_type": "bearer",
         })
     else:
-        # Redirect to frontend with token in query params
-        # Frontend will extract and store the token
-        redirect_url = f"{redirect_to}?token={access_token}&refresh_token={refresh_token}"
-        return RedirectResponse(url=redirect_url)
+        # Redirect to frontend with the tokens in HttpOnly cookies, keeping
+        # them out of the URL, browser history and Referer headers
+        response = RedirectResponse(url=redirect_to)
+        set_auth_cookies(response, access_token, refresh_token)
+        return response
+
+
+# The login flow is only routed when Entra ID is configured; otherwise these
+# paths 404 in the router. /config stays registered for frontend discovery.
+if settings.is_entra_configured:
+    router.add_api_route("/login", entra_login, methods=["GET"])
+    router.add_api_route("/callback", entra_callback, methods=["GET"])
+
+
+@functools.cache
+def _entra_config_body() -> bytes:
+    """Serialized /config payload; Entra settings only change on restart"""
+    configured = settings.is_entra_configured
+    return orjson.dumps({
+        "enabled": configured,
+        "configured": configured,
+        "tenant_id": settings.ENTRA_TENANT_ID if configured else None,
+        "login_url": "/api/v1/auth/entra/login" if configured else None,
+    })
 
 
 @router.get("/config")
-async def get_entra_config():
+async def get_entra_config() -> Response:
     """
     Get public Entra ID configuration for frontend.
 
     Returns:
         Public configuration (no secrets)
     """
-    return {
-        "enabled": settings.is_entra_configured,
-        "configured": settings.is_entra_configured,
-        "tenant_id": settings.ENTRA_TENANT_ID if settings.is_entra_configured else None,
-        "login_url": "/api/v1/auth/entra/login" if settings.is_entra_configured else None,
-    }
+    return Response(
+        content=_entra_config_body(),
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=300"},
+    )
@@ -1,13 +1,20 @@
 """Calendar (GTFS service schedules) management endpoints"""
 
-from typing import List, Optional
+import time
+from collections import Counter
+from operator import attrgetter
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy import select, cast, String, func, or_
+from pydantic import TypeAdapter
+from sqlalchemy import and_, insert, select, exists, func, true
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
 
 from app.api import deps
 from app.api.deps import get_db
-from app.models.user import User, UserRole
+from app.models.user import User, UserRole, user_agencies
 from app.models.audit import AuditAction
 from app.models.gtfs import Calendar, CalendarDate, Trip, GTFSFeed
 from app.schemas.calendar import (
@@ -24,76 +31,253 @@ from app.schemas.calendar import (
     CalendarDateList,
     ServiceDaysSummary,
 )
-from app.utils.audit import create_audit_log, serialize_model
+from app.utils.audit import serialize_model
+from app.utils.audit_batcher import audit_batcher
 
 router = APIRouter()
 
+# Rows fetched per round trip when streaming calendar list pages
+_STREAM_BATCH_SIZE = 200
+
+# Sort key for calendar exceptions (dates are YYYYMMDD strings)
+_exception_date_key = attrgetter("date")
+
+# List validators: one pydantic-core call per batch instead of one per row
+_CALENDAR_LIST_ADAPTER = TypeAdapter(List[CalendarResponse])
+_CALENDAR_WITH_STATS_LIST_ADAPTER = TypeAdapter(List[CalendarWithStats])
+_CALENDAR_DATE_LIST_ADAPTER = TypeAdapter(List[CalendarDateResponse])
+
+# Agency roles allowed to modify calendars
+_ADMIN_ROLES = (UserRole.AGENCY_ADMIN, UserRole.SUPER_ADMIN)
+
+
+_DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_WEEKDAYS_MASK = 0b0011111
+_WEEKENDS_MASK = 0b1100000
+
+# Service day bitmask (bit 0 = Monday ... bit 6 = Sunday) ->
+# (days of week, runs all weekdays, runs both weekend days)
+_DAY_MASK_TABLE: Dict[int, Tuple[Tuple[str, ...], bool, bool]] = {
+    mask: (
+        tuple(name for bit, name in enumerate(_DAY_NAMES) if mask & (1 << bit)),
+        mask & _WEEKDAYS_MASK == _WEEKDAYS_MASK,
+        mask & _WEEKENDS_MASK == _WEEKENDS_MASK,
+    )
+    for mask in range(1 << len(_DAY_NAMES))
+}
+
+
+# (monotonic time it was formatted, YYYYMMDD) for the active_only filter
+_TODAY_CACHE: Tuple[float, str] = (0.0, "")
+_TODAY_CACHE_TTL = 1.0
+
+
+def _today_yyyymmdd() -> str:
+    """Today's date as YYYYMMDD, reformatted at most once per second"""
+    global _TODAY_CACHE
+    now = time.monotonic()
+    formatted_at, today = _TODAY_CACHE
+    if now - formatted_at >= _TODAY_CACHE_TTL or not today:
+        today = datetime.now().strftime("%Y%m%d")
+        _TODAY_CACHE = (now, today)
+    return today
+
 
 def _get_service_days_summary(calendar: Calendar, exception_count: int = 0) -> ServiceDaysSummary:
     """Helper to create service days summary"""
-    days = []
-    if calendar.monday:
-        days.append("Monday")
-    if calendar.tuesday:
-        days.append("Tuesday")
-    if calendar.wednesday:
-        days.append("Wednesday")
-    if calendar.thursday:
-        days.append("Thursday")
-    if calendar.friday:
-        days.append("Friday")
-    if calendar.saturday:
-        days.append("Saturday")
-    if calendar.sunday:
-        days.append("Sunday")
-
-    weekdays = all([calendar.monday, calendar.tuesday, calendar.wednesday,
-                    calendar.thursday, calendar.friday])
-    weekends = calendar.saturday and calendar.sunday
+    mask = (
+        calendar.monday
+        | calendar.tuesday << 1
+        | calendar.wednesday << 2
+        | calendar.thursday << 3
+        | calendar.friday << 4
+        | calendar.saturday << 5
+        | calendar.sunday << 6
+    )
+    days, weekdays, weekends = _DAY_MASK_TABLE[mask]
 
     return ServiceDaysSummary(
         weekdays=weekdays,
         weekends=weekends,
-        days_of_week=days,
+        days_of_week=list(days),
         start_date=calendar.start_date,
         end_date=calendar.end_date,
         total_exceptions=exception_count,
     )
 
 
+def _paginate_meta(skip: int, limit: int, total: Optional[int]) -> Dict[str, int]:
+    """Pagination fields for a list response (limit is validated as >= 1)."""
+    total = total or 0
+    return {
+        "total": total,
+        "page": skip // limit + 1,
+        "page_size": limit,
+        "pages": (total + limit - 1) // limit if total else 0,
+    }
+
+
+def _membership_exists(current_user: User, require_roles: Optional[Sequence[UserRole]] = None):
+    """
+    EXISTS clause for the user's membership of the selected feed's agency.
+
+    Super admins have access to every feed, so no membership probe is issued
+    for them.
+    """
+    if current_user.is_superuser:
+        return true()
+
+    membership = exists().where(
+        user_agencies.c.user_id == current_user.id,
+        user_agencies.c.agency_id == GTFSFeed.agency_id,
+    )
+    if require_roles:
+        membership = membership.where(user_agencies.c.role.in_(require_roles))
+    return membership
+
+
+def _check_feed_row(row, current_user: User, forbidden_detail: str) -> None:
+    """Raise 404/403 for a (feed, has_access, ...) row from a feed access query."""
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Feed not found",
+        )
+
+    # Check user has access to the agency (if not super admin)
+    if not row.has_access and not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=forbidden_detail,
+        )
+
+
 async def _verify_feed_access(
     feed_id: int,
     current_user: User,
     db: AsyncSession,
+    require_roles: Optional[Tuple[UserRole, ...]] = None,
+    forbidden_detail: str = "You don't have access to this feed",
+    request: Optional[Request] = None,
 ) -> GTFSFeed:
-    """Verify that the feed exists and the user has access to it."""
+    """
+    Verify that the feed exists and the user has access to it.
+
+    The feed and the user's membership of its agency (optionally restricted
+    to require_roles) are fetched in a single query. When a request is given,
+    the verified feed is cached on request.state so later checks for the
+    same feed and roles in that request reuse it.
+    """
+    cache = None
+    cache_key = (feed_id, require_roles)
+    if request is not None:
+        cache = getattr(request.state, "feed_access", None)
+        if cache is None:
+            cache = request.state.feed_access = {}
+        if cache_key in cache:
+            return cache[cache_key]
+
+    membership = _membership_exists(current_user, require_roles)
     result = await db.execute(
-        select(GTFSFeed).where(GTFSFeed.id == feed_id)
+        select(GTFSFeed, membership.label("has_access"))
+        .options(raiseload("*"))
+        .where(GTFSFeed.id == feed_id)
     )
-    feed = result.scalar_one_or_none()
+    row = result.first()
+    _check_feed_row(row, current_user, forbidden_detail)
 
-    if not feed:
+    if cache is not None:
+        cache[cache_key] = row.GTFSFeed
+    return row.GTFSFeed
+
+
+def _require_feed_access(
+    require_roles: Optional[Tuple[UserRole, ...]] = None,
+    forbidden_detail: str = "You don't have access to this feed",
+):
+    """
+    Create a dependency that loads the path's feed and verifies access to it.
+
+    The result is cached on request.state (see _verify_feed_access).
+    """
+
+    async def feed_loader(
+        feed_id: int,
+        request: Request,
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(deps.get_current_active_user),
+    ) -> GTFSFeed:
+        return await _verify_feed_access(
+            feed_id,
+            current_user,
+            db,
+            require_roles=require_roles,
+            forbidden_detail=forbidden_detail,
+            request=request,
+        )
+
+    return feed_loader
+
+
+async def _verify_feed_access_for_read(
+    feed_id: int,
+    current_user: User,
+    db: AsyncSession,
+) -> Optional[GTFSFeed]:
+    """
+    Verify feed access for read endpoints that do not use the feed itself.
+
+    Super admins only need the feed to exist, so for them this runs a bare
+    EXISTS and returns None instead of loading the feed row.
+    """
+    if not current_user.is_superuser:
+        return await _verify_feed_access(feed_id, current_user, db)
+
+    if not await db.scalar(select(exists().where(GTFSFeed.id == feed_id))):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Feed not found",
         )
+    return None
 
-    # Check user has access to the agency (if not super admin)
-    if not current_user.is_superuser:
-        from app.models.user import user_agencies
 
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == feed.agency_id,
+async def _load_feed_and_calendar(
+    feed_id: int,
+    service_id: str,
+    current_user: User,
+    db: AsyncSession,
+    require_roles: Optional[Sequence[UserRole]] = None,
+    forbidden_detail: str = "You don't have access to this feed",
+    not_found_detail: str = "Calendar not found",
+    calendar_options: Sequence[ORMOption] = (),
+) -> Tuple[GTFSFeed, Calendar]:
+    """
+    Verify feed access like _verify_feed_access and load a calendar by
+    composite key (feed_id, service_id) in the same query.
+
+    Relationships are raiseload'ed; pass calendar_options to eager load the
+    ones a caller needs.
+    """
+    membership = _membership_exists(current_user, require_roles)
+    result = await db.execute(
+        select(GTFSFeed, membership.label("has_access"), Calendar)
+        .outerjoin(
+            Calendar,
+            and_(Calendar.feed_id == GTFSFeed.id, Calendar.service_id == service_id),
+        )
+        .options(*calendar_options, raiseload("*"))
+        .where(GTFSFeed.id == feed_id)
+    )
+    row = result.first()
+    _check_feed_row(row, current_user, forbidden_detail)
+
+    if row.Calendar is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=not_found_detail,
         )
-        membership_result = await db.execute(membership_query)
-        if not membership_result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have access to this feed",
-            )
 
-    return feed
+    return row.GTFSFeed, row.Calendar
 
 
 @router.get("/", response_model=CalendarList)
@@ -111,64 +295,56 @@ async def list_calendars(
 
     Users only see calendars from feeds they have access to.
     """
-    # Build query - join with GTFSFeed for agency filtering
-    from app.models.gtfs import GTFSFeed
-    from app.models.user import user_agencies
-
     # Verify feed exists and user has access
-    feed_result = await db.execute(
-        select(GTFSFeed).where(GTFSFeed.id == feed_id)
-    )
-    feed = feed_result.scalar_one_or_none()
-    if not feed:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Feed not found",
-        )
-
-    # Check access
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == feed.agency_id,
-        )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have access to this feed",
-            )
+    await _verify_feed_access_for_read(feed_id, current_user, db)
 
-    # Build query for calendars in this specific feed
-    query = select(Calendar).where(Calendar.feed_id == feed_id)
+    # Filters for calendars in this specific feed, shared by the page and
+    # count queries
+    filters = [Calendar.feed_id == feed_id]
 
     if search:
-        query = query.where(Calendar.service_id.ilike(f"%{search}%"))
+        filters.append(Calendar.service_id.ilike(f"%{search}%"))
 
     if active_only:
         # Filter by current date (simplified - would need proper date handling)
-        from datetime import datetime
-        today = datetime.now().strftime("%Y%m%d")
-        query = query.where(
-            Calendar.start_date <= today,
-            Calendar.end_date >= today,
+        today = _today_yyyymmdd()
+        filters.append(Calendar.start_date <= today)
+        filters.append(Calendar.end_date >= today)
+
+    # Get paginated results with the total count computed in the same scan
+    paged_query = (
+        select(Calendar, func.count().over().label("total_count"))
+        .options(raiseload("*"))
+        .where(*filters)
+        .offset(skip)
+        .limit(limit)
+        .order_by(Calendar.service_id)
+    )
+    # Rows are streamed in batches and each batch is validated with one
+    # TypeAdapter call instead of materializing the whole page first
+    items = []
+    total = None
+    result = await db.stream(paged_query.execution_options(yield_per=_STREAM_BATCH_SIZE))
+    async for partition in result.partitions():
+        if total is None:
+            total = partition[0].total_count
+        items.extend(
+            _CALENDAR_LIST_ADAPTER.validate_python(
+                [row.Calendar for row in partition], from_attributes=True
+            )
         )
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
-
-    # Get paginated results
-    query = query.offset(skip).limit(limit).order_by(Calendar.service_id)
-    result = await db.execute(query)
-    calendars = result.scalars().all()
+    if total is None:
+        if skip:
+            # Page is past the end; the window count is unavailable without rows
+            count_query = select(func.count(Calendar.service_id)).where(*filters)
+            total = await db.scalar(count_query)
+        else:
+            total = 0
 
     return CalendarList(
-        items=[CalendarResponse.model_validate(cal) for cal in calendars],
-        total=total or 0,
-        page=skip // limit + 1 if limit > 0 else 1,
-        page_size=limit,
-        pages=(total + limit - 1) // limit if total and limit > 0 else 0,
+        items=items,
+        **_paginate_meta(skip, limit, total),
     )
 
 
@@ -183,82 +359,62 @@ async def list_calendars_with_stats(
     """
     List calendars with statistics (trip counts, exception counts).
     """
-    from app.models.gtfs import GTFSFeed
-    from app.models.user import user_agencies
-
     # Verify feed exists and user has access
-    feed_result = await db.execute(
-        select(GTFSFeed).where(GTFSFeed.id == feed_id)
-    )
-    feed = feed_result.scalar_one_or_none()
-    if not feed:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Feed not found",
-        )
-
-    # Check access
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == feed.agency_id,
-        )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have access to this feed",
-            )
-
-    # Build query for calendars in this specific feed
-    query = select(Calendar).where(Calendar.feed_id == feed_id)
-
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
-
-    # Get paginated results
-    query = query.offset(skip).limit(limit).order_by(Calendar.service_id)
-    result = await db.execute(query)
-    calendars = result.scalars().all()
-
-    # Get trip counts (using composite key - service_id is string)
-    service_ids = [cal.service_id for cal in calendars]
-    trip_counts_query = (
-        select(Trip.service_id, func.count())
-        .where(Trip.feed_id == feed_id, Trip.service_id.in_(service_ids))
-        .group_by(Trip.service_id)
-    )
-    trip_counts_result = await db.execute(trip_counts_query)
-    trip_counts = dict(trip_counts_result.all())
-
-    # Get exception counts (using composite key)
-    exception_counts_query = (
-        select(CalendarDate.service_id, func.count())
-        .where(CalendarDate.feed_id == feed_id, CalendarDate.service_id.in_(service_ids))
-        .group_by(CalendarDate.service_id)
-    )
-    exception_counts_result = await db.execute(exception_counts_query)
-    exception_counts = dict(exception_counts_result.all())
-
-    # Build response
+    await _verify_feed_access_for_read(feed_id, current_user, db)
+
+    # Trip and exception counts (composite key) as correlated subqueries, so
+    # one round trip returns each page row with its stats
+    trip_count = (
+        select(func.count())
+        .where(Trip.feed_id == feed_id, Trip.service_id == Calendar.service_id)
+        .correlate(Calendar)
+        .scalar_subquery()
+        .label("trip_count")
+    )
+    exception_count = (
+        select(func.count())
+        .where(CalendarDate.feed_id == feed_id, CalendarDate.service_id == Calendar.service_id)
+        .correlate(Calendar)
+        .scalar_subquery()
+        .label("exception_count")
+    )
+
+    # Get paginated results with the total count computed in the same scan.
+    # Plain columns rather than ORM entities: each row already holds every
+    # field of CalendarWithStats, so it is validated once, directly.
+    paged_query = (
+        select(
+            *Calendar.__table__.columns,
+            trip_count,
+            exception_count,
+            func.count().over().label("total_count"),
+        )
+        .where(Calendar.feed_id == feed_id)
+        .offset(skip)
+        .limit(limit)
+        .order_by(Calendar.service_id)
+    )
+
+    # Build response while streaming the page
     items = []
-    for cal in calendars:
-        cal_data = CalendarResponse.model_validate(cal)
-        items.append(
-            CalendarWithStats(
-                **cal_data.model_dump(),
-                trip_count=trip_counts.get(cal.service_id, 0),
-                exception_count=exception_counts.get(cal.service_id, 0),
-            )
-        )
+    total = None
+    result = await db.stream(paged_query.execution_options(yield_per=_STREAM_BATCH_SIZE))
+    async for partition in result.mappings().partitions():
+        if total is None:
+            total = partition[0]["total_count"]
+        items.extend(_CALENDAR_WITH_STATS_LIST_ADAPTER.validate_python(partition))
+
+    if total is None:
+        if skip:
+            # Page is past the end; the window count is unavailable without rows
+            count_query = select(func.count(Calendar.service_id)).where(Calendar.feed_id == feed_id)
+            total = await db.scalar(count_query)
+        else:
+            total = 0
 
     return CalendarListWithStats(
         items=items,
-        total=total or 0,
-        page=skip // limit + 1 if limit > 0 else 1,
-        page_size=limit,
-        pages=(total + limit - 1) // limit if total and limit > 0 else 0,
+        **_paginate_meta(skip, limit, total),
     )
 
 
@@ -269,48 +425,27 @@ async def create_calendar(
     request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(deps.get_current_active_user),
+    # Verify feed exists and user is an admin of its agency
+    feed: GTFSFeed = Depends(
+        _require_feed_access(
+            _ADMIN_ROLES,
+            "You don't have permission to create calendars for this agency",
+        )
+    ),
 ) -> Calendar:
     """
     Create a new calendar/service.
 
     Super admins and agency admins can create calendars.
     """
-    from app.models.gtfs import GTFSFeed
-    from app.models.user import user_agencies
-
-    # Verify feed exists and get its agency
-    feed_result = await db.execute(
-        select(GTFSFeed).where(GTFSFeed.id == feed_id)
-    )
-    feed = feed_result.scalar_one_or_none()
-    if not feed:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Feed not found",
-        )
-
-    # Check permissions - must be super admin or agency admin for the feed's agency
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == feed.agency_id,
-            cast(user_agencies.c.role, String).in_([UserRole.AGENCY_ADMIN.value, UserRole.SUPER_ADMIN.value]),
-        )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have permission to create calendars for this agency",
-            )
-
     # Check if service_id already exists for this feed (composite key validation)
-    existing = await db.execute(
-        select(Calendar).where(
+    exists_query = select(
+        exists().where(
             Calendar.feed_id == feed_id,
             Calendar.service_id == calendar_in.service_id,
         )
     )
-    if existing.scalar_one_or_none():
+    if await db.scalar(exists_query):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Calendar with service_id '{calendar_in.service_id}' already exists for this feed",
@@ -319,62 +454,69 @@ async def create_calendar(
     # Validate exceptions for duplicate dates before creating anything
     exceptions_data = calendar_in.exceptions or []
     if exceptions_data:
-        seen_dates = set()
-        for exc in exceptions_data:
-            if exc.date in seen_dates:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Duplicate exception date: {exc.date}",
-                )
-            seen_dates.add(exc.date)
+        dates = [exc.date for exc in exceptions_data]
+        if len(set(dates)) != len(dates):
+            duplicate_date, _ = Counter(dates).most_common(1)[0]
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Duplicate exception date: {duplicate_date}",
+            )
 
     # Create calendar (exclude exceptions from the model_dump)
     calendar_data = calendar_in.model_dump(exclude={"exceptions"})
     calendar = Calendar(**calendar_data)
     db.add(calendar)
 
-    # Create exceptions in the same transaction
-    created_exceptions = []
-    for exc in exceptions_data:
-        calendar_date = CalendarDate(
-            feed_id=feed_id,
-            service_id=calendar_in.service_id,
-            date=exc.date,
-            exception_type=exc.exception_type,
+    # Create exceptions in the same transaction with one multi-row INSERT;
+    # the calendar row is flushed first for the composite foreign key
+    if exceptions_data:
+        await db.flush()
+        await db.execute(
+            insert(CalendarDate),
+            [
+                {
+                    "feed_id": feed_id,
+                    "service_id": calendar_in.service_id,
+                    "date": exc.date,
+                    "exception_type": exc.exception_type,
+                }
+                for exc in exceptions_data
+            ],
         )
-        db.add(calendar_date)
-        created_exceptions.append(calendar_date)
 
     # Commit everything atomically
     await db.commit()
     await db.refresh(calendar)
 
-    # Create audit log for calendar
-    await create_audit_log(
-        db=db,
-        user=current_user,
-        action=AuditAction.CREATE,
-        entity_type="calendar",
-        entity_id=f"{feed_id}:{calendar.service_id}",
-        description=f"Created calendar service '{calendar.service_id}'" +
-                    (f" with {len(created_exceptions)} exceptions" if created_exceptions else ""),
-        new_values=serialize_model(calendar),
-        agency_id=feed.agency_id,
-        request=request,
-    )
-
-    # Create audit logs for exceptions
-    for exc in created_exceptions:
-        await create_audit_log(
-            db=db,
+    # Audit the calendar and each of its exceptions off the request path
+    audit_entries = [
+        {
+            "action": AuditAction.CREATE,
+            "entity_type": "calendar",
+            "entity_id": f"{feed_id}:{calendar.service_id}",
+            "description": f"Created calendar service '{calendar.service_id}'" +
+                           (f" with {len(exceptions_data)} exceptions" if exceptions_data else ""),
+            "new_values": serialize_model(calendar),
+        }
+    ]
+    audit_entries.extend(
+        {
+            "action": AuditAction.CREATE,
+            "entity_type": "calendar_date",
+            "entity_id": f"{feed_id}:{calendar.service_id}:{exc.date}",
+            "description": (
+                f"Created calendar exception for service '{calendar.service_id}' on {exc.date}"
+            ),
+            "new_values": {"date": exc.date, "exception_type": exc.exception_type},
+        }
+        for exc in exceptions_data
+    )
+    for entry in audit_entries:
+        audit_batcher.enqueue(
             user=current_user,
-            action=AuditAction.CREATE,
-            entity_type="calendar_date",
-            entity_id=f"{feed_id}:{calendar.service_id}:{exc.date}",
-            description=f"Created calendar exception for service '{calendar.service_id}' on {exc.date}",
-            new_values={"date": exc.date, "exception_type": exc.exception_type},
             agency_id=feed.agency_id,
             request=request,
+            **entry,
         )
 
     return calendar
@@ -390,47 +532,8 @@ async def get_calendar(
     """
     Get calendar details by composite key (feed_id, service_id).
     """
-    from app.models.gtfs import GTFSFeed
-    from app.models.user import user_agencies
-
-    # Verify feed exists and user has access
-    feed_result = await db.execute(
-        select(GTFSFeed).where(GTFSFeed.id == feed_id)
-    )
-    feed = feed_result.scalar_one_or_none()
-    if not feed:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Feed not found",
-        )
-
-    # Check access
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == feed.agency_id,
-        )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have access to this feed",
-            )
-
-    # Get calendar with composite key
-    result = await db.execute(
-        select(Calendar).where(
-            Calendar.feed_id == feed_id,
-            Calendar.service_id == service_id
-        )
-    )
-    calendar = result.scalar_one_or_none()
-
-    if not calendar:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Calendar not found",
-        )
+    # Verify feed access and load the calendar (composite key) in one query
+    _, calendar = await _load_feed_and_calendar(feed_id, service_id, current_user, db)
 
     return calendar
 
@@ -445,47 +548,8 @@ async def get_calendar_summary(
     """
     Get calendar with human-readable summary using composite key (feed_id, service_id).
     """
-    from app.models.gtfs import GTFSFeed
-    from app.models.user import user_agencies
-
-    # Verify feed exists and user has access
-    feed_result = await db.execute(
-        select(GTFSFeed).where(GTFSFeed.id == feed_id)
-    )
-    feed = feed_result.scalar_one_or_none()
-    if not feed:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Feed not found",
-        )
-
-    # Check access
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == feed.agency_id,
-        )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have access to this feed",
-            )
-
-    # Get calendar with composite key
-    result = await db.execute(
-        select(Calendar).where(
-            Calendar.feed_id == feed_id,
-            Calendar.service_id == service_id
-        )
-    )
-    calendar = result.scalar_one_or_none()
-
-    if not calendar:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Calendar not found",
-        )
+    # Verify feed access and load the calendar (composite key) in one query
+    _, calendar = await _load_feed_and_calendar(feed_id, service_id, current_user, db)
 
     # Get exception count (using composite key)
     exception_count_query = select(func.count()).where(
@@ -517,58 +581,25 @@ async def update_calendar(
 
     Super admins and agency admins can update calendars.
     """
-    from app.models.gtfs import GTFSFeed
-    from app.models.user import user_agencies
-
-    # Verify feed exists and user has access
-    feed_result = await db.execute(
-        select(GTFSFeed).where(GTFSFeed.id == feed_id)
+    # Verify feed access and load the calendar (composite key) in one query
+    feed, calendar = await _load_feed_and_calendar(
+        feed_id,
+        service_id,
+        current_user,
+        db,
+        require_roles=_ADMIN_ROLES,
+        forbidden_detail="You don't have permission to update this calendar",
     )
-    feed = feed_result.scalar_one_or_none()
-    if not feed:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Feed not found",
-        )
-
-    # Check permissions - must be super admin or agency admin for the feed's agency
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == feed.agency_id,
-            cast(user_agencies.c.role, String).in_([UserRole.AGENCY_ADMIN.value, UserRole.SUPER_ADMIN.value]),
-        )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have permission to update this calendar",
-            )
-
-    # Get calendar with composite key
-    result = await db.execute(
-        select(Calendar).where(
-            Calendar.feed_id == feed_id,
-            Calendar.service_id == service_id
-        )
-    )
-    calendar = result.scalar_one_or_none()
-
-    if not calendar:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Calendar not found",
-        )
 
     # Check if service_id is being changed and if it conflicts
     if calendar_in.service_id and calendar_in.service_id != calendar.service_id:
-        existing = await db.execute(
-            select(Calendar).where(
+        exists_query = select(
+            exists().where(
                 Calendar.feed_id == feed_id,
                 Calendar.service_id == calendar_in.service_id,
             )
         )
-        if existing.scalar_one_or_none():
+        if await db.scalar(exists_query):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Calendar with service_id '{calendar_in.service_id}' already exists",
@@ -586,8 +617,7 @@ async def update_calendar(
     await db.refresh(calendar)
 
     # Create audit log
-    await create_audit_log(
-        db=db,
+    audit_batcher.enqueue(
         user=current_user,
         action=AuditAction.UPDATE,
         entity_type="calendar",
@@ -616,48 +646,15 @@ async def delete_calendar(
     Super admins and agency admins can delete calendars.
     This will cascade delete all calendar dates and fail if trips reference it.
     """
-    from app.models.gtfs import GTFSFeed
-    from app.models.user import user_agencies
-
-    # Verify feed exists and user has access
-    feed_result = await db.execute(
-        select(GTFSFeed).where(GTFSFeed.id == feed_id)
-    )
-    feed = feed_result.scalar_one_or_none()
-    if not feed:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Feed not found",
-        )
-
-    # Check permissions - must be super admin or agency admin for the feed's agency
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == feed.agency_id,
-            cast(user_agencies.c.role, String).in_([UserRole.AGENCY_ADMIN.value, UserRole.SUPER_ADMIN.value]),
-        )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have permission to delete this calendar",
-            )
-
-    # Get calendar with composite key
-    result = await db.execute(
-        select(Calendar).where(
-            Calendar.feed_id == feed_id,
-            Calendar.service_id == service_id
-        )
+    # Verify feed access and load the calendar (composite key) in one query
+    feed, calendar = await _load_feed_and_calendar(
+        feed_id,
+        service_id,
+        current_user,
+        db,
+        require_roles=_ADMIN_ROLES,
+        forbidden_detail="You don't have permission to delete this calendar",
     )
-    calendar = result.scalar_one_or_none()
-
-    if not calendar:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Calendar not found",
-        )
 
     # Check if any trips use this calendar (using composite key)
     trip_count_query = select(func.count()).where(
@@ -672,25 +669,32 @@ async def delete_calendar(
             detail=f"Cannot delete calendar: {trip_count} trips are using this service",
         )
 
+    # The ORM delete cascade walks both collections; load them only now that
+    # the calendar is known to be deletable (trips is empty at this point)
+    await db.execute(
+        select(Calendar)
+        .where(Calendar.feed_id == feed_id, Calendar.service_id == service_id)
+        .options(selectinload(Calendar.trips), selectinload(Calendar.calendar_dates))
+        .execution_options(populate_existing=True)
+    )
+
     # Store values for audit log before deletion
     old_values = serialize_model(calendar)
 
-    # Create audit log before deletion
-    await create_audit_log(
-        db=db,
+    await db.delete(calendar)
+    await db.commit()
+
+    audit_batcher.enqueue(
         user=current_user,
         action=AuditAction.DELETE,
         entity_type="calendar",
         entity_id=f"{feed_id}:{service_id}",
-        description=f"Deleted calendar service '{calendar.service_id}'",
+        description=f"Deleted calendar service '{service_id}'",
         old_values=old_values,
         agency_id=feed.agency_id,
         request=request,
     )
 
-    await db.delete(calendar)
-    await db.commit()
-
 
 # Calendar Date (Exception) Endpoints
 
@@ -705,60 +709,19 @@ async def list_calendar_exceptions(
     """
     List all date exceptions for a calendar using composite key (feed_id, service_id).
     """
-    from app.models.gtfs import GTFSFeed
-    from app.models.user import user_agencies
-
-    # Verify feed exists and user has access
-    feed_result = await db.execute(
-        select(GTFSFeed).where(GTFSFeed.id == feed_id)
-    )
-    feed = feed_result.scalar_one_or_none()
-    if not feed:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Feed not found",
-        )
-
-    # Check access
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == feed.agency_id,
-        )
-        result = await db.execute(membership_query)
-        if not result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have access to this feed",
-            )
-
-    # Verify calendar exists (composite key)
-    cal_result = await db.execute(
-        select(Calendar).where(
-            Calendar.feed_id == feed_id,
-            Calendar.service_id == service_id
-        )
-    )
-    if not cal_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Calendar not found",
-        )
-
-    # Get exceptions (composite key)
-    query = (
-        select(CalendarDate)
-        .where(
-            CalendarDate.feed_id == feed_id,
-            CalendarDate.service_id == service_id
-        )
-        .order_by(CalendarDate.date)
+    # Verify feed access and load the calendar (composite key) with its
+    # exceptions eagerly loaded, so no separate CalendarDate query is needed
+    _, calendar = await _load_feed_and_calendar(
+        feed_id,
+        service_id,
+        current_user,
+        db,
+        calendar_options=(selectinload(Calendar.calendar_dates),),
     )
-    result = await db.execute(query)
-    exceptions = result.scalars().all()
+    exceptions = sorted(calendar.calendar_dates, key=_exception_date_key)
 
     return CalendarDateList(
-        items=[CalendarDateResponse.model_validate(ex) for ex in exceptions],
+        items=_CALENDAR_DATE_LIST_ADAPTER.validate_python(exceptions, from_attributes=True),
         total=len(exceptions),
     )
 
@@ -777,41 +740,25 @@ async def create_calendar_exception(
 
     Super admins and agency admins can create exceptions.
     """
-    from app.models.gtfs import GTFSFeed
-
-    # Verify feed exists
-    feed_result = await db.execute(
-        select(GTFSFeed).where(GTFSFeed.id == feed_id)
-    )
-    feed = feed_result.scalar_one_or_none()
-    if not feed:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Feed not found",
-        )
-
-    # Verify calendar exists (composite key)
-    cal_result = await db.execute(
-        select(Calendar).where(
-            Calendar.feed_id == feed_id,
-            Calendar.service_id == service_id
-        )
+    # Verify feed access and load the calendar (composite key) in one query
+    feed, _ = await _load_feed_and_calendar(
+        feed_id,
+        service_id,
+        current_user,
+        db,
+        require_roles=_ADMIN_ROLES,
+        forbidden_detail="You don't have permission to create exceptions for this calendar",
     )
-    if not cal_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Calendar not found",
-        )
 
     # Check if exception already exists for this date (composite key)
-    existing = await db.execute(
-        select(CalendarDate).where(
+    exists_query = select(
+        exists().where(
             CalendarDate.feed_id == feed_id,
             CalendarDate.service_id == service_id,
             CalendarDate.date == exception_in.date,
         )
     )
-    if existing.scalar_one_or_none():
+    if await db.scalar(exists_query):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Exception for date {exception_in.date} already exists for this calendar",
@@ -830,8 +777,7 @@ async def create_calendar_exception(
 
     # Create audit log
     if request:
-        await create_audit_log(
-            db=db,
+        audit_batcher.enqueue(
             user=current_user,
             action=AuditAction.CREATE,
             entity_type="calendar_date",
@@ -854,43 +800,22 @@ async def update_calendar_exception(
     request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(deps.get_current_active_user),
+    # Verify feed exists and user is an admin of its agency
+    feed: GTFSFeed = Depends(
+        _require_feed_access(
+            _ADMIN_ROLES,
+            "You don't have permission to update this exception",
+        )
+    ),
 ) -> CalendarDate:
     """
     Update a calendar date exception using composite key (feed_id, service_id, date).
 
     Super admins and agency admins can update exceptions.
     """
-    from app.models.gtfs import GTFSFeed
-    from app.models.user import user_agencies
-
-    # Verify feed exists and user has access
-    feed_result = await db.execute(
-        select(GTFSFeed).where(GTFSFeed.id == feed_id)
-    )
-    feed = feed_result.scalar_one_or_none()
-    if not feed:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Feed not found",
-        )
-
-    # Check permissions
-    if not current_user.is_superuser:
-        membership_query = select(user_agencies).where(
-            user_agencies.c.user_id == current_user.id,
-            user_agencies.c.agency_id == feed.agency_id,
-            cast(user_agencies.c.role, String).in_([UserRole.AGENCY_ADMIN.value, UserRole.SUPER_ADMIN.value]),
-        )
-        perm_result = await db.execute(membership_query)
-        if not perm_result.first():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have permission to update this exception",
-            )
-
     # Get exception with composite key
     result = await db.execute(
-        select(CalendarDate).where(
+        select(CalendarDate).options(raiseload("*")).where(
             CalendarDate.feed_id == feed_id,
             CalendarDate.service_id == service_id,
             CalendarDate.date == date,
@@ -919,8 +844,7 @@ async def update_calendar_exception(
     await db.refresh(exception)
 
     # Create audit log
-    await create_audit_log(
-        db=db,
+    audit_batcher.enqueue(
         user=current_user,
         action=AuditAction.UPDATE,
         entity_type="calendar_date",
@@ -949,25 +873,20 @@ async def delete_calendar_exception(
 
     Super admins and agency admins can delete exceptions.
     """
-    # Verify user has access to the feed
-    feed = await _verify_feed_access(feed_id, current_user, db)
-
-    # Verify calendar exists in this feed
-    calendar_result = await db.execute(
-        select(Calendar).where(
-            Calendar.feed_id == feed_id,
-            Calendar.service_id == service_id
-        )
+    # Verify feed access (admin role) and load the calendar in one query
+    feed, _ = await _load_feed_and_calendar(
+        feed_id,
+        service_id,
+        current_user,
+        db,
+        require_roles=_ADMIN_ROLES,
+        forbidden_detail="You don't have permission to delete this exception",
+        not_found_detail=f"Calendar '{service_id}' not found in this feed",
     )
-    if not calendar_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Calendar '{service_id}' not found in this feed",
-        )
 
     # Get exception with composite key
     result = await db.execute(
-        select(CalendarDate).where(
+        select(CalendarDate).options(raiseload("*")).where(
             CalendarDate.feed_id == feed_id,
             CalendarDate.service_id == service_id,
             CalendarDate.date == date,
@@ -981,18 +900,19 @@ async def delete_calendar_exception(
             detail=f"Calendar exception for date '{date}' not found",
         )
 
-    # Create audit log before deletion
-    await create_audit_log(
-        db=db,
+    # Store values for audit log before deletion
+    old_values = {"date": exception.date, "exception_type": exception.exception_type}
+
+    await db.delete(exception)
+    await db.commit()
+
+    audit_batcher.enqueue(
         user=current_user,
         action=AuditAction.DELETE,
         entity_type="calendar_date",
         entity_id=f"{feed_id}:{service_id}:{date}",
         description=f"Deleted calendar exception for date '{date}'",
-        old_values={"date": exception.date, "exception_type": exception.exception_type},
+        old_values=old_values,
         agency_id=feed.agency_id,
         request=request,
     )
-
-    await db.delete(exception)
-    await db.commit()
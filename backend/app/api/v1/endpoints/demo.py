@@ -2,9 +2,15 @@
 
 import math
 import time
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Optional
-from fastapi import APIRouter, Depends, Response
+from typing import Literal, Optional
+
+import numpy as np
+import orjson
+from fastapi import APIRouter, Depends, Query, Response
+from google.protobuf.json_format import MessageToJson
+from google.transit import gtfs_realtime_pb2
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 
@@ -13,32 +19,69 @@ from app.models.gtfs import GTFSFeed, Route, Trip, Stop, StopTime, Shape
 
 router = APIRouter()
 
+# Headers sent with every simulated feed
+_DEMO_FEED_HEADERS = {
+    "Cache-Control": "no-cache, no-store, must-revalidate",
+    "X-GTFS-RT-Demo": "true"
+}
+
+
+def new_feed_message() -> gtfs_realtime_pb2.FeedMessage:
+    """Create a FULL_DATASET GTFS-RT FeedMessage stamped with the current time"""
+    feed = gtfs_realtime_pb2.FeedMessage()
+    feed.header.gtfs_realtime_version = "2.0"
+    feed.header.incrementality = gtfs_realtime_pb2.FeedHeader.FULL_DATASET
+    feed.header.timestamp = int(time.time())
+    return feed
+
+
+def feed_message_response(
+    feed: gtfs_realtime_pb2.FeedMessage,
+    response_format: Optional[str] = None
+) -> Response:
+    """
+    Serialize a FeedMessage as Protocol Buffers, or as JSON when
+    response_format is "json" (for debugging).
+    """
+    if response_format == "json":
+        return Response(
+            content=MessageToJson(feed, preserving_proto_field_name=True),
+            media_type="application/json",
+            headers=_DEMO_FEED_HEADERS
+        )
+    return Response(
+        content=feed.SerializeToString(),
+        media_type="application/x-protobuf",
+        headers=_DEMO_FEED_HEADERS
+    )
+
 
-def interpolate_position(
-    lat1: float, lon1: float,
-    lat2: float, lon2: float,
-    progress: float
-) -> tuple[float, float]:
-    """Interpolate position between two points based on progress (0-1)"""
-    lat = lat1 + (lat2 - lat1) * progress
-    lon = lon1 + (lon2 - lon1) * progress
-    return lat, lon
+# Used for vehicles whose trip has no shape
+_DEFAULT_POSITION = (45.5088, -73.5540)  # Montreal
+_EMPTY_SHAPE = np.empty((0, 2))
 
 
-def get_simulated_vehicle_position(
-    trip_id: str,
-    route_type: int,
-    shape_points: list[tuple[float, float]],
+def batch_vehicle_positions(
+    trip_ids: list[str],
+    shape_arrays: list[np.ndarray],
     cycle_seconds: int = 60
-) -> tuple[float, float, float, float]:
+) -> np.ndarray:
     """
-    Calculate simulated vehicle position based on current time.
+    Calculate simulated positions for a set of vehicles based on current time.
 
-    Vehicles complete the route every cycle_seconds (default 60 seconds).
-    This means positions update visibly every 15 seconds.
+    Each vehicle moves along its shape (an (n, 2) array of lat/lon degrees)
+    and completes it every cycle_seconds (default 60 seconds), offset by its
+    trip_id so vehicles on the same shape don't overlap. All vehicles are
+    interpolated in a single vectorized pass.
 
-    Returns: (latitude, longitude, bearing, speed)
+    Returns: (len(trip_ids), 3) array of (latitude, longitude, bearing)
     """
+    count = len(trip_ids)
+    positions = np.zeros((count, 3))
+    positions[:, 0], positions[:, 1] = _DEFAULT_POSITION
+    if count == 0:
+        return positions
+
     # Get current time in seconds since midnight
     now = datetime.now()
     seconds_since_midnight = now.hour * 3600 + now.minute * 60 + now.second
@@ -48,109 +91,77 @@ def get_simulated_vehicle_position(
     cycle_progress = (seconds_since_midnight % cycle_seconds) / cycle_seconds
 
     # Offset each vehicle slightly based on trip_id hash so they don't overlap
-    offset = hash(trip_id) % 100 / 100 * 0.25
-    adjusted_progress = (cycle_progress + offset) % 1.0
+    offsets = np.fromiter((hash(trip_id) % 100 for trip_id in trip_ids), dtype=float, count=count)
+    progress = (cycle_progress + offsets / 100 * 0.25) % 1.0
 
-    if not shape_points:
-        return (45.5088, -73.5540, 0.0, 0.0)  # Default Montreal position
+    # Single-point shapes stay on their only point; empty shapes keep the default
+    lengths = np.fromiter((len(shape) for shape in shape_arrays), dtype=np.intp, count=count)
+    for i in np.flatnonzero(lengths == 1):
+        positions[i, :2] = shape_arrays[i][0]
 
-    # Calculate which segment we're on
-    num_segments = len(shape_points) - 1
-    if num_segments <= 0:
-        return (shape_points[0][0], shape_points[0][1], 0.0, 0.0)
+    moving = lengths > 1
+    if not moving.any():
+        return positions
 
-    segment_index = int(adjusted_progress * num_segments)
-    segment_progress = (adjusted_progress * num_segments) % 1.0
+    # Stack the shapes so both segment endpoints can be gathered at once
+    stacked = np.concatenate([shape_arrays[i] for i in np.flatnonzero(moving)])
+    starts = np.cumsum(lengths[moving]) - lengths[moving]
+    num_segments = lengths[moving] - 1
 
-    # Ensure we don't go out of bounds
-    segment_index = min(segment_index, num_segments - 1)
+    scaled = progress[moving] * num_segments
+    segment_index = np.minimum(scaled.astype(np.intp), num_segments - 1)
+    segment_progress = scaled % 1.0
 
-    # Get the two points for interpolation
-    point1 = shape_points[segment_index]
-    point2 = shape_points[segment_index + 1] if segment_index + 1 < len(shape_points) else shape_points[-1]
+    point1 = stacked[starts + segment_index]
+    point2 = stacked[starts + segment_index + 1]
 
     # Interpolate position
-    lat, lon = interpolate_position(
-        point1[0], point1[1],
-        point2[0], point2[1],
-        segment_progress
-    )
+    positions[moving, :2] = point1 + (point2 - point1) * segment_progress[:, np.newaxis]
 
     # Calculate bearing
-    lat1_rad = math.radians(point1[0])
-    lat2_rad = math.radians(point2[0])
-    lon_diff = math.radians(point2[1] - point1[1])
-
-    x = math.sin(lon_diff) * math.cos(lat2_rad)
-    y = math.cos(lat1_rad) * math.sin(lat2_rad) - math.sin(lat1_rad) * math.cos(lat2_rad) * math.cos(lon_diff)
-    bearing = math.degrees(math.atan2(x, y))
-    bearing = (bearing + 360) % 360
+    lat1_rad, lon1_rad = np.radians(point1).T
+    lat2_rad, lon2_rad = np.radians(point2).T
+    lon_diff = lon2_rad - lon1_rad
 
-    # Speed in m/s (estimate based on route type)
-    speed = 15.0 if route_type == 3 else 25.0  # Bus vs Rail
+    x = np.sin(lon_diff) * np.cos(lat2_rad)
+    y = np.cos(lat1_rad) * np.sin(lat2_rad) - np.sin(lat1_rad) * np.cos(lat2_rad) * np.cos(lon_diff)
+    positions[moving, 2] = (np.degrees(np.arctan2(x, y)) + 360) % 360
 
-    return (lat, lon, bearing, speed)
+    return positions
 
 
 def build_gtfs_rt_vehicle_positions(
     vehicles: list[dict],
     agency_id: str
-) -> bytes:
-    """
-    Build a GTFS-RT VehiclePositions feed as Protocol Buffers.
-
-    For simplicity, we return JSON-like structure since we don't have
-    the protobuf library installed. In production, you'd use gtfs-realtime-bindings.
-    """
-    # Build a simple text representation that can be parsed
-    # In production, use: from google.transit import gtfs_realtime_pb2
-
-    timestamp = int(time.time())
-
-    # Build feed header and entities as JSON for now
-    # The frontend can parse this format
-    feed = {
-        "header": {
-            "gtfs_realtime_version": "2.0",
-            "incrementality": "FULL_DATASET",
-            "timestamp": timestamp
-        },
-        "entity": []
-    }
+) -> gtfs_realtime_pb2.FeedMessage:
+    """Build a GTFS-RT VehiclePositions feed as Protocol Buffers."""
+    feed = new_feed_message()
+    timestamp = feed.header.timestamp
 
     for i, vehicle in enumerate(vehicles):
-        entity = {
-            "id": f"vehicle_{i+1}",
-            "vehicle": {
-                "trip": {
-                    "trip_id": vehicle["trip_id"],
-                    "route_id": vehicle["route_id"],
-                    "schedule_relationship": "SCHEDULED"
-                },
-                "vehicle": {
-                    "id": vehicle["vehicle_id"],
-                    "label": vehicle["vehicle_label"]
-                },
-                "position": {
-                    "latitude": vehicle["latitude"],
-                    "longitude": vehicle["longitude"],
-                    "bearing": vehicle["bearing"],
-                    "speed": vehicle["speed"]
-                },
-                "current_status": "IN_TRANSIT_TO",
-                "timestamp": timestamp,
-                "congestion_level": "RUNNING_SMOOTHLY"
-            }
-        }
-        feed["entity"].append(entity)
-
-    import json
-    return json.dumps(feed).encode('utf-8')
+        entity = feed.entity.add()
+        entity.id = f"vehicle_{i+1}"
+        position = entity.vehicle
+        position.trip.trip_id = vehicle["trip_id"]
+        position.trip.route_id = vehicle["route_id"]
+        position.trip.schedule_relationship = gtfs_realtime_pb2.TripDescriptor.SCHEDULED
+        position.vehicle.id = vehicle["vehicle_id"]
+        position.vehicle.label = vehicle["vehicle_label"]
+        position.position.latitude = vehicle["latitude"]
+        position.position.longitude = vehicle["longitude"]
+        position.position.bearing = vehicle["bearing"]
+        position.position.speed = vehicle["speed"]
+        position.current_status = gtfs_realtime_pb2.VehiclePosition.IN_TRANSIT_TO
+        position.timestamp = timestamp
+        position.congestion_level = gtfs_realtime_pb2.VehiclePosition.RUNNING_SMOOTHLY
+
+    return feed
 
 
 @router.get("/agency/{agency_id}/vehicle-positions")
 async def get_demo_vehicle_positions(
     agency_id: int,
+    response_format: Optional[Literal["json"]] = Query(None, alias="format"),
     db: AsyncSession = Depends(get_db),
 ) -> Response:
     """
@@ -166,9 +177,9 @@ async def get_demo_vehicle_positions(
     feed = feed_result.scalar_one_or_none()
 
     if not feed:
-        return Response(
-            content=build_gtfs_rt_vehicle_positions([], str(agency_id)),
-            media_type="application/json"
+        return feed_message_response(
+            build_gtfs_rt_vehicle_positions([], str(agency_id)),
+            response_format
         )
 
     # Get all trips with their routes
@@ -180,31 +191,38 @@ async def get_demo_vehicle_positions(
     )
     trips_with_routes = trips_result.all()
 
-    vehicles = []
-
-    for i, (trip, route) in enumerate(trips_with_routes):
-        # Get shape points for this trip
-        shape_points = []
-        if trip.shape_id:
-            # Get all points for this shape_id
-            shape_result = await db.execute(
-                select(Shape)
-                .where(
-                    Shape.feed_id == feed.id,
-                    Shape.shape_id == trip.shape_id
-                )
-                .order_by(Shape.shape_pt_sequence)
+    # Load the points of every shape used by these trips in one query
+    shape_ids = {trip.shape_id for trip, _ in trips_with_routes if trip.shape_id}
+    shape_points = defaultdict(list)
+    if shape_ids:
+        shape_result = await db.execute(
+            select(Shape.shape_id, Shape.shape_pt_lat, Shape.shape_pt_lon)
+            .where(
+                Shape.feed_id == feed.id,
+                Shape.shape_id.in_(shape_ids)
             )
-            shapes = shape_result.scalars().all()
-            shape_points = [(float(s.shape_pt_lat), float(s.shape_pt_lon)) for s in shapes]
-
-        # Calculate vehicle position
-        lat, lon, bearing, speed = get_simulated_vehicle_position(
-            trip.trip_id,
-            route.route_type,
-            shape_points,
-            cycle_seconds=60  # Complete route every 60 seconds for visible movement
+            .order_by(Shape.shape_id, Shape.shape_pt_sequence)
         )
+        for shape_id, lat, lon in shape_result:
+            shape_points[shape_id].append((lat, lon))
+    shape_arrays = {
+        shape_id: np.array(points, dtype=float)
+        for shape_id, points in shape_points.items()
+    }
+
+    # Calculate all vehicle positions at once
+    # (complete route every 60 seconds for visible movement)
+    positions = batch_vehicle_positions(
+        [trip.trip_id for trip, _ in trips_with_routes],
+        [shape_arrays.get(trip.shape_id, _EMPTY_SHAPE) for trip, _ in trips_with_routes],
+        cycle_seconds=60
+    ).tolist()
+
+    vehicles = []
+
+    for i, ((trip, route), (lat, lon, bearing)) in enumerate(zip(trips_with_routes, positions)):
+        # Speed in m/s (estimate based on route type)
+        speed = 15.0 if route.route_type == 3 else 25.0  # Bus vs Rail
 
         # Determine vehicle label based on route type
         if route.route_type == 1:  # Metro
@@ -225,15 +243,9 @@ async def get_demo_vehicle_positions(
             "speed": speed
         })
 
-    content = build_gtfs_rt_vehicle_positions(vehicles, str(agency_id))
-
-    return Response(
-        content=content,
-        media_type="application/json",
-        headers={
-            "Cache-Control": "no-cache, no-store, must-revalidate",
-            "X-GTFS-RT-Demo": "true"
-        }
+    return feed_message_response(
+        build_gtfs_rt_vehicle_positions(vehicles, str(agency_id)),
+        response_format
     )
 
 
@@ -282,41 +294,43 @@ async def get_demo_vehicle_status(
 def build_gtfs_rt_trip_updates(
     trip_updates: list[dict],
     agency_id: str
-) -> bytes:
-    """Build a GTFS-RT TripUpdates feed as JSON."""
-    import json
-    timestamp = int(time.time())
-
-    feed = {
-        "header": {
-            "gtfs_realtime_version": "2.0",
-            "incrementality": "FULL_DATASET",
-            "timestamp": timestamp
-        },
-        "entity": []
-    }
+) -> gtfs_realtime_pb2.FeedMessage:
+    """Build a GTFS-RT TripUpdates feed as Protocol Buffers."""
+    feed = new_feed_message()
+    timestamp = feed.header.timestamp
 
     for i, update in enumerate(trip_updates):
-        entity = {
-            "id": f"trip_update_{i+1}",
-            "trip_update": {
-                "trip": {
-                    "trip_id": update["trip_id"],
-                    "route_id": update["route_id"],
-                    "schedule_relationship": update.get("schedule_relationship", "SCHEDULED")
-                },
-                "vehicle": {
-                    "id": update.get("vehicle_id", f"vehicle_{i+1}"),
-                    "label": update.get("vehicle_label", f"Vehicle {i+1}")
-                },
-                "stop_time_update": update.get("stop_time_updates", []),
-                "timestamp": timestamp,
-                "delay": update.get("delay", 0)
-            }
-        }
-        feed["entity"].append(entity)
+        entity = feed.entity.add()
+        entity.id = f"trip_update_{i+1}"
+        trip_update = entity.trip_update
+        trip_update.trip.trip_id = update["trip_id"]
+        trip_update.trip.route_id = update["route_id"]
+        trip_update.trip.schedule_relationship = (
+            gtfs_realtime_pb2.TripDescriptor.ScheduleRelationship.Value(
+                update.get("schedule_relationship", "SCHEDULED")
+            )
+        )
+        trip_update.vehicle.id = update.get("vehicle_id", f"vehicle_{i+1}")
+        trip_update.vehicle.label = update.get("vehicle_label", f"Vehicle {i+1}")
+
+        for stu in update.get("stop_time_updates", []):
+            stop_time_update = trip_update.stop_time_update.add()
+            stop_time_update.stop_sequence = stu["stop_sequence"]
+            stop_time_update.stop_id = stu["stop_id"]
+            stop_time_update.arrival.delay = stu["arrival"]["delay"]
+            stop_time_update.arrival.time = stu["arrival"]["time"]
+            stop_time_update.departure.delay = stu["departure"]["delay"]
+            stop_time_update.departure.time = stu["departure"]["time"]
+            stop_time_update.schedule_relationship = (
+                gtfs_realtime_pb2.TripUpdate.StopTimeUpdate.ScheduleRelationship.Value(
+                    stu.get("schedule_relationship", "SCHEDULED")
+                )
+            )
 
-    return json.dumps(feed).encode('utf-8')
+        trip_update.timestamp = timestamp
+        trip_update.delay = update.get("delay", 0)
+
+    return feed
 
 
 def get_simulated_delay(trip_id: str, route_type: int) -> int:
@@ -352,6 +366,7 @@ def get_simulated_delay(trip_id: str, route_type: int) -> int:
 @router.get("/agency/{agency_id}/trip-updates")
 async def get_demo_trip_updates(
     agency_id: int,
+    response_format: Optional[Literal["json"]] = Query(None, alias="format"),
     db: AsyncSession = Depends(get_db),
 ) -> Response:
     """
@@ -367,9 +382,9 @@ async def get_demo_trip_updates(
     feed = feed_result.scalar_one_or_none()
 
     if not feed:
-        return Response(
-            content=build_gtfs_rt_trip_updates([], str(agency_id)),
-            media_type="application/json"
+        return feed_message_response(
+            build_gtfs_rt_trip_updates([], str(agency_id)),
+            response_format
         )
 
     # Get all trips with their routes and stop times
@@ -428,15 +443,9 @@ async def get_demo_trip_updates(
             "stop_time_updates": stop_time_updates
         })
 
-    content = build_gtfs_rt_trip_updates(trip_updates, str(agency_id))
-
-    return Response(
-        content=content,
-        media_type="application/json",
-        headers={
-            "Cache-Control": "no-cache, no-store, must-revalidate",
-            "X-GTFS-RT-Demo": "true"
-        }
+    return feed_message_response(
+        build_gtfs_rt_trip_updates(trip_updates, str(agency_id)),
+        response_format
     )
 
 
@@ -447,44 +456,42 @@ async def get_demo_trip_updates(
 def build_gtfs_rt_alerts(
     alerts: list[dict],
     agency_id: str
-) -> bytes:
-    """Build a GTFS-RT Alerts feed as JSON."""
-    import json
-    timestamp = int(time.time())
-
-    feed = {
-        "header": {
-            "gtfs_realtime_version": "2.0",
-            "incrementality": "FULL_DATASET",
-            "timestamp": timestamp
-        },
-        "entity": []
-    }
-
-    for i, alert in enumerate(alerts):
-        entity = {
-            "id": alert.get("alert_id", f"alert_{i+1}"),
-            "alert": {
-                "active_period": alert.get("active_period", []),
-                "informed_entity": alert.get("informed_entity", []),
-                "cause": alert.get("cause", "OTHER_CAUSE"),
-                "effect": alert.get("effect", "OTHER_EFFECT"),
-                "header_text": {
-                    "translation": [
-                        {"text": alert.get("header_text", "Service Alert"), "language": "en"}
-                    ]
-                },
-                "description_text": {
-                    "translation": [
-                        {"text": alert.get("description_text", ""), "language": "en"}
-                    ]
-                },
-                "severity_level": alert.get("severity_level", "INFO")
-            }
-        }
-        feed["entity"].append(entity)
+) -> gtfs_realtime_pb2.FeedMessage:
+    """Build a GTFS-RT Alerts feed as Protocol Buffers."""
+    feed = new_feed_message()
+
+    for i, alert_data in enumerate(alerts):
+        entity = feed.entity.add()
+        entity.id = alert_data.get("alert_id", f"alert_{i+1}")
+        alert = entity.alert
+
+        for period in alert_data.get("active_period", []):
+            active_period = alert.active_period.add()
+            if "start" in period:
+                active_period.start = period["start"]
+            if "end" in period:
+                active_period.end = period["end"]
+
+        for informed in alert_data.get("informed_entity", []):
+            selector = alert.informed_entity.add()
+            for field, value in informed.items():
+                setattr(selector, field, value)
+
+        alert.cause = gtfs_realtime_pb2.Alert.Cause.Value(alert_data.get("cause", "OTHER_CAUSE"))
+        alert.effect = gtfs_realtime_pb2.Alert.Effect.Value(
+            alert_data.get("effect", "OTHER_EFFECT")
+        )
+        alert.header_text.translation.add(
+            text=alert_data.get("header_text", "Service Alert"), language="en"
+        )
+        alert.description_text.translation.add(
+            text=alert_data.get("description_text", ""), language="en"
+        )
+        alert.severity_level = gtfs_realtime_pb2.Alert.SeverityLevel.Value(
+            alert_data.get("severity_level", "INFO")
+        )
 
-    return json.dumps(feed).encode('utf-8')
+    return feed
 
 
 # Demo alerts that rotate based on time - Montreal themed
@@ -540,6 +547,7 @@ DEMO_ALERTS = [
 @router.get("/agency/{agency_id}/alerts")
 async def get_demo_alerts(
     agency_id: int,
+    response_format: Optional[Literal["json"]] = Query(None, alias="format"),
     db: AsyncSession = Depends(get_db),
 ) -> Response:
     """
@@ -555,9 +563,9 @@ async def get_demo_alerts(
     feed = feed_result.scalar_one_or_none()
 
     if not feed:
-        return Response(
-            content=build_gtfs_rt_alerts([], str(agency_id)),
-            media_type="application/json"
+        return feed_message_response(
+            build_gtfs_rt_alerts([], str(agency_id)),
+            response_format
         )
 
     # Get routes for entity references
@@ -614,15 +622,9 @@ async def get_demo_alerts(
             }]
         })
 
-    content = build_gtfs_rt_alerts(alerts, str(agency_id))
-
-    return Response(
-        content=content,
-        media_type="application/json",
-        headers={
-            "Cache-Control": "no-cache, no-store, must-revalidate",
-            "X-GTFS-RT-Demo": "true"
-        }
+    return feed_message_response(
+        build_gtfs_rt_alerts(alerts, str(agency_id)),
+        response_format
     )
 
 
@@ -635,7 +637,6 @@ def build_gtfs_rt_trip_modifications(
     agency_id: str
 ) -> bytes:
     """Build a GTFS-RT TripModifications feed as JSON."""
-    import json
     timestamp = int(time.time())
 
     feed = {
@@ -659,7 +660,7 @@ def build_gtfs_rt_trip_modifications(
         }
         feed["entity"].append(entity)
 
-    return json.dumps(feed).encode('utf-8')
+    return orjson.dumps(feed)
 
 
 @router.get("/agency/{agency_id}/trip-modifications")
@@ -762,7 +763,6 @@ def build_gtfs_rt_shapes(
     agency_id: str
 ) -> bytes:
     """Build a GTFS-RT Shapes feed as JSON."""
-    import json
     timestamp = int(time.time())
 
     feed = {
@@ -785,7 +785,7 @@ def build_gtfs_rt_shapes(
         }
         feed["entity"].append(entity)
 
-    return json.dumps(feed).encode('utf-8')
+    return orjson.dumps(feed)
 
 
 @router.get("/agency/{agency_id}/shapes")
@@ -862,7 +862,6 @@ def build_gtfs_rt_stops(
     agency_id: str
 ) -> bytes:
     """Build a GTFS-RT Stops feed as JSON."""
-    import json
     timestamp = int(time.time())
 
     feed = {
@@ -888,7 +887,7 @@ def build_gtfs_rt_stops(
         }
         feed["entity"].append(entity)
 
-    return json.dumps(feed).encode('utf-8')
+    return orjson.dumps(feed)
 
 
 @router.get("/agency/{agency_id}/stops")
@@ -713,7 +713,7 @@ async def get_validation_report(
 
     Returns the validation report in the specified format.
     """
-    from fastapi.responses import FileResponse, JSONResponse
+    from fastapi.responses import FileResponse
     from app.services.mobilitydata_validator import mobilitydata_validator
 
     # Verify access
@@ -729,9 +729,9 @@ async def get_validation_report(
         )
 
     if report_type == "json":
-        import json
-        with open(report_path, 'r', encoding='utf-8') as f:
-            return JSONResponse(content=json.load(f))
+        # The report is already JSON on disk; stream it instead of parsing
+        # and re-serializing it
+        return FileResponse(path=str(report_path), media_type="application/json")
     else:
         return FileResponse(
             path=str(report_path),
@@ -12,6 +12,7 @@ from app.api.deps import get_db
 from app.models.user import User, UserRole
 from app.models.agency import Agency
 from app.models.audit import AuditAction
+from app.services.agency_role_cache import invalidate_agency_roles
 from app.services.gtfs_service import gtfs_service
 from app.services.gtfs_validator import GTFSValidator
 from app.schemas.gtfs_import import (
@@ -317,6 +318,7 @@ async def import_gtfs_from_upload(
             )
         )
         await db.commit()
+        await invalidate_agency_roles(current_user.id)
 
     # Verify agency exists
     agency_result = await db.execute(select(Agency).where(Agency.id == agency_id))
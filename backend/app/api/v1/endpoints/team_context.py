@@ -168,7 +168,7 @@ async def sso_login(
     3. Create or sync user in team's database
     4. Return team-valid JWT tokens
     """
-    from app.core.security import create_access_token, create_refresh_token
+    from app.core.security import create_token_pair
 
     try:
         # Step 1: Exchange cross-domain token with portal
@@ -245,8 +245,7 @@ async def sso_login(
             await db.commit()
 
         # Step 4: Generate team JWT tokens
-        access_token = create_access_token(subject=user.id)
-        refresh_token = create_refresh_token(subject=user.id)
+        access_token, refresh_token = create_token_pair(user.id)
 
         logger.info(f"SSO login successful for user {email} in team {team.slug}")
 
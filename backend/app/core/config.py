@@ -1,7 +1,8 @@
 """Application configuration"""
 
 import os
-from typing import List, Union, Optional
+from functools import cached_property
+from typing import FrozenSet, List, Union, Optional
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 
@@ -54,7 +55,16 @@ class Settings(BaseSettings):
     )
     DATABASE_POOL_SIZE: int = Field(default=20, description="Database connection pool size")
     DATABASE_MAX_OVERFLOW: int = Field(
-        default=10, description="Maximum overflow connections"
+        default=40, description="Maximum overflow connections"
+    )
+    DATABASE_POOL_TIMEOUT: int = Field(
+        default=30, description="Seconds to wait for a pooled connection"
+    )
+    DATABASE_POOL_RECYCLE: int = Field(
+        default=1800, description="Seconds before a pooled connection is replaced"
+    )
+    DATABASE_STATEMENT_CACHE_SIZE: int = Field(
+        default=1024, description="Prepared statements cached per connection"
     )
 
     # Redis
@@ -201,10 +211,12 @@ class Settings(BaseSettings):
         """Get Entra ID scopes as a list."""
         return [scope.strip() for scope in self.ENTRA_SCOPES.split(",") if scope.strip()]
 
-    @property
-    def entra_allowed_redirect_uris(self) -> List[str]:
-        """Get allowed Entra ID redirect URIs as a list."""
-        return [uri.strip() for uri in self.ENTRA_ALLOWED_REDIRECT_URIS.split(",") if uri.strip()]
+    @cached_property
+    def entra_allowed_redirect_uris(self) -> FrozenSet[str]:
+        """Get allowed Entra ID redirect URIs as a set (parsed once)."""
+        return frozenset(
+            uri.strip() for uri in self.ENTRA_ALLOWED_REDIRECT_URIS.split(",") if uri.strip()
+        )
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,25 @@
+"""Shared outbound HTTP clients"""
+
+import httpx
+
+from app.core.config import settings
+
+# Pooled client for portal SSO calls, so each /sso request reuses a warm
+# TCP/TLS connection instead of handshaking again. Closed on app shutdown.
+portal_client = httpx.AsyncClient(
+    base_url=settings.PORTAL_API_URL.rstrip("/"),
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=128),
+    timeout=5.0,
+)
+
+# Pooled client for Microsoft identity / Graph calls made during logins
+microsoft_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    timeout=10.0,
+)
+
+
+async def close_http_clients() -> None:
+    """Close the shared HTTP clients and their connection pools"""
+    await portal_client.aclose()
+    await microsoft_client.aclose()
@@ -1,7 +1,17 @@
 """Security utilities for JWT tokens and password hashing"""
 
+import asyncio
+import base64
+import calendar
+import hashlib
+import hmac
+import os
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Any, Optional
+import orjson
+from fastapi import Response
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
@@ -20,6 +30,51 @@ pwd_context = CryptContext(
 ALGORITHM = settings.ALGORITHM
 SECRET_KEY = settings.SECRET_KEY
 
+# Cookies carrying tokens for browser logins that end in a redirect
+ACCESS_TOKEN_COOKIE = "access_token"
+REFRESH_TOKEN_COOKIE = "refresh_token"
+REFRESH_TOKEN_COOKIE_PATH = "/api/v1/auth"
+
+# HMAC algorithms are signed inline with a header encoded once at import;
+# anything else goes through python-jose
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+# Caps concurrent bcrypt verifications offloaded to worker threads so a burst
+# of logins cannot exhaust the default executor
+_password_hash_semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+
+# Verified-token cache: blake2b(token) -> (cache expiry, decoded payload).
+# Entries never outlive the token's own exp claim.
+_VERIFIED_TOKEN_CACHE_MAXSIZE = 10_000
+_VERIFIED_TOKEN_CACHE_MAX_TTL = 300
+_verified_tokens: "OrderedDict[tuple[str, bytes], tuple[float, dict[str, Any]]]" = OrderedDict()
+
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as used in JWTs"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+_ENCODED_HEADER = _b64url(orjson.dumps({"alg": ALGORITHM, "typ": "JWT"}))
+_SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")
+
+
+def _encode_token(subject: str | int, expire: datetime, token_type: str) -> str:
+    """Encode and sign a token with exp, sub and type claims"""
+    claims = {
+        "exp": calendar.timegm(expire.utctimetuple()),
+        "sub": str(subject),
+        "type": token_type,
+    }
+
+    digest = _HMAC_DIGESTS.get(ALGORITHM)
+    if digest is None:
+        return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+    signing_input = _ENCODED_HEADER + b"." + _b64url(orjson.dumps(claims))
+    signature = hmac.new(_SECRET_KEY_BYTES, signing_input, digest).digest()
+    return (signing_input + b"." + _b64url(signature)).decode("ascii")
+
 
 def create_access_token(subject: str | int, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -39,9 +94,7 @@ def create_access_token(subject: str | int, expires_delta: Optional[timedelta] =
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
-    to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return _encode_token(subject, expire, "access")
 
 
 def create_refresh_token(subject: str | int) -> str:
@@ -55,9 +108,119 @@ def create_refresh_token(subject: str | int) -> str:
         Encoded JWT refresh token
     """
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return _encode_token(subject, expire, "refresh")
+
+
+def create_token_pair(subject: str | int) -> tuple[str, str]:
+    """
+    Create an access token and a refresh token for the same subject
+
+    Both are signed back to back with the already-loaded key; HMAC signing
+    is pure CPU work and far too cheap to be worth a thread hop.
+
+    Args:
+        subject: The subject of the tokens (usually user ID)
+
+    Returns:
+        Tuple of (access token, refresh token)
+    """
+    now = datetime.utcnow()
+    access_token = _encode_token(
+        subject, now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES), "access"
+    )
+    refresh_token = _encode_token(
+        subject, now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS), "refresh"
+    )
+    return access_token, refresh_token
+
+
+def set_auth_cookies(response: Response, access_token: str, refresh_token: str) -> None:
+    """
+    Attach access and refresh tokens to a response as HttpOnly cookies
+
+    The refresh cookie is only sent back to the auth endpoints.
+
+    Args:
+        response: Response to set the cookies on
+        access_token: Encoded JWT access token
+        refresh_token: Encoded JWT refresh token
+    """
+    response.set_cookie(
+        ACCESS_TOKEN_COOKIE,
+        access_token,
+        max_age=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        httponly=True,
+        secure=True,
+        samesite="lax",
+    )
+    response.set_cookie(
+        REFRESH_TOKEN_COOKIE,
+        refresh_token,
+        max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400,
+        path=REFRESH_TOKEN_COOKIE_PATH,
+        httponly=True,
+        secure=True,
+        samesite="strict",
+    )
+
+
+def clear_auth_cookies(response: Response) -> None:
+    """Remove the cookies set by set_auth_cookies."""
+    response.delete_cookie(ACCESS_TOKEN_COOKIE, httponly=True, secure=True, samesite="lax")
+    response.delete_cookie(
+        REFRESH_TOKEN_COOKIE,
+        path=REFRESH_TOKEN_COOKIE_PATH,
+        httponly=True,
+        secure=True,
+        samesite="strict",
+    )
+
+
+def decode_token_cached(
+    token: str, key: str, algorithms: list[str], namespace: str = "app"
+) -> dict[str, Any]:
+    """
+    Decode and verify a JWT, reusing the payload of a previous verification
+
+    Tokens are cached by a blake2b digest until min(exp, now + 5 minutes),
+    and exp is re-checked on every hit. Tokens without an exp claim are
+    never cached.
+
+    Args:
+        token: The JWT token to verify
+        key: Secret or key used to verify the signature
+        algorithms: Allowed signing algorithms
+        namespace: Separates caches for tokens signed with different keys
+
+    Returns:
+        Decoded token payload
+
+    Raises:
+        JWTError: If the token is invalid or expired
+    """
+    cache_key = (namespace, hashlib.blake2b(token.encode(), digest_size=16).digest())
+    now = time.time()
+
+    cached = _verified_tokens.get(cache_key)
+    if cached is not None:
+        expires_at, payload = cached
+        if expires_at > now and payload["exp"] > now:
+            _verified_tokens.move_to_end(cache_key)
+            return dict(payload)
+        _verified_tokens.pop(cache_key, None)
+
+    payload = jwt.decode(token, key, algorithms=algorithms)
+
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)) and exp > now:
+        _verified_tokens[cache_key] = (
+            now + min(exp - now, _VERIFIED_TOKEN_CACHE_MAX_TTL),
+            payload,
+        )
+        if len(_verified_tokens) > _VERIFIED_TOKEN_CACHE_MAXSIZE:
+            _verified_tokens.popitem(last=False)
+
+    return dict(payload)
 
 
 def verify_token(token: str) -> Optional[dict[str, Any]]:
@@ -71,8 +234,7 @@ def verify_token(token: str) -> Optional[dict[str, Any]]:
         Decoded token payload or None if invalid
     """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        return decode_token_cached(token, SECRET_KEY, [ALGORITHM])
     except JWTError:
         return None
 
@@ -91,6 +253,21 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash without blocking the event loop
+
+    Args:
+        plain_password: The plain text password
+        hashed_password: The hashed password to compare against
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    async with _password_hash_semaphore:
+        return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """
     Hash a password
@@ -19,6 +19,8 @@ async def init_db() -> None:
         print("Enabling PostGIS extension...")
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis;"))
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis_topology;"))
+        # Trigram matching for substring search indexes
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm;"))
 
         print("PostGIS extension enabled successfully!")
 
@@ -0,0 +1,24 @@
+"""Redis client management"""
+
+from redis.asyncio import Redis
+from app.core.config import settings
+
+# Shared async client for web requests (connections are pooled and opened lazily).
+# Short timeouts keep request latency bounded if Redis is unreachable; callers
+# treat Redis as a cache and fall back to the database.
+redis_client = Redis.from_url(
+    settings.REDIS_URL,
+    socket_connect_timeout=1,
+    socket_timeout=1,
+)
+
+
+def create_celery_redis() -> Redis:
+    """
+    Create a Redis client for a Celery task
+
+    Celery tasks run each job in a fresh asyncio.run() event loop, so they
+    must not reuse pooled connections from the web client. Close the client
+    (``async with`` or ``aclose()``) before the loop ends.
+    """
+    return Redis.from_url(settings.REDIS_URL)
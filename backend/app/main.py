@@ -1,10 +1,25 @@
 """FastAPI application entry point"""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.core.http_client import close_http_clients
+from app.utils.audit_batcher import audit_batcher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    audit_batcher.start()
+    yield
+    await audit_batcher.stop()
+    await close_http_clients()
+
 
 app = FastAPI(
     title="GTFS Editor API",
@@ -13,6 +28,8 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS configuration from settings
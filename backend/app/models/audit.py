@@ -1,7 +1,7 @@
 """Audit logging models"""
 
 from typing import Any
-from sqlalchemy import String, Integer, ForeignKey, Text, JSON, Enum as SQLEnum
+from sqlalchemy import String, Integer, ForeignKey, Text, JSON, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
@@ -26,6 +26,10 @@ class AuditLog(Base, TimestampMixin):
     """Audit log for tracking all changes"""
 
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Serves per-agency listings ordered by created_at DESC (scanned backwards)
+        Index("ix_audit_logs_agency_id_created_at", "agency_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
 
@@ -14,6 +14,7 @@ from sqlalchemy import (
     Time,
     Numeric,
     CheckConstraint,
+    Index,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -227,6 +228,8 @@ class Trip(Base, TimestampMixin):
             ['gtfs_calendar.feed_id', 'gtfs_calendar.service_id'],
             ondelete="CASCADE"
         ),
+        # Trip counts per service and the calendar FK are keyed on (feed_id, service_id)
+        Index("ix_gtfs_trips_feed_id_service_id", "feed_id", "service_id"),
         {"comment": "GTFS trips - uses composite PK (feed_id, trip_id) and composite FKs"}
     )
 
@@ -379,7 +382,15 @@ class Calendar(Base, TimestampMixin):
 
     __tablename__ = "gtfs_calendar"
     __table_args__ = (
-        {"comment": "GTFS calendar - uses composite PK (feed_id, service_id)"}
+        # Trigram index so substring (ILIKE '%...%') searches on service_id
+        # can use an index instead of scanning the table
+        Index(
+            "ix_gtfs_calendar_service_id_trgm",
+            "service_id",
+            postgresql_using="gin",
+            postgresql_ops={"service_id": "gin_trgm_ops"},
+        ),
+        {"comment": "GTFS calendar - uses composite PK (feed_id, service_id)"},
     )
 
     # Composite primary key: (feed_id, service_id)
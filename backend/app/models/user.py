@@ -1,7 +1,17 @@
 """User and authentication models"""
 
 from typing import List
-from sqlalchemy import String, Boolean, Integer, Table, Column, ForeignKey, Enum as SQLEnum
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Enum as SQLEnum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
@@ -32,6 +42,10 @@ user_agencies = Table(
         default=UserRole.VIEWER,
         comment="User role for this agency",
     ),
+    # Covers membership + role checks with an index-only scan
+    Index("ix_user_agencies_user_agency_role", "user_id", "agency_id", "role"),
+    # Finds an agency's members (the primary key leads with user_id)
+    Index("ix_user_agencies_agency_id_user_id", "agency_id", "user_id"),
 )
 
 
@@ -39,6 +53,17 @@ class User(Base, TimestampMixin):
     """User model"""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Supports keyset pagination of agency members ordered by (full_name, id)
+        Index("ix_users_full_name_id", "full_name", "id"),
+        # Only linked (SSO) users carry an object ID; NULLs are left out
+        Index(
+            "ix_users_azure_ad_object_id",
+            "azure_ad_object_id",
+            unique=True,
+            postgresql_where=text("azure_ad_object_id IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
@@ -48,9 +73,7 @@ class User(Base, TimestampMixin):
     is_superuser: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     # Microsoft Entra ID fields
-    azure_ad_object_id: Mapped[str | None] = mapped_column(
-        String(255), unique=True, index=True, nullable=True
-    )
+    azure_ad_object_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     azure_ad_tenant_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
     # Relationships
@@ -190,14 +190,26 @@ class AgencyMember(AgencyMemberBase):
         from_attributes = True
 
 
+class AgencyMemberCursor(BaseModel):
+    """Keyset cursor for paginating agency members by (full_name, user_id)"""
+
+    after_name: str = Field(..., description="full_name of the last member returned")
+    after_user_id: int = Field(..., description="user_id of the last member returned")
+
+
 class AgencyMemberList(BaseModel):
     """List of agency members"""
 
     items: List[AgencyMember] = Field(..., description="List of agency members")
-    total: int = Field(..., description="Total number of members")
-    page: int = Field(..., description="Current page number")
+    total: Optional[int] = Field(
+        ..., description="Total number of members (null for cursor pages)"
+    )
+    page: Optional[int] = Field(..., description="Current page number (null for cursor pages)")
     page_size: int = Field(..., description="Number of items per page")
-    pages: int = Field(..., description="Total number of pages")
+    pages: Optional[int] = Field(..., description="Total number of pages (null for cursor pages)")
+    next_cursor: Optional[AgencyMemberCursor] = Field(
+        None, description="Cursor for the next page, or null when this is the last page"
+    )
 
 
 # List and pagination schemas
@@ -0,0 +1,91 @@
+"""Redis cache of each user's direct agency roles"""
+
+import logging
+import time
+from typing import Optional
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.db.redis import redis_client
+from app.models.user import UserRole
+
+logger = logging.getLogger(__name__)
+
+# Memberships change rarely; the TTL bounds staleness if an invalidation is missed
+AGENCY_ROLES_TTL_SECONDS = 60
+
+# After a Redis error, reads and writes skip the cache for this long so an
+# outage costs one socket timeout per interval instead of one per request
+REDIS_RETRY_SECONDS = 30
+
+_redis_retry_at = 0.0
+
+
+def _cache_key(user_id: int) -> str:
+    return f"user:{user_id}:agencies"
+
+
+def _redis_backing_off() -> bool:
+    return time.monotonic() < _redis_retry_at
+
+
+def _back_off_redis() -> None:
+    global _redis_retry_at
+    _redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+
+
+async def get_cached_agency_roles(
+    user_id: int, client: Redis = redis_client
+) -> Optional[dict[int, UserRole]]:
+    """
+    Get a user's {agency_id: role} map from the cache.
+
+    Returns:
+        The cached map, or None on a miss or if Redis is unavailable
+    """
+    if _redis_backing_off():
+        return None
+    try:
+        cached = await client.get(_cache_key(user_id))
+    except RedisError as e:
+        logger.warning("Agency role cache read failed for user %s: %s", user_id, e)
+        _back_off_redis()
+        return None
+
+    if cached is None:
+        return None
+    return {int(agency_id): UserRole(role) for agency_id, role in orjson.loads(cached).items()}
+
+
+async def cache_agency_roles(
+    user_id: int, roles: dict[int, UserRole], client: Redis = redis_client
+) -> None:
+    """Store a user's {agency_id: role} map in the cache."""
+    if _redis_backing_off():
+        return
+    payload = orjson.dumps(
+        {str(agency_id): UserRole(role).value for agency_id, role in roles.items()}
+    )
+    try:
+        await client.set(_cache_key(user_id), payload, ex=AGENCY_ROLES_TTL_SECONDS)
+    except RedisError as e:
+        logger.warning("Agency role cache write failed for user %s: %s", user_id, e)
+        _back_off_redis()
+
+
+async def invalidate_agency_roles(*user_ids: int, client: Redis = redis_client) -> None:
+    """
+    Drop cached role maps after their memberships change.
+
+    Call after the membership change is committed so a concurrent request
+    cannot re-cache the old roles. Invalidation is always attempted, even
+    while reads and writes are backing off after a Redis error.
+    """
+    if not user_ids:
+        return
+    try:
+        await client.delete(*(_cache_key(user_id) for user_id in user_ids))
+    except RedisError as e:
+        logger.warning("Agency role cache invalidation failed for users %s: %s", user_ids, e)
@@ -2,6 +2,7 @@
 
 from typing import Dict, Any, Optional
 import httpx
+import jwt
 from msal import ConfidentialClientApplication
 
 from app.core.config import settings
@@ -193,8 +194,6 @@ class AzureADB2CService:
         Returns:
             Dictionary with user claims (sub, email, name, etc.)
         """
-        import jwt
-
         # B2C tokens can be decoded without validation for reading claims
         # In production, you should validate the signature
         decoded = jwt.decode(id_token, options={"verify_signature": False})
@@ -5,8 +5,9 @@ import re
 import uuid
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, exists
 
+from app.db.session import AsyncSessionLocal
 from app.models.agency import Agency
 from app.models.user import User, user_agencies
 from app.models.gtfs import (
@@ -19,6 +20,7 @@ from app.models.gtfs import (
     Shape,
 )
 from app.models.feed_source import ExternalFeedSource, FeedSourceType, FeedSourceStatus, CheckFrequency
+from app.services.agency_role_cache import invalidate_agency_roles
 
 logger = logging.getLogger(__name__)
 
@@ -627,3 +629,33 @@ async def create_demo_agency_for_user(db: AsyncSession, user: User) -> Agency:
     """Helper function to create demo agency for a user"""
     service = DemoAgencyService(db)
     return await service.create_demo_agency_for_user(user)
+
+
+async def create_demo_agency_in_background(user_id: int) -> None:
+    """
+    Create the demo agency for a new user from a background task.
+
+    Runs after the login response has been sent, so it opens its own session
+    and only logs failures.
+    """
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, user_id)
+        if user is None:
+            return
+
+        # Idempotency guard: a retried login must not add a second demo agency
+        has_agency = await db.scalar(
+            select(exists().where(user_agencies.c.user_id == user_id))
+        )
+        if has_agency:
+            return
+
+        try:
+            await create_demo_agency_for_user(db, user)
+        except Exception as e:
+            await db.rollback()
+            logger.warning(f"Failed to create demo agency for user {user_id}: {e}")
+            return
+
+    # The new membership may already be missing from a cached role map
+    await invalidate_agency_roles(user_id)
@@ -6,15 +6,19 @@ using the Microsoft Authentication Library (MSAL).
 
 This is the recommended authentication approach, matching the PortfolioInvestments pattern.
 """
+import asyncio
 import logging
 from typing import Dict, Optional, Tuple
 from datetime import datetime
+from urllib.parse import urlencode
+import httpx
 import msal
 import requests
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import case, or_, select
 
 from app.core.config import settings
+from app.core.http_client import microsoft_client
 from app.db.base import User
 
 logger = logging.getLogger(__name__)
@@ -31,6 +35,17 @@ class EntraAuthService:
         self.authority = settings.entra_authority_url
         self.redirect_uri = settings.ENTRA_REDIRECT_URI
         self.scopes = settings.entra_scopes_list
+        # Shared by every MSAL app so token requests reuse pooled connections
+        self._msal_http_client = requests.Session()
+        # Shared MSAL HTTP response cache: authority / OpenID discovery documents
+        # are fetched once and reused for 24h instead of on every login
+        self._msal_http_cache: Dict = {}
+        # Fixed part of the authorization URL, built on first use from the
+        # authority's OpenID discovery document (so CIAM and other authorities
+        # with non-standard endpoints work). Mirrors what MSAL's
+        # get_authorization_request_url produces, so /login skips building an
+        # MSAL app on every request.
+        self._authorize_url_prefix: Optional[str] = None
 
     def _get_msal_app(self) -> msal.ConfidentialClientApplication:
         """
@@ -52,9 +67,11 @@ class EntraAuthService:
             self.client_id,
             authority=self.authority,
             client_credential=self.client_secret,
+            http_client=self._msal_http_client,
+            http_cache=self._msal_http_cache,
         )
 
-    def get_authorization_url(
+    async def get_authorization_url(
         self,
         state: Optional[str] = None,
         prompt: Optional[str] = None,
@@ -75,31 +92,47 @@ class EntraAuthService:
         Returns:
             Tuple of (authorization_url, state)
         """
-        app = self._get_msal_app()
+        if not settings.is_entra_configured:
+            raise ValueError(
+                "Microsoft Entra ID is not properly configured. "
+                "Please set ENTRA_CLIENT_ID, ENTRA_CLIENT_SECRET, and ENTRA_TENANT_ID."
+            )
 
         # Use provided redirect_uri or fall back to default
         effective_redirect_uri = redirect_uri or self.redirect_uri
 
-        # Build authorization request parameters
-        auth_params = {
-            "scopes": self.scopes,
-            "state": state,
-            "redirect_uri": effective_redirect_uri,
-        }
-
-        # Add prompt parameter if specified
+        # Only the per-request parameters are encoded here
+        auth_params = {"redirect_uri": effective_redirect_uri}
+        if state:
+            auth_params["state"] = state
         if prompt:
             auth_params["prompt"] = prompt
 
-        auth_url = app.get_authorization_request_url(**auth_params)
+        if self._authorize_url_prefix is None:
+            # Building the app runs (cached) authority discovery over the network
+            app = await asyncio.to_thread(self._get_msal_app)
+            scope = " ".join(sorted(set(self.scopes) | {"openid", "profile", "offline_access"}))
+            self._authorize_url_prefix = f"{app.authority.authorization_endpoint}?" + urlencode(
+                {"client_id": self.client_id, "response_type": "code", "scope": scope}
+            )
+
+        auth_url = f"{self._authorize_url_prefix}&{urlencode(auth_params)}"
 
-        logger.info(f"Generated authorization URL for Entra ID login (prompt={prompt}, redirect_uri={effective_redirect_uri})")
+        logger.info(
+            "Generated authorization URL for Entra ID login (prompt=%s, redirect_uri=%s)",
+            prompt, effective_redirect_uri,
+        )
         return auth_url, state or ""
 
-    def exchange_code_for_token(self, code: str, redirect_uri: Optional[str] = None) -> Optional[Dict]:
+    async def exchange_code_for_token(
+        self, code: str, redirect_uri: Optional[str] = None
+    ) -> Optional[Dict]:
         """
         Exchange authorization code for access token.
 
+        MSAL is synchronous, so the exchange runs in a worker thread to keep
+        the event loop free during the round trip to Microsoft.
+
         Args:
             code: Authorization code from the OAuth callback
             redirect_uri: Optional dynamic redirect URI (must match the one used in authorization)
@@ -107,13 +140,15 @@ class EntraAuthService:
         Returns:
             Token response dict or None if failed
         """
-        app = self._get_msal_app()
+        # Building the app may hit the network for authority discovery
+        app = await asyncio.to_thread(self._get_msal_app)
 
         # Use provided redirect_uri or fall back to default
         effective_redirect_uri = redirect_uri or self.redirect_uri
 
         try:
-            result = app.acquire_token_by_authorization_code(
+            result = await asyncio.to_thread(
+                app.acquire_token_by_authorization_code,
                 code,
                 scopes=self.scopes,
                 redirect_uri=effective_redirect_uri,
@@ -126,14 +161,17 @@ class EntraAuthService:
                 )
                 return None
 
-            logger.info(f"Successfully exchanged authorization code for token (redirect_uri={effective_redirect_uri})")
+            logger.info(
+                "Successfully exchanged authorization code for token (redirect_uri=%s)",
+                effective_redirect_uri,
+            )
             return result
 
         except Exception as e:
-            logger.error(f"Exception exchanging code for token: {str(e)}")
+            logger.error("Exception exchanging code for token: %s", e)
             return None
 
-    def get_user_info_from_token(self, access_token: str) -> Optional[Dict]:
+    async def get_user_info_from_token(self, access_token: str) -> Optional[Dict]:
         """
         Fetch user information from Microsoft Graph API.
 
@@ -147,18 +185,21 @@ class EntraAuthService:
 
         try:
             headers = {"Authorization": f"Bearer {access_token}"}
-            response = requests.get(graph_endpoint, headers=headers)
+            response = await microsoft_client.get(graph_endpoint, headers=headers)
             response.raise_for_status()
 
             user_info = response.json()
-            logger.info(f"Retrieved user info from Graph API: {user_info.get('mail') or user_info.get('userPrincipalName')}")
+            logger.info(
+                "Retrieved user info from Graph API: %s",
+                user_info.get("mail") or user_info.get("userPrincipalName"),
+            )
             return user_info
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching user info from Graph API: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("Error fetching user info from Graph API: %s", e)
             return None
 
-    def parse_id_token(self, token_response: Dict) -> Dict:
+    async def parse_id_token(self, token_response: Dict) -> Dict:
         """
         Parse and extract claims from the ID token.
         If email is not in ID token, fetches it from Microsoft Graph API.
@@ -172,8 +213,9 @@ class EntraAuthService:
         id_token_claims = token_response.get("id_token_claims", {})
 
         # Log all available claims for debugging
-        logger.info(f"Available ID token claims: {list(id_token_claims.keys())}")
-        logger.debug(f"Full ID token claims: {id_token_claims}")
+        logger.info("Available ID token claims: %s", list(id_token_claims))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Full ID token claims: %s", id_token_claims)
 
         # Microsoft Entra External ID (CIAM) uses different claim names
         # Try multiple possible claim names for each field
@@ -187,10 +229,10 @@ class EntraAuthService:
         # If email is not in ID token, try to get it from Graph API
         if not email and token_response.get("access_token"):
             logger.warning("Email not found in ID token, attempting to fetch from Graph API")
-            user_info = self.get_user_info_from_token(token_response["access_token"])
+            user_info = await self.get_user_info_from_token(token_response["access_token"])
             if user_info:
                 email = user_info.get("mail") or user_info.get("userPrincipalName")
-                logger.info(f"Successfully fetched email from Graph API: {email}")
+                logger.info("Successfully fetched email from Graph API: %s", email)
             else:
                 logger.error("Failed to fetch email from Graph API")
 
@@ -204,7 +246,7 @@ class EntraAuthService:
             "email_verified": id_token_claims.get("email_verified", False),
         }
 
-        logger.info(f"Parsed claims - entra_id: {entra_id}, email: {email}")
+        logger.info("Parsed claims - entra_id: %s, email: %s", entra_id, email)
         return parsed_claims
 
     async def find_user_by_entra_id(self, db: AsyncSession, entra_id: str) -> Optional[User]:
@@ -239,6 +281,29 @@ class EntraAuthService:
         )
         return result.scalar_one_or_none()
 
+    async def find_user_by_entra_id_or_email(
+        self, db: AsyncSession, entra_id: str, email: str
+    ) -> Optional[User]:
+        """
+        Find a user by Entra ID, or else by email address, in a single query.
+
+        Args:
+            db: Database session
+            entra_id: Microsoft Entra ID (Object ID)
+            email: Email address
+
+        Returns:
+            The user linked to the Entra ID if there is one, otherwise the
+            user with this email, or None
+        """
+        result = await db.execute(
+            select(User)
+            .where(or_(User.azure_ad_object_id == entra_id, User.email == email.lower()))
+            .order_by(case((User.azure_ad_object_id == entra_id, 0), else_=1))
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
     async def link_entra_to_existing_user(
         self,
         db: AsyncSession,
@@ -248,6 +313,8 @@ class EntraAuthService:
         """
         Link Entra ID to an existing user account.
 
+        Changes are flushed; the caller commits.
+
         Args:
             db: Database session
             user: Existing user object
@@ -259,10 +326,9 @@ class EntraAuthService:
         user.azure_ad_object_id = entra_claims["entra_id"]
         user.azure_ad_tenant_id = entra_claims["tenant_id"]
 
-        await db.commit()
-        await db.refresh(user)
+        await db.flush()
 
-        logger.info(f"Linked Entra ID to existing user: {user.email}")
+        logger.info("Linked Entra ID to existing user: %s", user.email)
         return user
 
     async def create_entra_user(
@@ -273,6 +339,8 @@ class EntraAuthService:
         """
         Create a new user from Entra ID authentication.
 
+        The user is flushed (so its ID is assigned); the caller commits.
+
         Args:
             db: Database session
             entra_claims: Claims from Entra ID token
@@ -295,10 +363,9 @@ class EntraAuthService:
         )
 
         db.add(new_user)
-        await db.commit()
-        await db.refresh(new_user)
+        await db.flush()
 
-        logger.info(f"Created new Entra ID user: {new_user.email}")
+        logger.info("Created new Entra ID user: %s", new_user.email)
         return new_user
 
 
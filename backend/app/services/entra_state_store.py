@@ -0,0 +1,82 @@
+"""Redis store for pending Entra ID login states"""
+
+import logging
+import time
+from typing import Any, Optional
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.db.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Pending logins must complete within this window; Redis expires the rest
+AUTH_STATE_TTL_SECONDS = 600
+
+# In-process fallback used only while Redis is unreachable (single instance
+# only): state -> (monotonic expiry, data), swept lazily from save_auth_state
+LOCAL_SWEEP_INTERVAL_SECONDS = 60
+_local_states: dict[str, tuple[float, dict[str, Any]]] = {}
+_last_local_sweep = 0.0
+
+
+def _state_key(state: str) -> str:
+    return f"entra:state:{state}"
+
+
+def _sweep_local_states(now: float) -> None:
+    """Drop expired fallback states, at most once per sweep interval."""
+    global _last_local_sweep
+    if now - _last_local_sweep < LOCAL_SWEEP_INTERVAL_SECONDS:
+        return
+    _last_local_sweep = now
+    for state in [state for state, (expires_at, _) in _local_states.items() if expires_at < now]:
+        del _local_states[state]
+
+
+async def save_auth_state(
+    state: str, data: dict[str, Any], client: Redis = redis_client
+) -> None:
+    """
+    Store the data for a pending login under its state parameter.
+
+    Falls back to process memory if Redis is unavailable.
+    """
+    try:
+        await client.set(_state_key(state), orjson.dumps(data), ex=AUTH_STATE_TTL_SECONDS)
+        return
+    except RedisError as e:
+        logger.warning("Entra login state write failed, keeping it in memory: %s", e)
+
+    now = time.monotonic()
+    _sweep_local_states(now)
+    _local_states[state] = (now + AUTH_STATE_TTL_SECONDS, data)
+
+
+async def pop_auth_state(
+    state: str, client: Redis = redis_client
+) -> Optional[dict[str, Any]]:
+    """
+    Atomically fetch and delete the data for a pending login.
+
+    Each state can only be consumed once, by any instance.
+
+    Returns:
+        The stored data, or None if the state is unknown or expired
+    """
+    local = _local_states.pop(state, None)
+    if local is not None:
+        expires_at, data = local
+        return data if expires_at >= time.monotonic() else None
+
+    try:
+        raw = await client.getdel(_state_key(state))
+    except RedisError as e:
+        logger.warning("Entra login state read failed: %s", e)
+        return None
+
+    if raw is None:
+        return None
+    return orjson.loads(raw)
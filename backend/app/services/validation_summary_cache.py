@@ -0,0 +1,54 @@
+"""Redis cache of per-agency enabled-validation summaries"""
+
+import logging
+from typing import Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.db.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Summaries are invalidated when preferences are saved; the TTL is a backstop
+ENABLED_VALIDATIONS_TTL_SECONDS = 300
+
+
+def _cache_key(agency_id: int) -> str:
+    return f"agency:{agency_id}:enabled_validations"
+
+
+async def get_cached_enabled_validations(
+    agency_id: int, client: Redis = redis_client
+) -> Optional[bytes]:
+    """
+    Get an agency's serialized EnabledValidationsResponse from the cache.
+
+    Returns:
+        The cached JSON body, or None on a miss or if Redis is unavailable
+    """
+    try:
+        return await client.get(_cache_key(agency_id))
+    except RedisError as e:
+        logger.warning("Enabled validations cache read failed for agency %s: %s", agency_id, e)
+        return None
+
+
+async def cache_enabled_validations(
+    agency_id: int, payload: bytes, client: Redis = redis_client
+) -> None:
+    """Store an agency's serialized EnabledValidationsResponse in the cache."""
+    try:
+        await client.set(_cache_key(agency_id), payload, ex=ENABLED_VALIDATIONS_TTL_SECONDS)
+    except RedisError as e:
+        logger.warning("Enabled validations cache write failed for agency %s: %s", agency_id, e)
+
+
+async def invalidate_enabled_validations(agency_id: int, client: Redis = redis_client) -> None:
+    """Drop an agency's cached summary after its preferences are committed."""
+    try:
+        await client.delete(_cache_key(agency_id))
+    except RedisError as e:
+        logger.warning(
+            "Enabled validations cache invalidation failed for agency %s: %s", agency_id, e
+        )
@@ -12,9 +12,11 @@ from sqlalchemy import select, func
 
 from app.celery_app import celery_app
 from app.db.session import CeleryAsyncSessionLocal
+from app.db.redis import create_celery_redis
 # Import from db.base to ensure all models are loaded in correct order
 from app.db.base import AsyncTask, User, Agency
 from app.models.task import TaskStatus, TaskType
+from app.services.agency_role_cache import invalidate_agency_roles
 from app.services.gtfs_service import gtfs_service
 from app.services.gtfs_validator import GTFSValidator
 from app.schemas.gtfs_import import GTFSImportOptions
@@ -1557,6 +1559,10 @@ def split_agency(
                 task.progress = 15.0
                 await db.commit()
 
+                # New memberships must not wait for cached role maps to expire
+                async with create_celery_redis() as redis:
+                    await invalidate_agency_roles(*added_user_ids, client=redis)
+
                 # Track statistics
                 stats = {
                     "routes_copied": 0,
@@ -2378,13 +2384,20 @@ def delete_agency(
                 task.progress = 85.0
                 await db.commit()
 
-                # Delete user-agency associations
-                await db.execute(
-                    user_agencies.delete().where(user_agencies.c.agency_id == agency_id)
+                # Delete user-agency associations, keeping the member ids
+                member_result = await db.execute(
+                    user_agencies.delete()
+                    .where(user_agencies.c.agency_id == agency_id)
+                    .returning(user_agencies.c.user_id)
                 )
+                member_ids = member_result.scalars().all()
                 task.progress = 90.0
                 await db.commit()
 
+                # Removed memberships must not wait for cached role maps to expire
+                async with create_celery_redis() as redis:
+                    await invalidate_agency_roles(*member_ids, client=redis)
+
                 # Delete the agency itself
                 await db.delete(agency)
                 task.progress = 95.0
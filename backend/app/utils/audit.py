@@ -2,6 +2,7 @@
 Audit logging utilities
 """
 
+import asyncio
 from typing import Any, Optional, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Request
@@ -21,6 +22,7 @@ async def create_audit_log(
     new_values: Optional[Dict[str, Any]] = None,
     agency_id: Optional[int] = None,
     request: Optional[Request] = None,
+    commit: bool = True,
 ) -> AuditLog:
     """
     Create an audit log entry.
@@ -36,22 +38,13 @@ async def create_audit_log(
         new_values: New values (for creates/updates)
         agency_id: Agency ID for multi-tenancy
         request: Optional FastAPI request object to extract IP and user agent
+        commit: Commit immediately; pass False to write the entry with the
+            caller's transaction
 
     Returns:
         Created AuditLog instance
     """
-    # Extract request metadata if available
-    ip_address = None
-    user_agent = None
-    if request:
-        # Try to get real IP from X-Forwarded-For header (for proxy setups)
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            ip_address = forwarded_for.split(",")[0].strip()
-        else:
-            ip_address = request.client.host if request.client else None
-
-        user_agent = request.headers.get("User-Agent")
+    ip_address, user_agent = get_request_metadata(request)
 
     audit_log = AuditLog(
         user_id=user.id,
@@ -67,12 +60,28 @@ async def create_audit_log(
     )
 
     db.add(audit_log)
-    await db.commit()
-    await db.refresh(audit_log)
+    if commit:
+        await db.commit()
+        await db.refresh(audit_log)
 
     return audit_log
 
 
+def get_request_metadata(request: Optional[Request]) -> tuple[Optional[str], Optional[str]]:
+    """Extract client IP and user agent from a request, if available."""
+    if not request:
+        return None, None
+
+    # Try to get real IP from X-Forwarded-For header (for proxy setups)
+    forwarded_for = request.headers.get("X-Forwarded-For")
+    if forwarded_for:
+        ip_address = forwarded_for.split(",")[0].strip()
+    else:
+        ip_address = request.client.host if request.client else None
+
+    return ip_address, request.headers.get("User-Agent")
+
+
 def serialize_model(model: Any, exclude_fields: Optional[list[str]] = None) -> Dict[str, Any]:
     """
     Serialize a SQLAlchemy model to a dictionary for audit logging.
@@ -84,25 +93,56 @@ def serialize_model(model: Any, exclude_fields: Optional[list[str]] = None) -> D
     Returns:
         Dictionary representation of the model
     """
+    return _serialize_values(_snapshot_columns(model, exclude_fields))
+
+
+async def serialize_model_async(
+    model: Any, exclude_fields: Optional[list[str]] = None
+) -> Dict[str, Any]:
+    """
+    Serialize a SQLAlchemy model for audit logging without blocking the event loop.
+
+    Column values are read on the calling coroutine (ORM attribute access must
+    stay on the session's loop); converting them to JSON-friendly values runs
+    in a worker thread.
+
+    Args:
+        model: SQLAlchemy model instance
+        exclude_fields: List of field names to exclude from serialization
+
+    Returns:
+        Dictionary representation of the model
+    """
+    snapshot = _snapshot_columns(model, exclude_fields)
+    return await asyncio.to_thread(_serialize_values, snapshot)
+
+
+def _snapshot_columns(model: Any, exclude_fields: Optional[list[str]] = None) -> Dict[str, Any]:
+    """Read the raw column values of a model into a plain dict."""
     if exclude_fields is None:
         exclude_fields = []
 
-    # Get all columns from the model
+    return {
+        column.name: getattr(model, column.name)
+        for column in model.__table__.columns
+        if column.name not in exclude_fields
+    }
+
+
+def _serialize_values(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert raw column values to JSON-serializable types."""
     result = {}
-    for column in model.__table__.columns:
-        if column.name not in exclude_fields:
-            value = getattr(model, column.name)
-            # Convert to JSON-serializable types
-            if hasattr(value, 'isoformat'):
-                # Handle datetime objects
-                result[column.name] = value.isoformat()
-            elif hasattr(value, '__json__'):
-                # Handle objects with custom JSON serialization
-                result[column.name] = value.__json__()
-            elif isinstance(value, (str, int, float, bool, type(None))):
-                result[column.name] = value
-            else:
-                # For other types, convert to string
-                result[column.name] = str(value)
+    for name, value in values.items():
+        if hasattr(value, 'isoformat'):
+            # Handle datetime objects
+            result[name] = value.isoformat()
+        elif hasattr(value, '__json__'):
+            # Handle objects with custom JSON serialization
+            result[name] = value.__json__()
+        elif isinstance(value, (str, int, float, bool, type(None))):
+            result[name] = value
+        else:
+            # For other types, convert to string
+            result[name] = str(value)
 
     return result
@@ -0,0 +1,154 @@
+"""
+Write-behind batching for audit log entries
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from sqlalchemy import insert
+
+from app.db.session import AsyncSessionLocal
+from app.models.audit import AuditAction, AuditLog
+from app.models.user import User
+from app.utils.audit import get_request_metadata
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the queue when the batcher is stopped
+_STOP = object()
+
+
+class AuditLogBatcher:
+    """
+    Collects audit log entries in memory and inserts them in batches.
+
+    A single writer coroutine, started from the application lifespan, takes
+    up to ``max_batch_size`` queued rows at a time (waiting at most
+    ``flush_interval`` seconds after the first one) and writes them with one
+    multi-row INSERT. Entries are only for append-only records that may land
+    shortly after the response; use create_audit_log when the entry must be
+    committed with the handler's own changes.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 500,
+        flush_interval: float = 0.25,
+        max_queue_size: int = 10_000,
+    ):
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._fallback_writes: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """Start the writer coroutine on the running event loop."""
+        if self._writer is not None and not self._writer.done():
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._writer = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush all queued entries and stop the writer coroutine."""
+        if self._writer is None:
+            return
+        await self._queue.put(_STOP)
+        await self._writer
+        self._writer = None
+        self._queue = None
+        if self._fallback_writes:
+            await asyncio.gather(*self._fallback_writes, return_exceptions=True)
+
+    def enqueue(
+        self,
+        user: User,
+        action: AuditAction,
+        entity_type: str,
+        entity_id: str,
+        description: Optional[str] = None,
+        old_values: Optional[Dict[str, Any]] = None,
+        new_values: Optional[Dict[str, Any]] = None,
+        agency_id: Optional[int] = None,
+        request: Optional[Request] = None,
+    ) -> None:
+        """
+        Queue an audit log entry for the next batch.
+
+        Takes the same arguments as create_audit_log (minus the session) and
+        returns immediately. If the writer is not running or the queue is
+        full, the entry is written on its own instead.
+        """
+        ip_address, user_agent = get_request_metadata(request)
+        now = datetime.now(timezone.utc)
+
+        row = {
+            "user_id": user.id,
+            "agency_id": agency_id,
+            "action": action.value if isinstance(action, AuditAction) else action,
+            "entity_type": entity_type,
+            "entity_id": str(entity_id),
+            "description": description,
+            "old_values": old_values,
+            "new_values": new_values,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+        if self._writer is not None and not self._writer.done():
+            try:
+                self._queue.put_nowait(row)
+                return
+            except asyncio.QueueFull:
+                logger.warning("Audit log queue is full; writing entry directly")
+
+        task = asyncio.create_task(self._write([row]))
+        self._fallback_writes.add(task)
+        task.add_done_callback(self._fallback_writes.discard)
+
+    async def _run(self) -> None:
+        """Drain the queue in batches until the stop marker is reached."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            row = await self._queue.get()
+            if row is _STOP:
+                return
+
+            batch = [row]
+            deadline = loop.time() + self.flush_interval
+            stopping = False
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            await self._write(batch)
+            if stopping:
+                return
+
+    async def _write(self, rows: list[Dict[str, Any]]) -> None:
+        """Insert a batch of audit log rows in a single statement."""
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(AuditLog), rows)
+                await db.commit()
+        except Exception:
+            logger.exception("Failed to write %d audit log entries", len(rows))
+
+
+audit_batcher = AuditLogBatcher()
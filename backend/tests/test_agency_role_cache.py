@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.models.user import UserRole
+from app.services import agency_role_cache
+from app.services.agency_role_cache import cache_agency_roles, get_cached_agency_roles
+
+
+class FakeRedis:
+    """Records calls and optionally fails every one of them"""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = []
+        self.store = {}
+
+    async def get(self, key):
+        self.calls.append(("get", key))
+        if self.fail:
+            raise RedisConnectionError("down")
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.calls.append(("set", key))
+        if self.fail:
+            raise RedisConnectionError("down")
+        self.store[key] = value
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(agency_role_cache, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    monkeypatch.setattr(agency_role_cache, "_redis_retry_at", 0.0)
+    return clock
+
+
+async def test_roles_round_trip(clock):
+    client = FakeRedis()
+    await cache_agency_roles(1, {5: UserRole.EDITOR}, client=client)
+
+    assert await get_cached_agency_roles(1, client=client) == {5: UserRole.EDITOR}
+
+
+async def test_redis_error_backs_off_until_retry_interval(clock):
+    client = FakeRedis(fail=True)
+
+    assert await get_cached_agency_roles(1, client=client) is None
+    assert await get_cached_agency_roles(1, client=client) is None
+    await cache_agency_roles(1, {5: UserRole.EDITOR}, client=client)
+    assert client.calls == [("get", "user:1:agencies")]
+
+    clock.now += agency_role_cache.REDIS_RETRY_SECONDS
+    client.fail = False
+    assert await get_cached_agency_roles(1, client=client) is None
+    assert len(client.calls) == 2
@@ -0,0 +1,159 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.api import deps
+from app.api.deps import get_current_user, get_current_user_optional
+from app.core import security
+from app.core.security import ACCESS_TOKEN_COOKIE, create_access_token, create_refresh_token
+
+
+class FakeResult:
+    def __init__(self, user):
+        self._user = user
+
+    def scalar_one_or_none(self):
+        return self._user
+
+
+class FakeSession:
+    """Answers the user lookup of get_current_user and records the queries"""
+
+    def __init__(self, user):
+        self.user = user
+        self.queries = []
+
+    async def execute(self, query):
+        self.queries.append(query)
+        return FakeResult(self.user)
+
+
+def make_request(
+    cookies: dict[str, str] | None = None,
+    method: str = "GET",
+    origin: str | None = None,
+) -> Request:
+    headers = [(b"host", b"api.example.com")]
+    if cookies:
+        cookie_header = "; ".join(f"{name}={value}" for name, value in cookies.items())
+        headers.append((b"cookie", cookie_header.encode()))
+    if origin:
+        headers.append((b"origin", origin.encode()))
+    return Request({"type": "http", "method": method, "path": "/", "headers": headers})
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    security._verified_tokens.clear()
+    yield
+    security._verified_tokens.clear()
+
+
+@pytest.fixture
+def user():
+    return SimpleNamespace(id=1, email="user@example.com", is_active=True)
+
+
+async def test_bearer_token_authenticates(user):
+    db = FakeSession(user)
+    result = await get_current_user(make_request(), create_access_token(user.id), db)
+    assert result is user
+
+
+async def test_access_cookie_is_used_without_bearer_token(user):
+    db = FakeSession(user)
+    request = make_request({ACCESS_TOKEN_COOKIE: create_access_token(user.id)})
+
+    assert await get_current_user(request, None, db) is user
+
+
+async def test_bearer_token_takes_precedence_over_cookie(user):
+    db = FakeSession(user)
+    request = make_request({ACCESS_TOKEN_COOKIE: "not-a-jwt"})
+
+    assert await get_current_user(request, create_access_token(user.id), db) is user
+
+
+async def test_missing_token_is_unauthorized(user):
+    db = FakeSession(user)
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(make_request(), None, db)
+
+    assert exc_info.value.status_code == 401
+    assert not db.queries
+
+
+async def test_invalid_cookie_is_unauthorized(user):
+    db = FakeSession(user)
+    request = make_request({ACCESS_TOKEN_COOKIE: "not-a-jwt"})
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(request, None, db)
+    assert exc_info.value.status_code == 401
+
+
+async def test_refresh_token_cookie_is_not_an_access_token(user):
+    db = FakeSession(user)
+    request = make_request({ACCESS_TOKEN_COOKIE: create_refresh_token(user.id)})
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(request, None, db)
+    assert exc_info.value.status_code == 401
+
+
+async def test_inactive_user_is_forbidden():
+    inactive = SimpleNamespace(id=2, email="inactive@example.com", is_active=False)
+    request = make_request({ACCESS_TOKEN_COOKIE: create_access_token(inactive.id)})
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(request, None, FakeSession(inactive))
+    assert exc_info.value.status_code == 403
+
+
+async def test_optional_user_is_none_without_credentials(user):
+    assert await get_current_user_optional(make_request(), None, FakeSession(user)) is None
+
+
+async def test_optional_user_reads_cookie(user):
+    request = make_request({ACCESS_TOKEN_COOKIE: create_access_token(user.id)})
+    assert await get_current_user_optional(request, None, FakeSession(user)) is user
+
+
+async def test_cookie_post_from_sibling_origin_is_rejected(user):
+    db = FakeSession(user)
+    request = make_request(
+        {ACCESS_TOKEN_COOKIE: create_access_token(user.id)},
+        method="POST",
+        origin="https://other-team.example.com",
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(request, None, db)
+    assert exc_info.value.status_code == 403
+    assert not db.queries
+
+
+async def test_cookie_post_without_origin_is_rejected(user):
+    request = make_request({ACCESS_TOKEN_COOKIE: create_access_token(user.id)}, method="POST")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(request, None, FakeSession(user))
+    assert exc_info.value.status_code == 403
+
+
+@pytest.mark.parametrize("origin", ["https://api.example.com", "https://app.example.com"])
+async def test_cookie_post_from_trusted_origin_authenticates(user, origin, monkeypatch):
+    monkeypatch.setattr(deps.settings, "CORS_ORIGINS", ["https://app.example.com"])
+    request = make_request(
+        {ACCESS_TOKEN_COOKIE: create_access_token(user.id)}, method="DELETE", origin=origin
+    )
+
+    assert await get_current_user(request, None, FakeSession(user)) is user
+
+
+async def test_bearer_post_skips_origin_check(user):
+    request = make_request(method="POST", origin="https://other-team.example.com")
+
+    assert await get_current_user(request, create_access_token(user.id), FakeSession(user)) is user
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services import entra_state_store
+from app.services.entra_state_store import (
+    AUTH_STATE_TTL_SECONDS,
+    pop_auth_state,
+    save_auth_state,
+)
+
+
+class FakeRedis:
+    """In-memory stand-in for the SET EX / GETDEL commands used by the store"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.values: dict[str, tuple[float, bytes]] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = (self.now + ex if ex else float("inf"), value)
+        self.ttls[key] = ex
+
+    async def getdel(self, key):
+        entry = self.values.pop(key, None)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        return value if expires_at > self.now else None
+
+
+class UnavailableRedis:
+    async def set(self, key, value, ex=None):
+        raise RedisConnectionError("down")
+
+    async def getdel(self, key):
+        raise RedisConnectionError("down")
+
+
+@pytest.fixture(autouse=True)
+def clear_local_states():
+    entra_state_store._local_states.clear()
+    yield
+    entra_state_store._local_states.clear()
+
+
+async def test_state_round_trips_with_ttl():
+    client = FakeRedis()
+    data = {"redirect_url": "https://app.example.com/auth/callback", "format": "json"}
+
+    await save_auth_state("abc", data, client=client)
+
+    assert client.ttls["entra:state:abc"] == AUTH_STATE_TTL_SECONDS
+    assert await pop_auth_state("abc", client=client) == data
+
+
+async def test_state_can_only_be_consumed_once():
+    client = FakeRedis()
+    await save_auth_state("abc", {"redirect_url": "/"}, client=client)
+
+    assert await pop_auth_state("abc", client=client) is not None
+    assert await pop_auth_state("abc", client=client) is None
+
+
+async def test_unknown_state_is_rejected():
+    assert await pop_auth_state("missing", client=FakeRedis()) is None
+
+
+async def test_expired_state_is_rejected():
+    client = FakeRedis()
+    await save_auth_state("abc", {"redirect_url": "/"}, client=client)
+
+    client.now += AUTH_STATE_TTL_SECONDS + 1
+    assert await pop_auth_state("abc", client=client) is None
+
+
+async def test_falls_back_to_memory_when_redis_is_down():
+    client = UnavailableRedis()
+    await save_auth_state("abc", {"redirect_url": "/"}, client=client)
+
+    assert await pop_auth_state("abc", client=client) == {"redirect_url": "/"}
+    assert await pop_auth_state("abc", client=client) is None
+
+
+async def test_memory_fallback_state_expires(monkeypatch):
+    client = UnavailableRedis()
+    now = 1000.0
+    monkeypatch.setattr(entra_state_store, "time", SimpleNamespace(monotonic=lambda: now))
+    await save_auth_state("abc", {"redirect_url": "/"}, client=client)
+
+    now += AUTH_STATE_TTL_SECONDS + 1
+    assert await pop_auth_state("abc", client=client) is None
+
+
+async def test_redis_read_failure_is_treated_as_unknown_state():
+    assert await pop_auth_state("abc", client=UnavailableRedis()) is None
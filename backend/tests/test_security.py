@@ -0,0 +1,159 @@
+import base64
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from jose import JWTError, jwt
+
+from app.core import security
+from app.core.security import (
+    ALGORITHM,
+    SECRET_KEY,
+    create_access_token,
+    create_refresh_token,
+    create_token_pair,
+    decode_token_cached,
+    verify_token,
+)
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _b64url_encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    security._verified_tokens.clear()
+    yield
+    security._verified_tokens.clear()
+
+
+def test_access_token_round_trips_through_jose():
+    """Inline-signed tokens decode with python-jose and keep their claims."""
+    before = int(time.time())
+    token = create_access_token(42)
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+    assert payload["sub"] == "42"
+    assert payload["type"] == "access"
+    expected_exp = before + security.settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    assert abs(payload["exp"] - expected_exp) <= 2
+
+
+def test_token_header_matches_jose():
+    """The precomputed header declares the configured algorithm."""
+    header = jwt.get_unverified_header(create_access_token(1))
+    assert header == {"alg": ALGORITHM, "typ": "JWT"}
+
+
+def test_refresh_token_claims():
+    payload = jwt.decode(create_refresh_token("7"), SECRET_KEY, algorithms=[ALGORITHM])
+    assert payload["sub"] == "7"
+    assert payload["type"] == "refresh"
+    assert payload["exp"] > time.time() + (security.settings.REFRESH_TOKEN_EXPIRE_DAYS - 1) * 86400
+
+
+def test_custom_expiry_is_preserved():
+    token = create_access_token(1, expires_delta=timedelta(seconds=90))
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    assert 0 < payload["exp"] - time.time() <= 91
+
+
+def test_token_pair_types():
+    access_token, refresh_token = create_token_pair(5)
+    assert verify_token(access_token)["type"] == "access"
+    assert verify_token(refresh_token)["type"] == "refresh"
+
+
+def test_tampered_payload_is_rejected():
+    header, payload, signature = create_access_token(1).split(".")
+    claims = orjson.loads(_b64url_decode(payload))
+    claims["sub"] = "2"
+    forged = ".".join([header, _b64url_encode(orjson.dumps(claims)), signature])
+
+    with pytest.raises(JWTError):
+        jwt.decode(forged, SECRET_KEY, algorithms=[ALGORITHM])
+    assert verify_token(forged) is None
+
+
+def test_tampered_signature_is_rejected():
+    header, payload, signature = create_access_token(1).split(".")
+    raw = bytearray(_b64url_decode(signature))
+    raw[0] ^= 0x01
+    forged = ".".join([header, payload, _b64url_encode(bytes(raw))])
+
+    with pytest.raises(JWTError):
+        jwt.decode(forged, SECRET_KEY, algorithms=[ALGORITHM])
+    assert verify_token(forged) is None
+
+
+def test_wrong_key_is_rejected():
+    token = create_access_token(1)
+    with pytest.raises(JWTError):
+        jwt.decode(token, SECRET_KEY + "x", algorithms=[ALGORITHM])
+
+
+def test_expired_token_is_rejected():
+    expired = security._encode_token(1, datetime.utcnow() - timedelta(minutes=1), "access")
+    assert verify_token(expired) is None
+
+
+def test_decode_token_cached_reuses_verification(monkeypatch):
+    token = create_access_token(1)
+    calls = []
+    real_decode = security.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(1)
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+
+    first = decode_token_cached(token, SECRET_KEY, [ALGORITHM])
+    first["sub"] = "mutated"
+    second = decode_token_cached(token, SECRET_KEY, [ALGORITHM])
+
+    assert len(calls) == 1
+    # Callers get copies, so mutating a result cannot poison the cache
+    assert second["sub"] == "1"
+
+
+def test_decode_token_cached_rechecks_expiry(monkeypatch):
+    token = create_access_token(1, expires_delta=timedelta(seconds=60))
+    payload = decode_token_cached(token, SECRET_KEY, [ALGORITHM])
+
+    # Past the token's exp the cached entry must not be served
+    monkeypatch.setattr(security, "time", SimpleNamespace(time=lambda: payload["exp"] + 1))
+
+    def reject_expired(*args, **kwargs):
+        raise JWTError("Signature has expired.")
+
+    monkeypatch.setattr(security.jwt, "decode", reject_expired)
+    with pytest.raises(JWTError):
+        decode_token_cached(token, SECRET_KEY, [ALGORITHM])
+
+
+def test_decode_token_cached_separates_namespaces():
+    token = create_access_token(1)
+    decode_token_cached(token, SECRET_KEY, [ALGORITHM], namespace="app")
+
+    # A different namespace (signing key) must verify the token itself
+    with pytest.raises(JWTError):
+        decode_token_cached(token, SECRET_KEY + "x", [ALGORITHM], namespace="other")
+
+
+def test_decode_token_cached_does_not_cache_failures():
+    header, payload, _ = create_access_token(1).split(".")
+    forged = f"{header}.{payload}.{_b64url_encode(b'0' * 32)}"
+
+    for _ in range(2):
+        with pytest.raises(JWTError):
+            decode_token_cached(forged, SECRET_KEY, [ALGORITHM])
+    assert not security._verified_tokens
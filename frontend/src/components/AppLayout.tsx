@@ -61,8 +61,8 @@ export default function AppLayout({ children }: AppLayoutProps) {
   const hostname = window.location.hostname
   const isTeamSubdomain = hostname.endsWith(`.${portalDomain}`) && hostname !== portalDomain
 
-  const handleLogout = () => {
-    logout()
+  const handleLogout = async () => {
+    await logout()
     navigate('/login')
   }
 
@@ -2,6 +2,13 @@ import axios from 'axios'
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || '/api/v1'
 
+declare module 'axios' {
+  interface AxiosRequestConfig {
+    // Don't try to refresh the session when this request gets a 401
+    skipAuthRefresh?: boolean
+  }
+}
+
 export const api = axios.create({
   baseURL: API_BASE_URL,
   headers: {
@@ -30,13 +37,22 @@ api.interceptors.response.use(
     const originalRequest = error.config
 
     // If 401 and we haven't tried to refresh yet
-    if (error.response?.status === 401 && !originalRequest._retry) {
+    if (error.response?.status === 401 && !originalRequest._retry && !originalRequest.skipAuthRefresh) {
       originalRequest._retry = true
 
       try {
         const refreshToken = localStorage.getItem('refresh_token')
         if (!refreshToken) {
-          throw new Error('No refresh token')
+          // Only cookie sessions (a signed-in user without stored tokens) can
+          // be refreshed this way; after logout there is nothing to refresh
+          if (!localStorage.getItem('user')) {
+            throw new Error('No refresh token')
+          }
+
+          // Cookie session: the refresh token cookie is sent automatically
+          // and the backend answers with new cookies
+          await axios.post(`${API_BASE_URL}/auth/refresh`)
+          return api(originalRequest)
         }
 
         // Try to refresh the token
@@ -89,6 +105,12 @@ export const authApi = {
     return response.data
   },
 
+  // Log out on the server, clearing the token cookies of redirect logins
+  logout: async () => {
+    const response = await api.post('/auth/logout', undefined, { skipAuthRefresh: true })
+    return response.data
+  },
+
   // Note: Login is now handled by redirecting to /api/v1/auth/entra/login
   // The backend handles the OAuth flow and redirects back with tokens
 }
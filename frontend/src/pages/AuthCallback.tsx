@@ -7,7 +7,7 @@ import { useAuthStore } from '../store/authStore'
 export default function AuthCallback() {
   const navigate = useNavigate()
   const [searchParams] = useSearchParams()
-  const { handleTokensFromUrl, error } = useAuthStore()
+  const { handleTokensFromUrl, handleCookieSession, error } = useAuthStore()
 
   useEffect(() => {
     const processCallback = async () => {
@@ -27,20 +27,14 @@ export default function AuthCallback() {
         return
       }
 
-      // Check if we have at least the access token
-      if (!token) {
-        notifications.show({
-          title: 'Authentication Error',
-          message: 'No authentication token received',
-          color: 'red',
-        })
-        navigate('/login', { replace: true })
-        return
-      }
-
       try {
-        // Store tokens and fetch user info (refresh_token may be empty for portal auth)
-        await handleTokensFromUrl(token, refreshToken || '')
+        if (token) {
+          // Store tokens and fetch user info (refresh_token may be empty for portal auth)
+          await handleTokensFromUrl(token, refreshToken || '')
+        } else {
+          // No token in the URL: the backend set HttpOnly cookies instead
+          await handleCookieSession()
+        }
 
         // Success! Redirect to home
         notifications.show({
@@ -61,7 +55,7 @@ export default function AuthCallback() {
     }
 
     processCallback()
-  }, [searchParams, handleTokensFromUrl, navigate])
+  }, [searchParams, handleTokensFromUrl, handleCookieSession, navigate])
 
   return (
     <Container size={420} my={100}>
@@ -23,7 +23,8 @@ interface AuthState {
   setUser: (user: User) => void
   login: () => void
   handleTokensFromUrl: (token: string, refreshToken: string) => Promise<void>
-  logout: () => void
+  handleCookieSession: () => Promise<void>
+  logout: () => Promise<void>
   checkAuth: () => Promise<void>
   clearError: () => void
 }
@@ -95,7 +96,34 @@ export const useAuthStore = create<AuthState>((set, get) => ({
     }
   },
 
-  logout: () => {
+  // Redirect logins that set HttpOnly token cookies instead of URL params
+  handleCookieSession: async () => {
+    try {
+      set({ isLoading: true, error: null })
+
+      const userData = await authApi.getCurrentUser()
+      get().setUser(userData)
+
+      set({ isAuthenticated: true, isLoading: false })
+    } catch (error: any) {
+      set({
+        error: error.response?.data?.detail || 'Failed to complete authentication',
+        isLoading: false,
+        isAuthenticated: false,
+      })
+      throw error
+    }
+  },
+
+  logout: async () => {
+    // The server clears the HttpOnly token cookies; local state is cleared
+    // afterwards so the request still carries the bearer token, if any
+    try {
+      await authApi.logout()
+    } catch {
+      // Local logout still proceeds if the server is unreachable
+    }
+
     localStorage.removeItem('access_token')
     localStorage.removeItem('refresh_token')
     localStorage.removeItem('user')
@@ -112,7 +140,8 @@ export const useAuthStore = create<AuthState>((set, get) => ({
     const accessToken = localStorage.getItem('access_token')
     const storedUser = localStorage.getItem('user')
 
-    if (!accessToken) {
+    // Cookie sessions have a stored user but no token in localStorage
+    if (!accessToken && !storedUser) {
       set({ isAuthenticated: false, user: null })
       return
     }
@@ -135,7 +164,7 @@ export const useAuthStore = create<AuthState>((set, get) => ({
       })
     } catch (error) {
       // Token is invalid
-      get().logout()
+      await get().logout()
       set({ isLoading: false })
     }
   },